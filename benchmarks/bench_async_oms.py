@@ -0,0 +1,36 @@
+"""Orders per second through AsyncOMS against the local mock broker server.
+
+Run from the repo root: python -m benchmarks.bench_async_oms [n_orders] [latency_ms]
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+from quantitative_codex.execution.async_oms import AsyncOMS
+from quantitative_codex.execution.brokers.mock_server import MockBrokerClient, MockBrokerServer
+from quantitative_codex.execution.models import Order, OrderSide
+
+
+async def _run(n_orders: int, latency: float, concurrency: int) -> float:
+    async with MockBrokerServer(latency=latency) as server:
+        client = MockBrokerClient(server.host, server.port, pool_size=concurrency)
+        oms = AsyncOMS(client, max_concurrency=concurrency)
+        orders = [Order(symbol=f"S{i % 500:04d}", qty=10.0, side=OrderSide.BUY) for i in range(n_orders)]
+
+        start = time.perf_counter()
+        await oms.submit_orders_async(orders)
+        elapsed = time.perf_counter() - start
+        await client.close()
+    return n_orders / elapsed
+
+
+def main(n_orders: int = 300, latency_ms: int = 2) -> None:
+    for concurrency in (1, 8, 32, 64):
+        rate = asyncio.run(_run(n_orders, latency_ms / 1000.0, concurrency))
+        print(f"orders={n_orders} latency_ms={latency_ms} concurrency={concurrency} orders_per_sec={rate:,.0f}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
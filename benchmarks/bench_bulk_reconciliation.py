@@ -0,0 +1,65 @@
+"""Chunked file reconciliation on synthetic broker drop files.
+
+Writes an internal and a broker fill file with ``n_fills`` rows each (a few
+perturbed rows on the broker side), then reconciles them with
+``reconcile_fill_files`` and reports wall time and peak traced memory.
+
+Run from the repo root: python -m benchmarks.bench_bulk_reconciliation [n_fills] [n_symbols]
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from quantitative_codex.reconciliation import reconcile_fill_files
+
+_CHUNK = 1_000_000
+
+
+def _write_fills(path: Path, n_fills: int, symbols: np.ndarray, perturb: bool) -> None:
+    rng = np.random.default_rng(0)
+    for start in range(0, n_fills, _CHUNK):
+        n = min(_CHUNK, n_fills - start)
+        chunk = pd.DataFrame(
+            {
+                "symbol": symbols[rng.integers(0, len(symbols), size=n)],
+                "side": np.where(rng.random(n) < 0.5, "buy", "sell"),
+                "qty": rng.integers(1, 500, size=n),
+                "price": rng.uniform(5, 500, size=n).round(2),
+            }
+        )
+        if perturb and start == 0:
+            chunk.loc[:9, "qty"] += 1
+            chunk.loc[10:19, "price"] += 1.0
+        chunk.to_csv(path, mode="a", header=start == 0, index=False)
+
+
+def main(n_fills: int = 10_000_000, n_symbols: int = 5000) -> None:
+    symbols = np.array([f"S{i:05d}" for i in range(n_symbols)], dtype=object)
+    with tempfile.TemporaryDirectory() as tmp:
+        internal = Path(tmp) / "internal.csv"
+        broker = Path(tmp) / "broker.csv"
+        start = time.perf_counter()
+        _write_fills(internal, n_fills, symbols, perturb=False)
+        _write_fills(broker, n_fills, symbols, perturb=True)
+        print(f"generated 2 x {n_fills:,} fills in {time.perf_counter() - start:.1f} s")
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        out = reconcile_fill_files(internal, broker, qty_tolerance=1e-6, notional_tolerance=0.5)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"keys={len(out):,} breaks={int(out['is_break'].sum())} qty_breaks={int(out['qty_break'].sum())}")
+    print(f"reconcile_fill_files {elapsed:.1f} s ({2 * n_fills / elapsed:,.0f} rows/s), peak traced memory {peak / 2**20:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,56 @@
+"""Rebalance latency for many small accounts.
+
+Compares one ``SmallCapitalLiveRunner`` per account with ``MultiAccountRunner`` run
+in-process and sharded across worker processes.
+
+Run from the repo root: python -m benchmarks.bench_multi_account [n_accounts] [n_symbols] [n_workers]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from quantitative_codex.execution.brokers.paper import PaperBrokerAdapter
+from quantitative_codex.execution.oms import OMS
+from quantitative_codex.live import LiveTradingConfig, MultiAccountRunner, SmallCapitalLiveRunner
+
+
+def main(n_accounts: int = 1000, n_symbols: int = 200, n_workers: int = 0) -> None:
+    n_workers = n_workers or os.cpu_count() or 1
+    rng = np.random.default_rng(0)
+    symbols = [f"S{i:04d}" for i in range(n_symbols)]
+    accounts = [f"A{i:05d}" for i in range(n_accounts)]
+    prices = pd.Series(rng.uniform(5, 500, size=n_symbols), index=symbols)
+    weights = pd.DataFrame(
+        np.where(rng.random((n_accounts, n_symbols)) < 0.1, rng.uniform(0, 0.05, (n_accounts, n_symbols)), 0.0),
+        index=accounts,
+        columns=symbols,
+    )
+    equity = pd.Series(rng.uniform(2_000, 50_000, size=n_accounts), index=accounts)
+    cfg = LiveTradingConfig(max_notional_per_order=2_000)
+
+    runners = [SmallCapitalLiveRunner(OMS(PaperBrokerAdapter()), cfg) for _ in accounts]
+    start = time.perf_counter()
+    for account, runner in zip(accounts, runners):
+        runner.rebalance(weights.loc[account], prices, equity=equity[account])
+    loop = time.perf_counter() - start
+
+    timings = {}
+    for workers in (0, n_workers):
+        with MultiAccountRunner(accounts, cfg, n_workers=workers) as runner:
+            start = time.perf_counter()
+            result = runner.rebalance(weights, prices, equity)
+            timings[workers] = time.perf_counter() - start
+
+    print(f"accounts={n_accounts} symbols={n_symbols} orders={result.n_orders}")
+    print(f"per-account runners      {loop:8.3f} s")
+    print(f"matrix runner in-process {timings[0]:8.3f} s")
+    print(f"matrix runner {n_workers} worker(s) {timings[n_workers]:8.3f} s")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:4]))
@@ -0,0 +1,97 @@
+"""Allocation and latency of the OMS position book and order models.
+
+Compares the array-backed ``PositionBook`` with the previous dict + sorted-Series book
+on a ``n_symbols`` universe, and slotted models with dict-backed ones.
+
+Run from the repo root: python -m benchmarks.bench_position_book [n_symbols] [n_fills]
+"""
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from quantitative_codex.execution.models import Order, OrderSide, OrderType
+from quantitative_codex.execution.oms import PositionBook
+
+
+class DictPositionBook:
+    def __init__(self) -> None:
+        self.quantities: dict[str, float] = {}
+
+    def apply_fill(self, symbol: str, qty: float, side: OrderSide) -> None:
+        signed = qty if side == OrderSide.BUY else -qty
+        self.quantities[symbol] = self.quantities.get(symbol, 0.0) + signed
+
+    def snapshot(self) -> pd.Series:
+        return pd.Series(self.quantities).sort_index()
+
+
+@dataclass
+class DictOrder:
+    symbol: str
+    qty: float
+    side: OrderSide
+    order_type: OrderType = OrderType.MARKET
+    limit_price: float | None = None
+    client_order_id: str | None = None
+
+
+def _timed(fn, repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def _allocated(make, n: int) -> float:
+    tracemalloc.start()
+    objs = [make(i) for i in range(n)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objs
+    return size / n
+
+
+def main(n_symbols: int = 5000, n_fills: int = 100_000) -> None:
+    rng = np.random.default_rng(0)
+    symbols = [f"S{i:05d}" for i in rng.permutation(n_symbols)]
+    picks = rng.integers(0, n_symbols, size=n_fills)
+    fill_symbols = [symbols[i] for i in picks]
+    qtys = rng.integers(1, 100, size=n_fills).astype(float)
+    sides = [OrderSide.BUY if s else OrderSide.SELL for s in rng.integers(0, 2, size=n_fills)]
+    target = pd.Series(rng.normal(size=n_symbols), index=symbols)
+
+    legacy = DictPositionBook()
+    start = time.perf_counter()
+    for sym, q, side in zip(fill_symbols, qtys, sides):
+        legacy.apply_fill(sym, q, side)
+    legacy_fill = time.perf_counter() - start
+
+    book = PositionBook()
+    start = time.perf_counter()
+    book.apply_fills(fill_symbols, qtys, sides)
+    array_fill = time.perf_counter() - start
+    assert np.allclose(book.snapshot().to_numpy(), legacy.snapshot().to_numpy())
+
+    legacy_snap = _timed(legacy.snapshot)
+    array_snap = _timed(book.snapshot)
+    legacy_align = _timed(lambda: legacy.snapshot().reindex(target.index).fillna(0.0))
+    array_align = _timed(lambda: book.reindex(target.index))
+
+    print(f"symbols={n_symbols} fills={n_fills}")
+    print(f"apply_fills      dict={legacy_fill * 1e3:8.2f} ms  array={array_fill * 1e3:8.2f} ms")
+    print(f"snapshot         dict={legacy_snap * 1e3:8.3f} ms  array={array_snap * 1e3:8.3f} ms")
+    print(f"align to target  dict={legacy_align * 1e3:8.3f} ms  array={array_align * 1e3:8.3f} ms")
+
+    dict_bytes = _allocated(lambda i: DictOrder(symbol=symbols[i % n_symbols], qty=1.0, side=OrderSide.BUY), 50_000)
+    slot_bytes = _allocated(lambda i: Order(symbol=symbols[i % n_symbols], qty=1.0, side=OrderSide.BUY), 50_000)
+    print(f"bytes per order  dict={dict_bytes:8.0f}     slots={slot_bytes:8.0f}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,52 @@
+"""Throughput of PreTradeRiskGate.check_orders.
+
+Run from the repo root: python -m benchmarks.bench_pretrade [n_symbols] [n_orders]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+
+from quantitative_codex.execution.models import Order, OrderSide
+from quantitative_codex.execution.pretrade import PreTradeLimits, PreTradeRiskGate
+
+
+def main(n_symbols: int = 5000, n_orders: int = 200_000) -> None:
+    rng = np.random.default_rng(0)
+    symbols = [f"S{i:05d}" for i in range(n_symbols)]
+    prices = dict(zip(symbols, rng.uniform(5, 500, size=n_symbols)))
+    positions = {s: float(q) for s, q in zip(symbols, rng.integers(-100, 100, size=n_symbols))}
+
+    gate = PreTradeRiskGate(
+        PreTradeLimits(
+            max_order_notional=50_000,
+            max_position_qty=1_000,
+            symbol_position_limits={s: 500 for s in symbols[:100]},
+            max_gross_exposure=1e9,
+            restricted_symbols=set(symbols[-50:]),
+            max_orders_per_window=10**9,
+        ),
+        reference_prices=prices,
+    )
+
+    picks = rng.integers(0, n_symbols, size=n_orders)
+    qtys = rng.integers(1, 200, size=n_orders)
+    sides = rng.integers(0, 2, size=n_orders)
+    orders = [
+        Order(symbol=symbols[i], qty=float(q), side=OrderSide.BUY if s else OrderSide.SELL)
+        for i, q, s in zip(picks, qtys, sides)
+    ]
+
+    start = time.perf_counter()
+    verdicts = gate.check_orders(orders, positions, {})
+    elapsed = time.perf_counter() - start
+
+    rejected = sum(v is not None for v in verdicts)
+    print(f"symbols={n_symbols} orders={n_orders} rejected={rejected}")
+    print(f"checks_per_sec={n_orders / elapsed:,.0f} us_per_check={elapsed / n_orders * 1e6:.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,46 @@
+"""Round-trip construction on synthetic fills with MAE/MFE against intraday bars.
+
+Generates ``n_fills`` random buy/sell fills over ``n_symbols`` symbols and a year of
+15-minute bars, then times ``build_round_trips`` with FIFO and LIFO matching.
+
+Run from the repo root: python -m benchmarks.bench_round_trips [n_fills] [n_symbols]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from quantitative_codex.review import build_round_trips
+
+
+def main(n_fills: int = 2_000_000, n_symbols: int = 500) -> None:
+    rng = np.random.default_rng(0)
+    symbols = np.array([f"S{i:04d}" for i in range(n_symbols)], dtype=object)
+    bars = pd.DataFrame(
+        rng.uniform(90, 110, size=(250 * 26, n_symbols)),
+        index=pd.date_range("2024-01-01", periods=250 * 26, freq="15min"),
+        columns=symbols,
+    )
+    seconds = np.sort(rng.integers(0, int((bars.index[-1] - bars.index[0]).total_seconds()), size=n_fills))
+    fills = pd.DataFrame(
+        {
+            "symbol": symbols[rng.integers(0, n_symbols, size=n_fills)],
+            "side": np.where(rng.random(n_fills) < 0.5, "buy", "sell"),
+            "qty": rng.integers(1, 100, size=n_fills).astype(float),
+            "price": rng.uniform(90, 110, size=n_fills),
+            "timestamp": bars.index[0] + pd.to_timedelta(seconds, unit="s"),
+        }
+    )
+
+    for method in ("fifo", "lifo"):
+        start = time.perf_counter()
+        trips = build_round_trips(fills, method=method, bars=bars)
+        elapsed = time.perf_counter() - start
+        print(f"{method}: {len(trips):,} round trips from {n_fills:,} fills in {elapsed:.2f} s ({n_fills / elapsed:,.0f} fills/s)")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,65 @@
+"""Streaming alert engine throughput on a synthetic tick replay.
+
+Builds ``n_events`` mixed events (equity ticks, pnl updates, order statuses and
+position updates over ``n_symbols`` symbols) up front, then times
+``StreamingAlertEngine.process_many`` over them with the default rule set.
+
+Run from the repo root: python -m benchmarks.bench_streaming_alerts [n_events] [n_symbols]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+
+from quantitative_codex.monitoring import (
+    AlertRuleSet,
+    EquityTick,
+    OrderStatusUpdate,
+    PnLUpdate,
+    PositionUpdate,
+    StreamingAlertEngine,
+    default_streaming_rules,
+)
+
+
+def _events(n_events: int, n_symbols: int) -> list[object]:
+    rng = np.random.default_rng(0)
+    kinds = rng.integers(0, 4, size=n_events)
+    equity = 1_000_000.0 * np.cumprod(1.0 + rng.normal(0.0, 1e-3, size=n_events))
+    pnl = rng.normal(0.0, 0.01, size=n_events)
+    notional = rng.normal(0.0, 400_000.0, size=n_events)
+    symbols = [f"S{i:04d}" for i in range(n_symbols)]
+    sym = rng.integers(0, n_symbols, size=n_events)
+    statuses = np.array(["submitted", "filled", "filled", "filled", "canceled", "rejected"])[rng.integers(0, 6, size=n_events)]
+
+    events: list[object] = []
+    for i, kind in enumerate(kinds.tolist()):
+        ts = float(i)
+        if kind == 0:
+            events.append(EquityTick(ts, float(equity[i])))
+        elif kind == 1:
+            events.append(PnLUpdate(ts, float(pnl[i])))
+        elif kind == 2:
+            events.append(OrderStatusUpdate(ts, f"o{i}", str(statuses[i])))
+        else:
+            events.append(PositionUpdate(ts, symbols[sym[i]], float(notional[i])))
+    return events
+
+
+def main(n_events: int = 1_000_000, n_symbols: int = 500) -> None:
+    events = _events(n_events, n_symbols)
+    rules = AlertRuleSet(max_drawdown=0.05, max_daily_loss=0.02, max_reject_ratio=0.2, max_position_abs=1_000_000.0)
+    engine = StreamingAlertEngine(default_streaming_rules(rules, reject_window=200), cooldown=1_000.0)
+
+    start = time.perf_counter()
+    fired = engine.process_many(events)
+    elapsed = time.perf_counter() - start
+
+    print(f"events={engine.n_events:,} fired={len(fired):,} suppressed={engine.n_suppressed:,}")
+    print(f"process_many {elapsed:.2f} s ({n_events / elapsed:,.0f} events/s)")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
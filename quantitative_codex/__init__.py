@@ -13,4 +13,5 @@ __all__ = [
     "monitoring",
     "parameters",
     "review",
+    "profiling",
 ]
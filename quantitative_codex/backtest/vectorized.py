@@ -5,6 +5,8 @@ from dataclasses import dataclass
 import numpy as np
 import pandas as pd
 
+from quantitative_codex.profiling import profiled
+
 
 @dataclass
 class BacktestResult:
@@ -19,6 +21,7 @@ class VectorizedBacktester:
     def __init__(self, one_way_bps: float = 2.0):
         self.one_way_bps = one_way_bps
 
+    @profiled
     def run(self, price: pd.Series, raw_signal: pd.Series) -> BacktestResult:
         ret = price.pct_change().fillna(0.0)
         pos = raw_signal.shift(1).fillna(0.0).clip(-1, 1)
@@ -4,10 +4,12 @@ from pathlib import Path
 
 import pandas as pd
 
+from ..profiling import profiled
 from .cleaning import add_adjusted_close, clean_eod_frame
 from .schema import normalize_ohlcv_columns
 
 
+@profiled
 def load_eod_csv(path: str | Path) -> pd.DataFrame:
     """Load vendor CSV and return normalized/cleaned EOD data."""
     df = pd.read_csv(path)
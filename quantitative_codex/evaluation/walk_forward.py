@@ -5,8 +5,8 @@ from dataclasses import dataclass
 import numpy as np
 import pandas as pd
 
-from quantitative_codex.portfolio.optimization import optimize_weights
-from quantitative_codex.risk.controls import apply_risk_controls
+from quantitative_codex.portfolio.optimization import optimize_weights_panel
+from quantitative_codex.risk.controls import apply_risk_controls_panel, rolling_adv
 
 
 @dataclass
@@ -16,6 +16,7 @@ class WalkForwardConfig:
     rebalance_every: int = 5
     max_weight: float = 0.2
     one_way_bps: float = 2.0
+    adv_window: int = 20
 
 
 def _annualized_metrics(returns: pd.Series) -> dict[str, float]:
@@ -36,56 +37,61 @@ def _annualized_metrics(returns: pd.Series) -> dict[str, float]:
 def walk_forward_evaluate(
     prices: pd.DataFrame,
     config: WalkForwardConfig | None = None,
+    volume: pd.DataFrame | None = None,
 ) -> dict[str, pd.DataFrame | pd.Series | dict[str, float]]:
     """Walk-forward evaluation for a cross-sectional momentum allocator.
 
     prices: wide DataFrame indexed by date, columns are symbols.
+    volume: optional wide share-volume frame aligned with prices; when given, the
+    liquidity control uses a rolling dollar-volume ADV.
+
+    All rebalance weights are computed in one batched optimizer/risk-control pass,
+    each from data up to the day before it takes effect.
     """
     cfg = config or WalkForwardConfig()
     rets = prices.pct_change().fillna(0.0)
 
-    all_returns: list[pd.Series] = []
-    segment_rows: list[dict[str, float | int | str]] = []
+    # expected return proxy: trailing 60-day momentum; risk: trailing 20-day vol with a
+    # cross-sectional median fallback over the train window
+    mom60 = prices / prices.shift(59) - 1
+    risk20 = rets.rolling(20).std(ddof=0)
+    fallback = rets.rolling(cfg.train_window).std(ddof=0).median(axis=1)
+    risk20 = risk20.where(risk20 != 0).apply(lambda col: col.fillna(fallback))
+    adv = rolling_adv(prices, volume, window=cfg.adv_window) if volume is not None else None
 
+    segments: list[tuple[int, int]] = []
     start = cfg.train_window
     while start + cfg.test_window <= len(prices):
-        train_slice = slice(start - cfg.train_window, start)
-        test_slice = slice(start, start + cfg.test_window)
-
-        train_prices = prices.iloc[train_slice]
-        train_rets = rets.iloc[train_slice]
-        test_rets = rets.iloc[test_slice]
-
-        # expected return proxy: trailing 60-day momentum on train end
-        mom60 = train_prices.iloc[-1] / train_prices.iloc[-60] - 1
-        risk20 = train_rets.tail(20).std(ddof=0).replace(0, np.nan).fillna(train_rets.std(ddof=0).median())
-
-        base_w = optimize_weights(mom60, risk=risk20, long_only=True, max_weight=cfg.max_weight)
-
-        adv_proxy = train_prices.iloc[-20:].mean() * 1_000_000  # simple placeholder ADV$ proxy
-        w = apply_risk_controls(base_w, adv_usd=adv_proxy, max_weight=cfg.max_weight)
-
-        # rebalance in test window on a fixed schedule
-        test_period_returns = []
-        current_w = w.reindex(test_rets.columns).fillna(0.0)
-        for i, (_, row) in enumerate(test_rets.iterrows()):
-            if i > 0 and i % cfg.rebalance_every == 0:
-                rolling_train_prices = prices.iloc[start - cfg.train_window + i : start + i]
-                rolling_train_rets = rets.iloc[start - cfg.train_window + i : start + i]
-                if len(rolling_train_prices) >= 60:
-                    mom60_roll = rolling_train_prices.iloc[-1] / rolling_train_prices.iloc[-60] - 1
-                    risk20_roll = rolling_train_rets.tail(20).std(ddof=0).replace(0, np.nan).fillna(
-                        rolling_train_rets.std(ddof=0).median()
-                    )
-                    base_w = optimize_weights(mom60_roll, risk=risk20_roll, long_only=True, max_weight=cfg.max_weight)
-                    current_w = apply_risk_controls(base_w, max_weight=cfg.max_weight).reindex(test_rets.columns).fillna(0.0)
-
-            turnover = float(current_w.abs().sum()) if i == 0 else 0.0
-            gross_ret = float((current_w * row).sum())
-            net_ret = gross_ret - turnover * (cfg.one_way_bps / 10000.0)
-            test_period_returns.append(net_ret)
-
-        seg_returns = pd.Series(test_period_returns, index=test_rets.index)
+        segments.append((start, start + cfg.test_window))
+        start += cfg.test_window
+
+    rebalance_rows = [day for seg_start, seg_end in segments for day in range(seg_start, seg_end, cfg.rebalance_every)]
+    decision_rows = [day - 1 for day in rebalance_rows]
+
+    if rebalance_rows:
+        base_w = optimize_weights_panel(
+            mom60.iloc[decision_rows],
+            risk=risk20.iloc[decision_rows],
+            long_only=True,
+            max_weight=cfg.max_weight,
+        )
+        target_w = apply_risk_controls_panel(
+            base_w,
+            adv_usd=adv.iloc[decision_rows] if adv is not None else None,
+            max_weight=cfg.max_weight,
+        )
+        target_w.index = prices.index[rebalance_rows]
+
+    all_returns: list[pd.Series] = []
+    segment_rows: list[dict[str, float | int | str]] = []
+    for seg_start, seg_end in segments:
+        test_rets = rets.iloc[seg_start:seg_end]
+        held = target_w.reindex(test_rets.index).ffill().fillna(0.0)
+
+        gross_ret = (held * test_rets).sum(axis=1)
+        turnover = pd.Series(0.0, index=test_rets.index)
+        turnover.iloc[0] = float(held.iloc[0].abs().sum())
+        seg_returns = gross_ret - turnover * (cfg.one_way_bps / 10000.0)
         seg_metrics = _annualized_metrics(seg_returns)
 
         segment_rows.append(
@@ -99,7 +105,6 @@ def walk_forward_evaluate(
             }
         )
         all_returns.append(seg_returns)
-        start += cfg.test_window
 
     if all_returns:
         returns = pd.concat(all_returns).sort_index()
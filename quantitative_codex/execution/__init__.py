@@ -1,8 +1,16 @@
+from quantitative_codex.execution.async_oms import AsyncOMS
+from quantitative_codex.execution.journal import JournalState, OMSJournal
 from quantitative_codex.execution.oms import OMS, PositionBook
 from quantitative_codex.execution.models import Order, OrderSide, OrderStatus, OrderType, ExecutionReport, Fill
+from quantitative_codex.execution.order_log import OrderEventLog
+from quantitative_codex.execution.pretrade import PreTradeCheck, PreTradeLimits, PreTradeRiskGate
+from quantitative_codex.execution.scheduler import ParentOrder, ParentOrderScheduler, SliceStrategy, simulate_schedule
 
 __all__ = [
+    "AsyncOMS",
     "OMS",
+    "OMSJournal",
+    "JournalState",
     "PositionBook",
     "Order",
     "OrderSide",
@@ -10,4 +18,12 @@ __all__ = [
     "OrderType",
     "ExecutionReport",
     "Fill",
+    "OrderEventLog",
+    "PreTradeCheck",
+    "PreTradeLimits",
+    "PreTradeRiskGate",
+    "ParentOrder",
+    "ParentOrderScheduler",
+    "SliceStrategy",
+    "simulate_schedule",
 ]
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from dataclasses import replace
+from typing import Awaitable, Callable, TypeVar
+
+from quantitative_codex.execution.brokers.aio import AsyncBrokerAdapter
+from quantitative_codex.execution.journal import OMSJournal
+from quantitative_codex.execution.models import ExecutionReport, Order, OrderStatus
+from quantitative_codex.execution.oms import OMS
+from quantitative_codex.execution.order_log import OrderEventLog
+from quantitative_codex.execution.pretrade import PreTradeCheck
+
+T = TypeVar("T")
+
+_RETRYABLE = (asyncio.TimeoutError, OSError)  # OSError covers ConnectionError
+
+
+class AsyncOMS(OMS):
+    """OMS bookkeeping driven through an ``AsyncBrokerAdapter``.
+
+    Submits and cancels run concurrently up to ``max_concurrency`` in-flight requests, each
+    with a per-attempt ``timeout`` and up to ``retries`` retries on timeouts and connection
+    errors. Orders without a ``client_order_id`` get a uuid-based one before the first
+    attempt so that retries are idempotent on the broker side, across restarts too.
+
+    A submit that still fails after its retries may have reached the broker, so the
+    order stays open with status ``UNKNOWN`` and ``sync_async`` looks it up by its client
+    order id; it is closed only if the broker reports it as not found.
+
+    Use the ``*_async`` methods; the synchronous ``submit_orders``/``sync`` inherited
+    from ``OMS`` would call the async broker without awaiting it, so they raise.
+    """
+
+    def __init__(
+        self,
+        broker: AsyncBrokerAdapter,
+        risk_gate: PreTradeCheck | None = None,
+        max_concurrency: int = 32,
+        timeout: float = 5.0,
+        retries: int = 2,
+        retry_backoff: float = 0.05,
+        order_log: OrderEventLog | None = None,
+        journal: OMSJournal | None = None,
+    ) -> None:
+        super().__init__(broker, risk_gate=risk_gate, order_log=order_log, journal=journal)  # type: ignore[arg-type]
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+
+    async def _call(self, make_call: Callable[[], Awaitable[T]], semaphore: asyncio.Semaphore) -> T:
+        async with semaphore:
+            for attempt in range(self.retries + 1):
+                try:
+                    return await asyncio.wait_for(make_call(), timeout=self.timeout)
+                except _RETRYABLE:
+                    if attempt == self.retries:
+                        raise
+                    await asyncio.sleep(self.retry_backoff * (2**attempt))
+        raise AssertionError("unreachable")
+
+    async def submit_orders_async(self, orders: list[Order]) -> list[ExecutionReport]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        prepared = [
+            order if order.client_order_id else replace(order, client_order_id=f"oms-{uuid.uuid4().hex}")
+            for order in orders
+        ]
+        verdicts = self._screen_orders(prepared)
+
+        async def submit_one(order: Order, reason: str | None) -> ExecutionReport:
+            if reason is not None:
+                return self._record_reject(order, reason)
+            try:
+                report = await self._call(lambda: self.broker.submit_order(order), semaphore)
+            except _RETRYABLE as exc:
+                report = ExecutionReport(
+                    order_id=order.client_order_id,
+                    status=OrderStatus.UNKNOWN,
+                    filled_qty=0.0,
+                    avg_fill_price=None,
+                    message=f"submit_unconfirmed: {type(exc).__name__}",
+                )
+            self._record_submission(order, report)
+            return report
+
+        reports = list(await asyncio.gather(*(submit_one(o, r) for o, r in zip(prepared, verdicts))))
+        self._commit_journal()
+        return reports
+
+    def submit_orders(self, orders: list[Order]) -> list[ExecutionReport]:
+        raise TypeError("AsyncOMS needs an event loop; use await submit_orders_async(...)")
+
+    def sync(self) -> list[ExecutionReport]:
+        raise TypeError("AsyncOMS needs an event loop; use await sync_async()")
+
+    async def cancel_orders_async(self, order_ids: list[str]) -> list[ExecutionReport]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def cancel_one(order_id: str) -> ExecutionReport:
+            try:
+                report = await self._call(lambda: self.broker.cancel_order(order_id), semaphore)
+            except _RETRYABLE as exc:
+                return ExecutionReport(
+                    order_id=order_id,
+                    status=OrderStatus.REJECTED,
+                    filled_qty=0.0,
+                    avg_fill_price=None,
+                    message=f"cancel_failed: {type(exc).__name__}",
+                )
+            self._apply_report(report)
+            return report
+
+        reports = list(await asyncio.gather(*(cancel_one(order_id) for order_id in order_ids)))
+        self._commit_journal()
+        return reports
+
+    async def sync_async(self) -> list[ExecutionReport]:
+        if not self._open_orders:
+            return []
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        open_ids = list(self._open_orders)
+        updates = await self._call(lambda: self.broker.get_orders(open_ids), semaphore)
+        for report in updates:
+            self._apply_report(report)
+        self._commit_journal()
+        return updates
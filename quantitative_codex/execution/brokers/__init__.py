@@ -1,4 +1,13 @@
+from quantitative_codex.execution.brokers.aio import AsyncBrokerAdapter
 from quantitative_codex.execution.brokers.base import BrokerAdapter
-from quantitative_codex.execution.brokers.paper import PaperBrokerAdapter
+from quantitative_codex.execution.brokers.mock_server import MockBrokerClient, MockBrokerServer
+from quantitative_codex.execution.brokers.paper import LiquidityModel, PaperBrokerAdapter
 
-__all__ = ["BrokerAdapter", "PaperBrokerAdapter"]
+__all__ = [
+    "AsyncBrokerAdapter",
+    "BrokerAdapter",
+    "LiquidityModel",
+    "MockBrokerClient",
+    "MockBrokerServer",
+    "PaperBrokerAdapter",
+]
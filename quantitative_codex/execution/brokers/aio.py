@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Iterable
+
+from quantitative_codex.execution.models import ExecutionReport, Order
+
+
+class AsyncBrokerAdapter(ABC):
+    """Asyncio counterpart of ``BrokerAdapter`` for networked brokers.
+
+    Implementations must be safe to call concurrently; the async OMS bounds concurrency
+    and applies timeouts and retries around these calls.
+    """
+
+    supports_streaming: bool = False
+
+    @abstractmethod
+    async def submit_order(self, order: Order) -> ExecutionReport:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def cancel_order(self, order_id: str) -> ExecutionReport:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_order(self, order_id: str) -> ExecutionReport:
+        raise NotImplementedError
+
+    async def get_orders(self, order_ids: Iterable[str]) -> list[ExecutionReport]:
+        return list(await asyncio.gather(*(self.get_order(order_id) for order_id in order_ids)))
+
+    async def close(self) -> None:
+        return None
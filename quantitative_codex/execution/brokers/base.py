@@ -1,11 +1,24 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from typing import Callable, Iterable
 
 from quantitative_codex.execution.models import ExecutionReport, Order
 
+ReportListener = Callable[[ExecutionReport], None]
+
 
 class BrokerAdapter(ABC):
+    """Broker interface.
+
+    Adapters that push execution reports set ``supports_streaming`` and call ``_publish``
+    for every order update; polling-only adapters can override ``get_orders`` with a
+    single batched request.
+    """
+
+    supports_streaming: bool = False
+    _report_listeners: list[ReportListener]
+
     @abstractmethod
     def submit_order(self, order: Order) -> ExecutionReport:
         raise NotImplementedError
@@ -17,3 +30,26 @@ class BrokerAdapter(ABC):
     @abstractmethod
     def get_order(self, order_id: str) -> ExecutionReport:
         raise NotImplementedError
+
+    def get_orders(self, order_ids: Iterable[str]) -> list[ExecutionReport]:
+        return [self.get_order(order_id) for order_id in order_ids]
+
+    def subscribe(self, listener: ReportListener) -> None:
+        self._listeners().append(listener)
+
+    def unsubscribe(self, listener: ReportListener) -> None:
+        listeners = self._listeners()
+        if listener in listeners:
+            listeners.remove(listener)
+
+    def _publish(self, report: ExecutionReport) -> None:
+        for listener in getattr(self, "_report_listeners", ()):
+            listener(report)
+
+    def _listeners(self) -> list[ReportListener]:
+        # created lazily so adapters need not call a base __init__; plain attribute access
+        # also works for adapters that declare ``_report_listeners`` in ``__slots__``
+        listeners = getattr(self, "_report_listeners", None)
+        if listeners is None:
+            listeners = self._report_listeners = []
+        return listeners
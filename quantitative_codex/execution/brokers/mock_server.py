@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime
+
+from quantitative_codex.execution.brokers.aio import AsyncBrokerAdapter
+from quantitative_codex.execution.brokers.paper import PaperBrokerAdapter
+from quantitative_codex.execution.models import ExecutionReport, Order, OrderStatus, order_from_dict, order_to_dict
+
+
+def report_to_dict(report: ExecutionReport) -> dict[str, object]:
+    return {
+        "order_id": report.order_id,
+        "status": report.status.value,
+        "filled_qty": report.filled_qty,
+        "avg_fill_price": report.avg_fill_price,
+        "message": report.message,
+    }
+
+
+def report_from_dict(payload: dict[str, object]) -> ExecutionReport:
+    return ExecutionReport(
+        order_id=str(payload["order_id"]),
+        status=OrderStatus(payload["status"]),
+        filled_qty=float(payload["filled_qty"]),
+        avg_fill_price=payload.get("avg_fill_price"),
+        message=str(payload.get("message", "")),
+    )
+
+
+class MockBrokerServer:
+    """Local JSON-lines TCP broker backed by ``PaperBrokerAdapter`` fill logic.
+
+    Requests are one JSON object per line with an ``op`` of ``submit``, ``cancel``, ``get``,
+    ``get_many`` or ``tick``. Submits carrying a known ``client_order_id`` are idempotent, so
+    clients can retry safely. ``latency`` adds a per-request delay to mimic a remote broker.
+    """
+
+    def __init__(
+        self,
+        broker: PaperBrokerAdapter | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+    ) -> None:
+        self.broker = broker or PaperBrokerAdapter()
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.requests = 0
+        self._server: asyncio.base_events.Server | None = None
+        self._handlers: set[asyncio.Task] = set()
+
+    async def start(self) -> tuple[str, int]:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+
+    async def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        handlers = list(self._handlers)
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+
+    async def __aenter__(self) -> MockBrokerServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            while line := await reader.readline():
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                request_id = None
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                    request_id = request.get("id")
+                    response = {"id": request_id, **self._dispatch(request)}
+                except (KeyError, ValueError, TypeError) as exc:  # malformed JSON or fields
+                    response = {"id": request_id, "error": str(exc)}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # client went away or the server is stopping
+            pass
+        finally:
+            self._handlers.discard(task)
+            writer.close()
+
+    def _dispatch(self, request: dict[str, object]) -> dict[str, object]:
+        self.requests += 1
+        op = request["op"]
+        broker = self.broker
+        if op == "submit":
+            order = order_from_dict(request["order"])
+            if order.client_order_id is not None and order.client_order_id in broker._orders:
+                return {"report": report_to_dict(broker.get_order(order.client_order_id))}
+            return {"report": report_to_dict(broker.submit_order(order))}
+        if op == "cancel":
+            return {"report": report_to_dict(broker.cancel_order(str(request["order_id"])))}
+        if op == "get":
+            return {"report": report_to_dict(broker.get_order(str(request["order_id"])))}
+        if op == "get_many":
+            return {"reports": [report_to_dict(r) for r in broker.get_orders(request["order_ids"])]}
+        if op == "tick":
+            ts = request.get("timestamp")
+            updates = broker.process_market_data(
+                str(request["symbol"]),
+                float(request["price"]),
+                datetime.fromisoformat(ts) if ts else None,
+                volume=request.get("volume"),
+            )
+            return {"reports": [report_to_dict(r) for r in updates]}
+        raise ValueError(f"unknown op: {op}")
+
+
+class MockBrokerClient(AsyncBrokerAdapter):
+    """Async client for ``MockBrokerServer`` with a fixed pool of TCP connections."""
+
+    def __init__(self, host: str, port: int, pool_size: int = 8) -> None:
+        self.host = host
+        self.port = port
+        self.pool_size = pool_size
+        self._pool: asyncio.Queue[tuple[asyncio.StreamReader, asyncio.StreamWriter] | None] | None = None
+        self._seq = 0
+
+    async def _acquire(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self._pool is None:
+            self._pool = asyncio.Queue()
+            for _ in range(self.pool_size):
+                self._pool.put_nowait(None)
+        conn = await self._pool.get()
+        if conn is None:
+            try:
+                conn = await asyncio.open_connection(self.host, self.port)
+            except BaseException:
+                self._pool.put_nowait(None)
+                raise
+        return conn
+
+    async def _request(self, payload: dict[str, object]) -> dict[str, object]:
+        conn = await self._acquire()
+        self._seq += 1
+        try:
+            reader, writer = conn
+            writer.write(json.dumps({"id": self._seq, **payload}).encode() + b"\n")
+            await writer.drain()
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("mock broker closed the connection")
+        except BaseException:
+            # a half-finished exchange leaves the stream out of sync; drop the connection
+            conn[1].close()
+            self._pool.put_nowait(None)
+            raise
+        self._pool.put_nowait(conn)
+
+        response = json.loads(line)
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response
+
+    async def submit_order(self, order: Order) -> ExecutionReport:
+        return report_from_dict((await self._request({"op": "submit", "order": order_to_dict(order)}))["report"])
+
+    async def cancel_order(self, order_id: str) -> ExecutionReport:
+        return report_from_dict((await self._request({"op": "cancel", "order_id": order_id}))["report"])
+
+    async def get_order(self, order_id: str) -> ExecutionReport:
+        return report_from_dict((await self._request({"op": "get", "order_id": order_id}))["report"])
+
+    async def get_orders(self, order_ids) -> list[ExecutionReport]:
+        response = await self._request({"op": "get_many", "order_ids": list(order_ids)})
+        return [report_from_dict(r) for r in response["reports"]]
+
+    async def send_tick(self, symbol: str, price: float, volume: float | None = None) -> list[ExecutionReport]:
+        response = await self._request({"op": "tick", "symbol": symbol, "price": price, "volume": volume})
+        return [report_from_dict(r) for r in response["reports"]]
+
+    async def close(self) -> None:
+        if self._pool is None:
+            return
+        while not self._pool.empty():
+            conn = self._pool.get_nowait()
+            if conn is not None:
+                conn[1].close()
+                await conn[1].wait_closed()
+        self._pool = None
@@ -2,12 +2,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
 
 from quantitative_codex.execution.brokers.base import BrokerAdapter
 from quantitative_codex.execution.models import ExecutionReport, Fill, Order, OrderStatus, OrderType, OrderSide
 
 
-@dataclass
+@dataclass(slots=True)
 class _OpenOrderState:
     order: Order
     remaining_qty: float
@@ -16,22 +20,59 @@ class _OpenOrderState:
     status: OrderStatus = OrderStatus.SUBMITTED
 
 
+@dataclass
+class LiquidityModel:
+    """Bar-volume participation cap and slippage/impact for paper fills.
+
+    A bar can fill at most ``participation_rate * volume`` per symbol, shared across that
+    symbol's resting orders in arrival order. Fill prices move against the order by
+    ``slippage_bps + impact_coefficient_bps * participation ** impact_exponent``;
+    override ``impact_bps`` for a different impact function.
+    """
+
+    participation_rate: float = 0.1
+    slippage_bps: float = 0.0
+    impact_coefficient_bps: float = 10.0
+    impact_exponent: float = 0.5
+
+    def capacity(self, volume: float) -> float:
+        return max(self.participation_rate * volume, 0.0)
+
+    def impact_bps(self, participation: float) -> float:
+        return self.slippage_bps + self.impact_coefficient_bps * participation**self.impact_exponent
+
+    def fill_price(self, mark_price: float, side: OrderSide, qty: float, volume: float) -> float:
+        participation = qty / volume if volume > 0 else 0.0
+        shift = self.impact_bps(participation) / 10000.0
+        return mark_price * (1.0 + shift) if side == OrderSide.BUY else mark_price * (1.0 - shift)
+
+
 class PaperBrokerAdapter(BrokerAdapter):
     """Paper broker with deterministic fill logic.
 
     - Market orders fill immediately at the provided mark price.
     - Limit orders fill when mark price crosses the limit.
+    - With a ``LiquidityModel`` and bar volume, fills are capped by participation and
+      priced with impact; unfilled quantity carries over to later bars.
+
+    Every report produced by fills, rejections and cancels is also pushed to subscribers.
     """
 
-    def __init__(self) -> None:
+    supports_streaming = True
+
+    def __init__(self, liquidity_model: LiquidityModel | None = None) -> None:
+        self.liquidity_model = liquidity_model
         self._orders: dict[str, _OpenOrderState] = {}
+        self._open_by_symbol: dict[str, dict[str, _OpenOrderState]] = {}
         self._fills: list[Fill] = []
         self._seq = 0
 
     def submit_order(self, order: Order) -> ExecutionReport:
         self._seq += 1
         order_id = order.client_order_id or f"paper-{self._seq:08d}"
-        self._orders[order_id] = _OpenOrderState(order=order, remaining_qty=order.qty)
+        state = _OpenOrderState(order=order, remaining_qty=order.qty)
+        self._orders[order_id] = state
+        self._open_by_symbol.setdefault(order.symbol, {})[order_id] = state
         return ExecutionReport(
             order_id=order_id,
             status=OrderStatus.SUBMITTED,
@@ -48,7 +89,17 @@ class PaperBrokerAdapter(BrokerAdapter):
             return self.get_order(order_id)
 
         state.status = OrderStatus.CANCELED
-        return self.get_order(order_id)
+        self._close(order_id, state)
+        report = self.get_order(order_id)
+        self._publish(report)
+        return report
+
+    def _close(self, order_id: str, state: _OpenOrderState) -> None:
+        book = self._open_by_symbol.get(state.order.symbol)
+        if book is not None:
+            book.pop(order_id, None)
+            if not book:
+                del self._open_by_symbol[state.order.symbol]
 
     def get_order(self, order_id: str) -> ExecutionReport:
         state = self._orders.get(order_id)
@@ -63,24 +114,34 @@ class PaperBrokerAdapter(BrokerAdapter):
             avg_fill_price=avg,
         )
 
-    def process_market_data(self, symbol: str, mark_price: float, timestamp: datetime | None = None) -> list[ExecutionReport]:
+    def process_market_data(
+        self,
+        symbol: str,
+        mark_price: float,
+        timestamp: datetime | None = None,
+        volume: float | None = None,
+    ) -> list[ExecutionReport]:
         """Attempt fills against incoming mark price and return updated reports."""
-        timestamp = timestamp or datetime.utcnow()
         updates: list[ExecutionReport] = []
+        book = self._open_by_symbol.get(symbol)
+        if not book:
+            return updates
 
-        for order_id, state in self._orders.items():
-            if state.status in (OrderStatus.CANCELED, OrderStatus.FILLED, OrderStatus.REJECTED):
-                continue
-            if state.order.symbol != symbol:
-                continue
+        timestamp = timestamp or datetime.utcnow()
+        model = self.liquidity_model if volume is not None else None
+        capacity = model.capacity(volume) if model is not None else float("inf")
 
+        for order_id, state in list(book.items()):
             fillable = False
             if state.order.order_type == OrderType.MARKET:
                 fillable = True
             elif state.order.order_type == OrderType.LIMIT:
                 if state.order.limit_price is None:
                     state.status = OrderStatus.REJECTED
-                    updates.append(self.get_order(order_id))
+                    self._close(order_id, state)
+                    report = self.get_order(order_id)
+                    self._publish(report)
+                    updates.append(report)
                     continue
                 if state.order.side == OrderSide.BUY and mark_price <= state.order.limit_price:
                     fillable = True
@@ -90,25 +151,87 @@ class PaperBrokerAdapter(BrokerAdapter):
             if not fillable:
                 continue
 
-            fill_qty = state.remaining_qty
+            fill_qty = min(state.remaining_qty, capacity)
+            if fill_qty <= 0:
+                break
+            capacity -= fill_qty
+
+            fill_price = mark_price
+            if model is not None:
+                fill_price = model.fill_price(mark_price, state.order.side, fill_qty, volume)
+                if state.order.limit_price is not None:
+                    limit = state.order.limit_price
+                    fill_price = min(fill_price, limit) if state.order.side == OrderSide.BUY else max(fill_price, limit)
+
             state.filled_qty += fill_qty
             state.remaining_qty -= fill_qty
-            state.weighted_notional += fill_qty * mark_price
+            if state.remaining_qty <= 1e-12 * max(state.order.qty, 1.0):
+                state.remaining_qty = 0.0
+            state.weighted_notional += fill_qty * fill_price
             state.status = OrderStatus.FILLED if state.remaining_qty <= 0 else OrderStatus.PARTIALLY_FILLED
+            if state.status == OrderStatus.FILLED:
+                self._close(order_id, state)
 
             self._fills.append(
                 Fill(
                     symbol=state.order.symbol,
                     qty=fill_qty,
-                    price=mark_price,
+                    price=fill_price,
                     side=state.order.side,
                     timestamp=timestamp,
                 )
             )
-            updates.append(self.get_order(order_id))
+            report = self.get_order(order_id)
+            self._publish(report)
+            updates.append(report)
+
+        return updates
+
+    def process_market_data_many(
+        self, ticks: Iterable[tuple[str, float, datetime | None]]
+    ) -> list[ExecutionReport]:
+        """Apply a sequence of (symbol, mark_price, timestamp) ticks in order.
 
+        Ticks for symbols without open orders are skipped with a single dict lookup.
+        """
+        updates: list[ExecutionReport] = []
+        open_by_symbol = self._open_by_symbol
+        for symbol, mark_price, timestamp in ticks:
+            if symbol in open_by_symbol:
+                updates.extend(self.process_market_data(symbol, mark_price, timestamp))
+        return updates
+
+    def process_bars(
+        self,
+        prices: pd.Series,
+        volumes: pd.Series | None = None,
+        timestamp: datetime | None = None,
+    ) -> list[ExecutionReport]:
+        """Apply one bar for a whole universe (Series indexed by symbol).
+
+        Only symbols with resting orders are touched; their prices and volumes are
+        gathered with one vectorized index lookup.
+        """
+        open_symbols = [s for s in self._open_by_symbol]
+        if not open_symbols:
+            return []
+
+        loc = prices.index.get_indexer(open_symbols)
+        px = prices.to_numpy(dtype=float)
+        vol = None if volumes is None else volumes.reindex(prices.index).to_numpy(dtype=float)
+
+        updates: list[ExecutionReport] = []
+        for symbol, i in zip(open_symbols, loc):
+            if i < 0 or not np.isfinite(px[i]):
+                continue
+            bar_volume = None if vol is None or not np.isfinite(vol[i]) else float(vol[i])
+            updates.extend(self.process_market_data(symbol, float(px[i]), timestamp, volume=bar_volume))
         return updates
 
     @property
     def fills(self) -> list[Fill]:
         return list(self._fills)
+
+    def fills_since(self, cursor: int) -> tuple[list[Fill], int]:
+        """Fills recorded after position ``cursor`` and the cursor to pass next time."""
+        return self._fills[cursor:], len(self._fills)
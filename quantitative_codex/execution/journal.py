@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from quantitative_codex.execution.models import Order, OrderSide, order_from_dict, order_to_dict
+
+_SNAPSHOT = "snapshot.json"
+_SEGMENT_PREFIX = "journal-"
+_SEGMENT_SUFFIX = ".log"
+
+
+@dataclass
+class JournalState:
+    """Snapshot baseline plus the fills journaled after it, in order."""
+
+    seq: int = 0
+    positions: dict[str, float] = field(default_factory=dict)
+    avg_cost: dict[str, float] = field(default_factory=dict)
+    realized: dict[str, float] = field(default_factory=dict)
+    open_orders: dict[str, Order] = field(default_factory=dict)
+    applied_fills: dict[str, float] = field(default_factory=dict)
+    applied_notional: dict[str, float] = field(default_factory=dict)
+    closed_orders: dict[str, float] = field(default_factory=dict)  # order id -> final filled qty
+    fills: list[tuple[str, float, OrderSide, float | None]] = field(default_factory=list)
+
+    def apply(self, record: dict[str, object]) -> None:
+        op = record["op"]
+        order_id = str(record["order_id"])
+        if op == "submit":
+            self.open_orders[order_id] = order_from_dict(record["order"])
+            self.applied_fills[order_id] = 0.0
+        elif op == "fill":
+            order = self.open_orders.get(order_id)
+            filled = float(record["filled"])
+            price = record.get("price")
+            if order is not None:
+                incremental = filled - self.applied_fills.get(order_id, 0.0)
+                self.fills.append((order.symbol, incremental, order.side, price))
+                if price is not None:
+                    self.applied_notional[order_id] = self.applied_notional.get(order_id, 0.0) + incremental * price
+            self.applied_fills[order_id] = filled
+        elif op == "close":
+            self.open_orders.pop(order_id, None)
+            self.closed_orders[order_id] = self.applied_fills.pop(order_id, 0.0)
+            self.applied_notional.pop(order_id, None)
+        else:
+            raise ValueError(f"unknown journal op: {op}")
+        self.seq = int(record["seq"])
+
+
+class OMSJournal:
+    """Append-only OMS journal with group commit and compacting snapshots.
+
+    Records (``submit``, ``fill`` with the cumulative filled quantity and the increment's
+    price, ``close``) are buffered and written with one fsync per ``commit`` or whenever
+    ``group_commit`` records are pending. Every ``snapshot_every`` records the OMS writes a snapshot of
+    positions and open orders (tmp file + atomic rename) and the journal rolls over to a
+    new segment, deleting the ones the snapshot covers, so opening a journal only replays
+    the tail written since the last snapshot. The replayed state is in ``recovered``.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        group_commit: int = 256,
+        snapshot_every: int = 10_000,
+        fsync: bool = True,
+    ) -> None:
+        if group_commit <= 0 or snapshot_every <= 0:
+            raise ValueError("group_commit and snapshot_every must be positive")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.group_commit = group_commit
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self._pending: list[str] = []
+        self._segment = None
+        self.recovered = self._load()
+        self._seq = self.recovered.seq
+        self._since_snapshot = self._seq - self._snapshot_seq
+
+    @property
+    def needs_snapshot(self) -> bool:
+        return self._since_snapshot >= self.snapshot_every
+
+    def record_submit(self, order_id: str, order: Order) -> None:
+        self._append({"op": "submit", "order_id": order_id, "order": order_to_dict(order)})
+
+    def record_fill(self, order_id: str, filled_qty: float, price: float | None = None) -> None:
+        self._append({"op": "fill", "order_id": order_id, "filled": filled_qty, "price": price})
+
+    def record_close(self, order_id: str) -> None:
+        self._append({"op": "close", "order_id": order_id})
+
+    def _append(self, record: dict[str, object]) -> None:
+        self._seq += 1
+        self._since_snapshot += 1
+        self._pending.append(json.dumps({"seq": self._seq, **record}, separators=(",", ":")))
+        if len(self._pending) >= self.group_commit:
+            self.commit()
+
+    def commit(self) -> None:
+        """Write pending records and fsync once for the whole group."""
+        if not self._pending:
+            return
+        if self._segment is None:
+            self._segment = open(self._segment_path(self._seq - len(self._pending) + 1), "a", encoding="utf-8")
+        self._segment.write("\n".join(self._pending) + "\n")
+        self._segment.flush()
+        if self.fsync:
+            os.fsync(self._segment.fileno())
+        self._pending.clear()
+
+    def write_snapshot(self, state: JournalState) -> None:
+        """Persist ``state`` (which must reflect every journaled record) and compact."""
+        self.commit()
+        payload = {
+            "seq": self._seq,
+            "positions": state.positions,
+            "avg_cost": state.avg_cost,
+            "realized": state.realized,
+            "open_orders": {
+                order_id: {
+                    "order": order_to_dict(order),
+                    "filled": state.applied_fills.get(order_id, 0.0),
+                    "notional": state.applied_notional.get(order_id, 0.0),
+                }
+                for order_id, order in state.open_orders.items()
+            },
+            "closed_orders": state.closed_orders,
+        }
+        tmp = self.directory / f"{_SNAPSHOT}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, separators=(",", ":"))
+            fh.flush()
+            if self.fsync:
+                os.fsync(fh.fileno())
+        os.replace(tmp, self.directory / _SNAPSHOT)
+        self._fsync_directory()
+
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+        for path in self._segments():
+            path.unlink()
+        self._snapshot_seq = self._seq
+        self._since_snapshot = 0
+
+    def close(self) -> None:
+        self.commit()
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+    def _load(self) -> JournalState:
+        state = JournalState()
+        snapshot = self.directory / _SNAPSHOT
+        if snapshot.exists():
+            payload = json.loads(snapshot.read_text(encoding="utf-8"))
+            state.seq = int(payload["seq"])
+            state.positions = {s: float(q) for s, q in payload["positions"].items()}
+            state.avg_cost = {s: float(v) for s, v in payload.get("avg_cost", {}).items()}
+            state.realized = {s: float(v) for s, v in payload.get("realized", {}).items()}
+            for order_id, entry in payload["open_orders"].items():
+                state.open_orders[order_id] = order_from_dict(entry["order"])
+                state.applied_fills[order_id] = float(entry["filled"])
+                state.applied_notional[order_id] = float(entry.get("notional", 0.0))
+            state.closed_orders = {o: float(q) for o, q in payload.get("closed_orders", {}).items()}
+        self._snapshot_seq = state.seq
+
+        for path in self._segments():
+            with open(path, "rb+") as fh:
+                offset = 0
+                for line in fh:
+                    try:
+                        record = json.loads(line) if line.endswith(b"\n") else None
+                    except ValueError:
+                        record = None
+                    if record is None:
+                        # torn final write from a crash; nothing after it was committed. Cut
+                        # it off so the next commit (possibly to this same segment) starts on
+                        # a clean line instead of being glued onto the torn one.
+                        fh.truncate(offset)
+                        fh.flush()
+                        if self.fsync:
+                            os.fsync(fh.fileno())
+                        break
+                    offset += len(line)
+                    if record["seq"] > state.seq:
+                        state.apply(record)
+        return state
+
+    def _segments(self) -> list[Path]:
+        return sorted(self.directory.glob(f"{_SEGMENT_PREFIX}*{_SEGMENT_SUFFIX}"))
+
+    def _segment_path(self, first_seq: int) -> Path:
+        return self.directory / f"{_SEGMENT_PREFIX}{first_seq:012d}{_SEGMENT_SUFFIX}"
+
+    def _fsync_directory(self) -> None:
+        if not self.fsync or not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
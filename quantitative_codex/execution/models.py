@@ -22,9 +22,10 @@ class OrderStatus(str, Enum):
     FILLED = "filled"
     CANCELED = "canceled"
     REJECTED = "rejected"
+    UNKNOWN = "unknown"  # submit outcome not confirmed by the broker
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Order:
     symbol: str
     qty: float
@@ -34,7 +35,7 @@ class Order:
     client_order_id: str | None = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Fill:
     symbol: str
     qty: float
@@ -43,10 +44,32 @@ class Fill:
     timestamp: datetime = field(default_factory=datetime.utcnow)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ExecutionReport:
     order_id: str
     status: OrderStatus
     filled_qty: float
     avg_fill_price: float | None
     message: str = ""
+
+
+def order_to_dict(order: Order) -> dict[str, object]:
+    return {
+        "symbol": order.symbol,
+        "qty": order.qty,
+        "side": order.side.value,
+        "order_type": order.order_type.value,
+        "limit_price": order.limit_price,
+        "client_order_id": order.client_order_id,
+    }
+
+
+def order_from_dict(payload: dict[str, object]) -> Order:
+    return Order(
+        symbol=str(payload["symbol"]),
+        qty=float(payload["qty"]),
+        side=OrderSide(payload["side"]),
+        order_type=OrderType(payload.get("order_type", OrderType.MARKET.value)),
+        limit_price=payload.get("limit_price"),
+        client_order_id=payload.get("client_order_id"),
+    )
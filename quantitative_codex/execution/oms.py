@@ -1,40 +1,105 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from datetime import datetime
+from collections import deque
 
 import pandas as pd
 
 from quantitative_codex.execution.brokers.base import BrokerAdapter
+from quantitative_codex.execution.journal import JournalState, OMSJournal
 from quantitative_codex.execution.models import ExecutionReport, Order, OrderSide, OrderStatus, OrderType
+from quantitative_codex.execution.order_log import OrderEventLog
+from quantitative_codex.execution.positions import PositionBook
+from quantitative_codex.execution.pretrade import PreTradeCheck
+from quantitative_codex.profiling import profiled
 
 
-@dataclass
-class PositionBook:
-    quantities: dict[str, float] = field(default_factory=dict)
+class OMS:
+    """Simple order management system for target-position execution.
 
-    def apply_fill(self, symbol: str, qty: float, side: OrderSide) -> None:
-        signed = qty if side == OrderSide.BUY else -qty
-        self.quantities[symbol] = self.quantities.get(symbol, 0.0) + signed
+    With a streaming broker, execution reports are queued as they are pushed and ``sync``
+    only applies what arrived; otherwise ``sync`` polls all open orders in one batch.
 
-    def snapshot(self) -> pd.Series:
-        if not self.quantities:
-            return pd.Series(dtype=float)
-        return pd.Series(self.quantities).sort_index()
+    Fill increments are priced from the change in each order's average fill price, so the
+    position book keeps cost basis and realized PnL per symbol.
 
+    With a ``journal``, submissions, fill increments and closes are journaled and committed
+    once per ``submit_orders``/``sync`` call, and the OMS starts from the journal's recovered
+    positions and open orders.
 
-class OMS:
-    """Simple order management system for target-position execution."""
+    Closed orders leave the per-order fill state; the newest ``_CLOSED_ORDER_LIMIT`` of
+    them are kept with their final filled quantity (and snapshotted with the journal), so
+    ``filled_qty`` and duplicate client id rejection work the same after a recovery.
+    """
+
+    _TERMINAL = (OrderStatus.FILLED, OrderStatus.CANCELED, OrderStatus.REJECTED)
+    _EARLY_REPORT_LIMIT = 10_000
+    _CLOSED_ORDER_LIMIT = 100_000
 
-    def __init__(self, broker: BrokerAdapter) -> None:
+    def __init__(
+        self,
+        broker: BrokerAdapter,
+        risk_gate: PreTradeCheck | None = None,
+        order_log: OrderEventLog | None = None,
+        journal: OMSJournal | None = None,
+    ) -> None:
         self.broker = broker
+        self.risk_gate = risk_gate
         self.positions = PositionBook()
-        self.order_log: list[dict[str, object]] = []
+        self.order_log = order_log if order_log is not None else OrderEventLog()
         self._open_orders: dict[str, Order] = {}
         self._applied_fills: dict[str, float] = {}
+        self._applied_notional: dict[str, float] = {}
+        self._closed_orders: dict[str, float] = {}  # order id -> final filled qty, oldest first
+        self._working_qty: dict[str, float] = {}
+        self._reject_seq = 0
+        self._pending_reports: deque[ExecutionReport] = deque()
+        self._early_reports: dict[str, ExecutionReport] = {}
+        self.journal = journal
+        if journal is not None:
+            self._restore(journal.recovered)
+        self.streaming = broker.supports_streaming
+        if self.streaming:
+            broker.subscribe(self.on_execution_report)
+
+    def _restore(self, state: JournalState) -> None:
+        self.positions.restore(state.positions, state.avg_cost, state.realized)
+        for symbol, qty, side, price in state.fills:
+            self.positions.apply_fill(symbol, qty, side, price)
+        self._open_orders.update(state.open_orders)
+        self._applied_fills.update(state.applied_fills)
+        self._applied_notional.update(state.applied_notional)
+        for order_id, filled in state.closed_orders.items():
+            self._remember_closed(order_id, filled)
+        for order_id, order in state.open_orders.items():
+            self._add_working(order, max(order.qty - state.applied_fills.get(order_id, 0.0), 0.0))
+
+    def _journal_state(self) -> JournalState:
+        ledger = self.positions.ledger()
+        return JournalState(
+            seq=0,
+            positions=ledger["qty"].to_dict(),
+            avg_cost=ledger["avg_cost"].to_dict(),
+            realized=ledger["realized_pnl"].to_dict(),
+            open_orders=dict(self._open_orders),
+            applied_fills={order_id: self._applied_fills.get(order_id, 0.0) for order_id in self._open_orders},
+            applied_notional={order_id: self._applied_notional.get(order_id, 0.0) for order_id in self._open_orders},
+            closed_orders=dict(self._closed_orders),
+        )
+
+    def _commit_journal(self) -> None:
+        journal = self.journal
+        if journal is None:
+            return
+        journal.commit()
+        if journal.needs_snapshot:
+            journal.write_snapshot(self._journal_state())
+
+    def on_execution_report(self, report: ExecutionReport) -> None:
+        """Broker callback; reports are applied on the next ``sync``."""
+        self._pending_reports.append(report)
 
     def generate_orders_from_target(self, target_positions: pd.Series) -> list[Order]:
-        current = self.positions.snapshot().reindex(target_positions.index).fillna(0.0)
+        current = self.positions.reindex(target_positions.index)
         delta = target_positions - current
         orders: list[Order] = []
 
@@ -52,44 +117,140 @@ class OMS:
             )
         return orders
 
+    @profiled
     def submit_orders(self, orders: list[Order]) -> list[ExecutionReport]:
         reports = []
-        for order in orders:
+        for order, reason in zip(orders, self._screen_orders(orders)):
+            if reason is not None:
+                reports.append(self._record_reject(order, reason))
+                continue
             report = self.broker.submit_order(order)
+            self._record_submission(order, report)
             reports.append(report)
-            if report.status in (OrderStatus.SUBMITTED, OrderStatus.PARTIALLY_FILLED):
-                self._open_orders[report.order_id] = order
-                self._applied_fills.setdefault(report.order_id, 0.0)
-            self._log_event("submit", report.order_id, order.symbol, order.qty, order.side.value, report.status.value)
+        self._commit_journal()
         return reports
 
+    def _screen_orders(self, orders: list[Order]) -> list[str | None]:
+        """Reject reason or None per order: duplicate client ids first, then the risk gate.
+
+        A reused client id would be merged with the old order's fill state, so it is
+        rejected whether it repeats a known order or an earlier order of the same batch.
+        Duplicates are not shown to the risk gate and do not count towards its limits.
+        """
+        verdicts: list[str | None] = [None] * len(orders)
+        batch_ids: set[str] = set()
+        for i, order in enumerate(orders):
+            client_id = order.client_order_id
+            if client_id is None:
+                continue
+            if client_id in self._applied_fills or client_id in self._closed_orders or client_id in batch_ids:
+                verdicts[i] = "duplicate_client_order_id"
+            batch_ids.add(client_id)
+        if self.risk_gate is not None:
+            rows = [i for i, reason in enumerate(verdicts) if reason is None]
+            checked = self.risk_gate.check_orders([orders[i] for i in rows], self.positions.quantities, self._working_qty)
+            for i, reason in zip(rows, checked):
+                verdicts[i] = reason
+        return verdicts
+
+    def _record_reject(self, order: Order, reason: str) -> ExecutionReport:
+        report = self._reject(order, reason)
+        self._log_event("reject", report.order_id, order.symbol, order.qty, order.side.value, report.status.value)
+        return report
+
+    def _record_submission(self, order: Order, report: ExecutionReport) -> None:
+        if report.status in (OrderStatus.SUBMITTED, OrderStatus.PARTIALLY_FILLED, OrderStatus.UNKNOWN):
+            self._open_orders[report.order_id] = order
+            self._applied_fills.setdefault(report.order_id, 0.0)
+            self._add_working(order, order.qty)
+            if self.journal is not None:
+                self.journal.record_submit(report.order_id, order)
+            early = self._early_reports.pop(report.order_id, None)
+            if early is not None:
+                self._pending_reports.append(early)
+        self._log_event("submit", report.order_id, order.symbol, order.qty, order.side.value, report.status.value)
+
+    def filled_qty(self, order_id: str) -> float:
+        """Quantity of ``order_id`` applied to positions so far."""
+        filled = self._applied_fills.get(order_id)
+        return filled if filled is not None else self._closed_orders.get(order_id, 0.0)
+
+    def _reject(self, order: Order, reason: str) -> ExecutionReport:
+        self._reject_seq += 1
+        order_id = order.client_order_id or f"rejected-{self._reject_seq:08d}"
+        return ExecutionReport(order_id=order_id, status=OrderStatus.REJECTED, filled_qty=0.0, avg_fill_price=None, message=reason)
+
+    def _add_working(self, order: Order, qty: float) -> None:
+        signed = qty if order.side == OrderSide.BUY else -qty
+        remaining = self._working_qty.get(order.symbol, 0.0) + signed
+        if abs(remaining) < 1e-12:
+            self._working_qty.pop(order.symbol, None)
+        else:
+            self._working_qty[order.symbol] = remaining
+
+    @profiled
     def sync(self) -> list[ExecutionReport]:
+        if self.streaming:
+            updates = self._drain_reports()
+        else:
+            updates = self.broker.get_orders(list(self._open_orders))
+            for report in updates:
+                self._apply_report(report)
+        self._commit_journal()
+        return updates
+
+    def _drain_reports(self) -> list[ExecutionReport]:
         updates = []
-        for order_id, order in list(self._open_orders.items()):
-            report = self.broker.get_order(order_id)
+        pending = self._pending_reports
+        while pending:
+            report = pending.popleft()
+            if report.order_id not in self._open_orders:
+                # pushed before submit returned, or for an order this OMS does not own
+                if report.order_id not in self._closed_orders:
+                    self._early_reports[report.order_id] = report
+                    if len(self._early_reports) > self._EARLY_REPORT_LIMIT:
+                        del self._early_reports[next(iter(self._early_reports))]
+                continue
             updates.append(report)
-            self._log_event("status", order_id, order.symbol, order.qty, order.side.value, report.status.value)
+            self._apply_report(report)
+        return updates
 
-            prev_applied = self._applied_fills.get(order_id, 0.0)
-            incremental_fill = max(report.filled_qty - prev_applied, 0.0)
-            if incremental_fill > 0:
-                self.positions.apply_fill(order.symbol, incremental_fill, order.side)
-                self._applied_fills[order_id] = report.filled_qty
+    def _apply_report(self, report: ExecutionReport) -> None:
+        order_id = report.order_id
+        order = self._open_orders.get(order_id)
+        if order is None:
+            return
+        self._log_event("status", order_id, order.symbol, order.qty, order.side.value, report.status.value)
 
-            if report.status in (OrderStatus.FILLED, OrderStatus.CANCELED, OrderStatus.REJECTED):
-                self._open_orders.pop(order_id, None)
+        prev_applied = self._applied_fills.get(order_id, 0.0)
+        incremental_fill = max(report.filled_qty - prev_applied, 0.0)
+        if incremental_fill > 0:
+            price = None
+            if report.avg_fill_price is not None:
+                notional = report.filled_qty * report.avg_fill_price
+                price = (notional - self._applied_notional.get(order_id, 0.0)) / incremental_fill
+                self._applied_notional[order_id] = notional
+            self.positions.apply_fill(order.symbol, incremental_fill, order.side, price)
+            self._applied_fills[order_id] = report.filled_qty
+            self._add_working(order, -incremental_fill)
+            if self.journal is not None:
+                self.journal.record_fill(order_id, report.filled_qty, price)
 
-        return updates
+        if report.status in self._TERMINAL:
+            self._open_orders.pop(order_id, None)
+            self._applied_notional.pop(order_id, None)
+            filled = self._applied_fills.pop(order_id, 0.0)
+            self._add_working(order, -max(order.qty - filled, 0.0))
+            self._remember_closed(order_id, filled)
+            if self.journal is not None:
+                self.journal.record_close(order_id)
+
+    def _remember_closed(self, order_id: str, filled: float) -> None:
+        closed = self._closed_orders
+        closed.pop(order_id, None)
+        closed[order_id] = filled
+        if len(closed) > self._CLOSED_ORDER_LIMIT:
+            del closed[next(iter(closed))]
 
     def _log_event(self, event: str, order_id: str, symbol: str, qty: float, side: str, status: str) -> None:
-        self.order_log.append(
-            {
-                "ts": datetime.utcnow().isoformat(),
-                "event": event,
-                "order_id": order_id,
-                "symbol": symbol,
-                "qty": qty,
-                "side": side,
-                "status": status,
-            }
-        )
+        self.order_log.append(event, order_id, symbol, qty, side, status)
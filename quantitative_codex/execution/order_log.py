@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SPILL_DTYPE = np.dtype(
+    [
+        ("ts", "<i8"),
+        ("event", "<i2"),
+        ("order_id", "<i4"),
+        ("symbol", "<i4"),
+        ("qty", "<f8"),
+        ("side", "<i2"),
+        ("status", "<i2"),
+    ]
+)
+
+_CODED = ("event", "order_id", "symbol", "side", "status")
+
+
+class _Interner:
+    """String <-> code table. Codes are never reused, so a pruned value that shows up
+    again gets a new code (and a second entry in the spill string table)."""
+
+    def __init__(self) -> None:
+        self.codes: dict[str, int] = {}
+        self.values: dict[int, str] = {}
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def code(self, value: str) -> tuple[int, bool]:
+        code = self.codes.get(value)
+        if code is not None:
+            return code, False
+        code = self._next
+        self._next += 1
+        self.codes[value] = code
+        self.values[code] = value
+        return code, True
+
+    def prune(self, live: np.ndarray) -> None:
+        """Forget every value whose code is not in ``live``."""
+        self.values = {int(code): self.values[int(code)] for code in np.unique(live)}
+        self.codes = {value: code for code, value in self.values.items()}
+
+    def categories(self, codes: np.ndarray) -> tuple[np.ndarray, list[str]]:
+        """``codes`` remapped onto ``0..k-1`` plus the ``k`` values actually in use."""
+        used = np.unique(codes)
+        return np.searchsorted(used, codes), [self.values[int(code)] for code in used]
+
+
+class OrderEventLog:
+    """Columnar order event log with a bounded in-memory window.
+
+    Events are stored as integer-nanosecond timestamps, float quantities and interned
+    integer codes for event, order id, symbol, side and status. The newest ``capacity``
+    events stay in memory; with ``spill_path`` every event is also appended to a binary
+    file (``SPILL_DTYPE`` records) in batches of ``spill_batch``, and new interned strings
+    go to ``<spill_path>.strings`` as ``column<TAB>value`` lines. Running per-status and
+    per-event counters cover every event ever logged, including spilled ones.
+
+    Order ids are unbounded, so the order id table is pruned to the ids still in the
+    window whenever it grows past twice ``capacity``; ``to_frame`` only builds categories
+    for the codes present in the window. Both keep their cost proportional to the window
+    rather than to the log's history.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 65_536,
+        spill_path: str | Path | None = None,
+        spill_batch: int | None = None,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.spill_path = Path(spill_path) if spill_path is not None else None
+        self.spill_batch = min(spill_batch or max(capacity // 4, 1), capacity)
+        # columns grow geometrically up to ``capacity`` so idle logs stay small
+        self._columns = {name: np.zeros(min(capacity, 1024), dtype=SPILL_DTYPE[name]) for name in SPILL_DTYPE.names}
+        self._interners = {name: _Interner() for name in _CODED}
+        self._new_strings: list[tuple[str, str]] = []
+        self._head = 0
+        self._size = 0
+        self._unspilled = 0
+        self.total_events = 0
+        self.status_counts: dict[str, int] = {}
+        self.event_counts: dict[str, int] = {}
+
+    def append(self, event: str, order_id: str, symbol: str, qty: float, side: str, status: str) -> None:
+        pos = self._head
+        cols = self._columns
+        if pos == len(cols["ts"]):
+            size = min(2 * pos, self.capacity)
+            for name, col in cols.items():
+                cols[name] = np.concatenate([col, np.zeros(size - pos, dtype=col.dtype)])
+        cols["ts"][pos] = time.time_ns()
+        cols["qty"][pos] = qty
+        for name, value in (("event", event), ("order_id", order_id), ("symbol", symbol), ("side", side), ("status", status)):
+            code, is_new = self._interners[name].code(value)
+            cols[name][pos] = code
+            if is_new and self.spill_path is not None:
+                self._new_strings.append((name, value))
+
+        self._head = (pos + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        order_ids = self._interners["order_id"]
+        if len(order_ids) > 2 * self.capacity:
+            order_ids.prune(self._window()["order_id"])
+        self.total_events += 1
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        self.event_counts[event] = self.event_counts.get(event, 0) + 1
+
+        if self.spill_path is not None:
+            self._unspilled += 1
+            if self._unspilled >= self.spill_batch:
+                self.flush()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def status_ratio(self, status: str) -> float:
+        return self.status_counts.get(status, 0) / self.total_events if self.total_events else 0.0
+
+    def flush(self) -> None:
+        """Append all not-yet-spilled events to the spill file."""
+        if self.spill_path is None or self._unspilled == 0:
+            return
+        if self._new_strings:
+            with open(f"{self.spill_path}.strings", "a", encoding="utf-8") as fh:
+                fh.writelines(f"{name}\t{value}\n" for name, value in self._new_strings)
+            self._new_strings.clear()
+
+        start = (self._head - self._unspilled) % self.capacity
+        idx = (start + np.arange(self._unspilled)) % self.capacity
+        batch = np.empty(self._unspilled, dtype=SPILL_DTYPE)
+        for name in SPILL_DTYPE.names:
+            batch[name] = self._columns[name][idx]
+        with open(self.spill_path, "ab") as fh:
+            batch.tofile(fh)
+        self._unspilled = 0
+
+    def _window(self) -> dict[str, np.ndarray]:
+        start = (self._head - self._size) % self.capacity
+        if start + self._size <= self.capacity:
+            # contiguous window: plain slices, no copy
+            return {name: col[start : start + self._size] for name, col in self._columns.items()}
+        return {name: np.concatenate([col[start:], col[: self._head]]) for name, col in self._columns.items()}
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame over the in-memory window; numeric columns are views when not wrapped."""
+        window = self._window()
+        data: dict[str, object] = {"ts": window["ts"].view("datetime64[ns]")}
+        for name in ("event", "order_id", "symbol", "qty", "side", "status"):
+            if name in self._interners:
+                codes, categories = self._interners[name].categories(window[name])
+                data[name] = pd.Categorical.from_codes(codes, categories=categories)
+            else:
+                data[name] = window[name]
+        return pd.DataFrame(data, copy=False)
+
+    @staticmethod
+    def read_spill(path: str | Path) -> pd.DataFrame:
+        """Decode a spill file and its string table back into a DataFrame."""
+        records = np.fromfile(path, dtype=SPILL_DTYPE)
+        tables: dict[str, list[str]] = {name: [] for name in _CODED}
+        strings = Path(f"{path}.strings")
+        if strings.exists():
+            for line in strings.read_text(encoding="utf-8").splitlines():
+                name, value = line.split("\t", 1)
+                tables[name].append(value)
+
+        data: dict[str, object] = {"ts": records["ts"].view("datetime64[ns]")}
+        for name in ("event", "order_id", "symbol", "qty", "side", "status"):
+            if name in tables:
+                # a pruned order id that came back was written again under a new code
+                table_codes, categories = pd.factorize(pd.Index(tables[name], dtype=object))
+                data[name] = pd.Categorical.from_codes(table_codes[records[name]], categories=categories)
+            else:
+                data[name] = records[name]
+        return pd.DataFrame(data)
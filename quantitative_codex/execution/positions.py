@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+from numpy.typing import ArrayLike
+
+from quantitative_codex.execution.models import OrderSide
+
+_FLAT = 1e-12
+
+
+class _QuantityView(Mapping[str, float]):
+    """Read-only ``symbol -> quantity`` mapping over a ``PositionBook``."""
+
+    __slots__ = ("_book",)
+
+    def __init__(self, book: PositionBook) -> None:
+        self._book = book
+
+    def __getitem__(self, symbol: str) -> float:
+        return float(self._book._qty[self._book._slots[symbol]])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._book._symbols)
+
+    def __len__(self) -> int:
+        return len(self._book._symbols)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._book._slots
+
+    def get(self, symbol: str, default: float | None = None) -> float | None:
+        slot = self._book._slots.get(symbol)
+        return default if slot is None else float(self._book._qty[slot])
+
+
+class PositionBook:
+    """Positions stored in float arrays with a stable ``symbol -> slot`` index.
+
+    Slots are assigned on first sight and never move, so fills are array updates and the
+    sorted ``snapshot`` only re-sorts when a new symbol appears. ``quantities`` is a live
+    read-only mapping view.
+
+    Fills that carry a price update an average-cost basis and realized PnL per symbol
+    (fills without a price only move the quantity). ``mark_to_market`` values the whole
+    book against a price vector and appends to the running PnL history behind
+    ``pnl_frame`` and ``equity_series``.
+    """
+
+    def __init__(self, quantities: Mapping[str, float] | None = None) -> None:
+        self._slots: dict[str, int] = {}
+        self._symbols: list[str] = []
+        self._qty = np.zeros(64)
+        self._avg_cost = np.zeros(64)
+        self._realized = np.zeros(64)
+        self._marks = np.full(64, np.nan)
+        self._sorted: tuple[np.ndarray, pd.Index] | None = None
+        self._mark_index: tuple[pd.Index, np.ndarray] | None = None
+        self._pnl_ts: list[object] = []
+        self._pnl_realized: list[float] = []
+        self._pnl_unrealized: list[float] = []
+        self.quantities = _QuantityView(self)
+        if quantities:
+            symbols = list(quantities)
+            self._qty[self.slots(symbols)] = [float(quantities[s]) for s in symbols]
+
+    def slot(self, symbol: str) -> int:
+        slot = self._slots.get(symbol)
+        if slot is None:
+            slot = len(self._symbols)
+            if slot == len(self._qty):
+                self._grow()
+            self._slots[symbol] = slot
+            self._symbols.append(symbol)
+            self._sorted = None
+        return slot
+
+    def _grow(self) -> None:
+        n = len(self._qty)
+        self._qty = np.concatenate([self._qty, np.zeros(n)])
+        self._avg_cost = np.concatenate([self._avg_cost, np.zeros(n)])
+        self._realized = np.concatenate([self._realized, np.zeros(n)])
+        self._marks = np.concatenate([self._marks, np.full(n, np.nan)])
+
+    def slots(self, symbols: Iterable[str]) -> np.ndarray:
+        return np.fromiter((self.slot(s) for s in symbols), dtype=np.intp)
+
+    def apply_fill(self, symbol: str, qty: float, side: OrderSide, price: float | None = None) -> None:
+        signed = qty if side == OrderSide.BUY else -qty
+        slot = self.slot(symbol)
+        if price is None:
+            self._qty[slot] += signed
+            return
+
+        current = float(self._qty[slot])
+        avg = float(self._avg_cost[slot])
+        after = current + signed
+        if abs(after) < _FLAT:
+            after = 0.0
+        if current * signed >= 0:
+            if after != 0.0:
+                avg = (abs(current) * avg + abs(signed) * price) / abs(after)
+        else:
+            closed = min(abs(signed), abs(current))
+            self._realized[slot] += closed * (price - avg) * (1.0 if current > 0 else -1.0)
+            if abs(signed) > abs(current):
+                avg = price
+        self._qty[slot] = after
+        self._avg_cost[slot] = avg if after != 0.0 else 0.0
+
+    def apply_fills(
+        self,
+        symbols: Sequence[str],
+        qty: ArrayLike,
+        sides: Sequence[OrderSide] | None = None,
+        prices: ArrayLike | None = None,
+    ) -> None:
+        """Apply many fills at once; without ``sides`` the quantities are already signed.
+
+        With ``prices``, fills on the same symbol are applied in batch order: the batch is
+        split into rounds holding at most one fill per symbol and each round is vectorized.
+        """
+        slots = self.slots(symbols)
+        signed = np.asarray(qty, dtype=float)
+        if sides is not None:
+            signed = np.where([side == OrderSide.BUY for side in sides], signed, -signed)
+        if prices is None:
+            np.add.at(self._qty, slots, signed)
+            return
+
+        px = np.asarray(prices, dtype=float)
+        n = len(slots)
+        if n == 0:
+            return
+        order = np.argsort(slots, kind="stable")
+        sorted_slots = slots[order]
+        starts = np.r_[True, sorted_slots[1:] != sorted_slots[:-1]]
+        group_start = np.maximum.accumulate(np.where(starts, np.arange(n), 0))
+        rank = np.empty(n, dtype=np.intp)
+        rank[order] = np.arange(n) - group_start
+        for r in range(int(rank.max()) + 1):
+            take = rank == r
+            self._apply_priced(slots[take], signed[take], px[take])
+
+    def _apply_priced(self, slots: np.ndarray, signed: np.ndarray, price: np.ndarray) -> None:
+        current = self._qty[slots]
+        avg = self._avg_cost[slots]
+        after = current + signed
+        after[np.abs(after) < _FLAT] = 0.0
+
+        opening = current * signed >= 0
+        closed = np.where(opening, 0.0, np.minimum(np.abs(signed), np.abs(current)))
+        self._realized[slots] += closed * (price - avg) * np.sign(current)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            grown = (np.abs(current) * avg + np.abs(signed) * price) / np.abs(after)
+        flipped = ~opening & (np.abs(signed) > np.abs(current))
+        new_avg = np.where(opening, grown, np.where(flipped, price, avg))
+        self._qty[slots] = after
+        self._avg_cost[slots] = np.where(after == 0.0, 0.0, new_avg)
+
+    def restore(
+        self,
+        quantities: Mapping[str, float],
+        avg_cost: Mapping[str, float] | None = None,
+        realized: Mapping[str, float] | None = None,
+    ) -> None:
+        """Load per-symbol state, e.g. from a journal snapshot."""
+        for name, values in (("_qty", quantities), ("_avg_cost", avg_cost or {}), ("_realized", realized or {})):
+            if values:
+                symbols = list(values)
+                slots = self.slots(symbols)
+                getattr(self, name)[slots] = [float(values[s]) for s in symbols]
+
+    def reindex(self, symbols: Iterable[str]) -> np.ndarray:
+        """Quantities aligned to ``symbols``; unknown symbols are flat."""
+        lookup = self._slots.get
+        idx = np.fromiter((lookup(s, -1) for s in symbols), dtype=np.intp)
+        out = self._qty[idx]
+        out[idx < 0] = 0.0
+        return out
+
+    def _sorted_slots(self) -> tuple[np.ndarray, pd.Index]:
+        if self._sorted is None:
+            order = np.argsort(np.array(self._symbols, dtype=object), kind="stable")
+            self._sorted = (order, pd.Index(np.array(self._symbols, dtype=object)[order]))
+        return self._sorted
+
+    def snapshot(self) -> pd.Series:
+        if not self._symbols:
+            return pd.Series(dtype=float)
+        order, index = self._sorted_slots()
+        return pd.Series(self._qty[order], index=index)
+
+    def mark_to_market(self, prices: pd.Series | Mapping[str, float], timestamp: object | None = None) -> float:
+        """Update marks from ``prices``, record a PnL point and return total PnL.
+
+        Symbols without a price keep their previous mark; symbols never marked carry no
+        unrealized PnL. Slot lookups are cached per price index, so repeated calls with
+        the same universe are pure array operations.
+        """
+        if not isinstance(prices, pd.Series):
+            prices = pd.Series(prices, dtype=float)
+        cached = self._mark_index
+        if cached is not None and cached[0] is prices.index and len(cached[1]) == len(prices):
+            idx = cached[1]
+        else:
+            lookup = self._slots.get
+            idx = np.fromiter((lookup(s, -1) for s in prices.index), dtype=np.intp)
+            if (idx >= 0).all():
+                self._mark_index = (prices.index, idx)
+        values = prices.to_numpy(dtype=float)
+        known = (idx >= 0) & ~np.isnan(values)
+        self._marks[idx[known]] = values[known]
+
+        realized, unrealized = self._totals()
+        self._pnl_ts.append(timestamp if timestamp is not None else datetime.now(timezone.utc))
+        self._pnl_realized.append(realized)
+        self._pnl_unrealized.append(unrealized)
+        return realized + unrealized
+
+    def _totals(self) -> tuple[float, float]:
+        n = len(self._symbols)
+        marks = self._marks[:n]
+        marked = ~np.isnan(marks)
+        unrealized = float((self._qty[:n][marked] * (marks[marked] - self._avg_cost[:n][marked])).sum())
+        return float(self._realized[:n].sum()), unrealized
+
+    @property
+    def realized_pnl(self) -> float:
+        return self._totals()[0]
+
+    @property
+    def unrealized_pnl(self) -> float:
+        return self._totals()[1]
+
+    def ledger(self) -> pd.DataFrame:
+        """Per-symbol quantity, average cost, mark and PnL, sorted by symbol."""
+        columns = ["qty", "avg_cost", "mark", "realized_pnl", "unrealized_pnl"]
+        if not self._symbols:
+            return pd.DataFrame(columns=columns, dtype=float)
+        order, index = self._sorted_slots()
+        qty = self._qty[order]
+        avg = self._avg_cost[order]
+        marks = self._marks[order]
+        unrealized = np.where(np.isnan(marks), 0.0, qty * (marks - avg))
+        data = np.column_stack([qty, avg, marks, self._realized[order], unrealized])
+        return pd.DataFrame(data, index=index, columns=columns)
+
+    def pnl_frame(self) -> pd.DataFrame:
+        """Realized, unrealized and total PnL at every ``mark_to_market`` call."""
+        frame = pd.DataFrame(
+            {"realized": self._pnl_realized, "unrealized": self._pnl_unrealized},
+            index=pd.Index(self._pnl_ts, name="timestamp"),
+            dtype=float,
+        )
+        frame["total"] = frame["realized"] + frame["unrealized"]
+        return frame
+
+    def equity_series(self, starting_equity: float) -> pd.Series:
+        """Account equity at every mark, ready for ``evaluate_alerts``."""
+        return (starting_equity + self.pnl_frame()["total"]).rename("equity")
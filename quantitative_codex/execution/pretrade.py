@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Mapping, Protocol
+
+import pandas as pd
+
+from quantitative_codex.execution.models import Order, OrderSide
+
+
+class PreTradeCheck(Protocol):
+    """Gate plugged into ``OMS.submit_orders``; returns a reject reason or None per order."""
+
+    def check_orders(
+        self,
+        orders: list[Order],
+        positions: Mapping[str, float],
+        working: Mapping[str, float],
+    ) -> list[str | None]: ...
+
+
+@dataclass
+class PreTradeLimits:
+    max_order_notional: float | None = None
+    max_position_qty: float | None = None
+    symbol_position_limits: dict[str, float] = field(default_factory=dict)
+    max_gross_exposure: float | None = None
+    restricted_symbols: set[str] = field(default_factory=set)
+    max_orders_per_window: int | None = None
+    throttle_window_seconds: float = 1.0
+
+
+class PreTradeRiskGate:
+    """Pre-trade checks with limits compiled into flat lookups.
+
+    Checks run in order: restricted list, order-rate throttle, per-order notional,
+    per-symbol position (including working orders), then gross exposure. Accepted orders
+    count towards the projected positions and exposure of the rest of the batch.
+
+    Gross exposure is only known if every held or working symbol has a reference price;
+    otherwise orders that increase exposure are rejected as ``unpriced_position`` and
+    orders that reduce it still go through.
+    """
+
+    def __init__(
+        self,
+        limits: PreTradeLimits,
+        reference_prices: Mapping[str, float] | pd.Series | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.limits = limits
+        self.clock = clock
+        self._restricted = frozenset(limits.restricted_symbols)
+        self._max_notional = math.inf if limits.max_order_notional is None else float(limits.max_order_notional)
+        self._default_position = math.inf if limits.max_position_qty is None else float(limits.max_position_qty)
+        self._position_limits = {s: float(v) for s, v in limits.symbol_position_limits.items()}
+        self._max_gross = math.inf if limits.max_gross_exposure is None else float(limits.max_gross_exposure)
+        self._max_rate = limits.max_orders_per_window
+        self._window = float(limits.throttle_window_seconds)
+        self._needs_price = self._max_notional < math.inf or self._max_gross < math.inf
+        self._recent: deque[float] = deque()
+        self._prices: dict[str, float] = {}
+        if reference_prices is not None:
+            self.update_prices(reference_prices)
+
+    def update_prices(self, prices: Mapping[str, float] | pd.Series) -> None:
+        items = prices.items()
+        self._prices.update((str(s), float(p)) for s, p in items)
+
+    def check_orders(
+        self,
+        orders: list[Order],
+        positions: Mapping[str, float],
+        working: Mapping[str, float],
+    ) -> list[str | None]:
+        prices = self._prices
+        projected: dict[str, float] = {}
+        gross = 0.0
+        if self._max_gross < math.inf:
+            for symbol in set(positions) | set(working):
+                qty = positions.get(symbol, 0.0) + working.get(symbol, 0.0)
+                if qty == 0.0:
+                    continue
+                price = prices.get(symbol)
+                if price is None:
+                    gross = math.inf  # unknown; stays inf for the rest of the batch
+                    break
+                gross += abs(qty) * price
+
+        results: list[str | None] = []
+        for order in orders:
+            reason = self._check_one(order, positions, working, projected, gross)
+            if reason is None:
+                symbol = order.symbol
+                price = order.limit_price if order.limit_price is not None else prices.get(symbol, 0.0)
+                before = projected.get(symbol)
+                if before is None:
+                    before = positions.get(symbol, 0.0) + working.get(symbol, 0.0)
+                after = before + (order.qty if order.side == OrderSide.BUY else -order.qty)
+                projected[symbol] = after
+                gross += (abs(after) - abs(before)) * price
+                if self._max_rate is not None:
+                    self._recent.append(self.clock())
+            results.append(reason)
+        return results
+
+    def _check_one(
+        self,
+        order: Order,
+        positions: Mapping[str, float],
+        working: Mapping[str, float],
+        projected: dict[str, float],
+        gross: float,
+    ) -> str | None:
+        symbol = order.symbol
+        if symbol in self._restricted:
+            return "restricted_symbol"
+
+        if self._max_rate is not None:
+            now = self.clock()
+            recent = self._recent
+            while recent and now - recent[0] >= self._window:
+                recent.popleft()
+            if len(recent) >= self._max_rate:
+                return "order_rate_exceeded"
+
+        price = order.limit_price if order.limit_price is not None else self._prices.get(symbol)
+        if price is None:
+            if self._needs_price:
+                return "no_reference_price"
+            price = 0.0
+
+        if order.qty * price > self._max_notional:
+            return "order_notional_exceeded"
+
+        current = projected.get(symbol)
+        if current is None:
+            current = positions.get(symbol, 0.0) + working.get(symbol, 0.0)
+        after = current + (order.qty if order.side == OrderSide.BUY else -order.qty)
+        if abs(after) > self._position_limits.get(symbol, self._default_position) and abs(after) > abs(current):
+            return "position_limit_exceeded"
+
+        if abs(after) > abs(current):
+            if gross == math.inf and self._max_gross < math.inf:
+                return "unpriced_position"
+            if gross + (abs(after) - abs(current)) * price > self._max_gross:
+                return "gross_exposure_exceeded"
+
+        return None
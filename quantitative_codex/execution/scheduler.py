@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import uuid
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from quantitative_codex.execution.brokers.paper import PaperBrokerAdapter
+from quantitative_codex.execution.models import ExecutionReport, Order, OrderSide, OrderStatus, OrderType
+from quantitative_codex.execution.oms import OMS
+
+
+class SliceStrategy(str, Enum):
+    TWAP = "twap"
+    VWAP = "vwap"
+    POV = "pov"
+
+
+@dataclass
+class ParentOrder:
+    """Parent order worked as child orders between ``start`` and ``end``.
+
+    Times are plain floats in the scheduler's clock units (seconds, bar numbers, ...).
+    TWAP targets equal cumulative fractions per slice, VWAP follows ``volume_profile``
+    (one weight per slice), and POV sends ``participation_rate`` of the volume reported
+    through ``ParentOrderScheduler.record_volume`` since the previous slice.
+    """
+
+    symbol: str
+    qty: float
+    side: OrderSide
+    start: float
+    end: float
+    strategy: SliceStrategy = SliceStrategy.TWAP
+    n_slices: int = 10
+    volume_profile: Sequence[float] | None = None
+    participation_rate: float = 0.1
+    limit_price: float | None = None
+    parent_id: str | None = None
+
+
+@dataclass(slots=True)
+class _ParentState:
+    parent: ParentOrder
+    parent_id: str
+    schedule: np.ndarray
+    interval: float
+    next_slice: int = 0
+    sent_qty: float = 0.0
+    observed_volume: float = 0.0
+    carry_qty: float = 0.0
+    rejected_children: int = 0
+    retries: int = 0
+    active: bool = True
+    failed: bool = False
+    children: list[str] = field(default_factory=list)
+
+
+class ParentOrderScheduler:
+    """Slices parent orders into child orders and submits them through an ``OMS``.
+
+    Pending slices live in one heap keyed by due time, so each child event costs
+    O(log n) in the number of live parents. ``run_due`` pops every slice due at ``now``
+    and submits all resulting children in a single ``OMS.submit_orders`` call.
+
+    Generated parent and child ids carry a random suffix, so schedulers sharing an OMS
+    (or restarted against a recovered one) never reuse a client order id. A rejected
+    child's quantity is taken back off ``sent_qty`` and caught up by later slices (POV
+    parents carry it into the next slice). If the final slice is rejected, the parent is
+    re-queued one interval later for up to ``max_retries`` extra slices and then marked
+    ``failed``, so unsent quantity is never dropped silently.
+    """
+
+    def __init__(self, oms: OMS, max_retries: int = 3) -> None:
+        if max_retries < 0:
+            raise ValueError("max_retries must be non-negative")
+        self.oms = oms
+        self.max_retries = max_retries
+        self._parents: dict[str, _ParentState] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._by_symbol: dict[str, list[str]] = {}
+
+    def add_parent(self, parent: ParentOrder) -> str:
+        if parent.qty <= 0:
+            raise ValueError("parent qty must be positive")
+        if parent.n_slices <= 0 or parent.end < parent.start:
+            raise ValueError("parent needs n_slices > 0 and end >= start")
+        parent_id = parent.parent_id or f"parent-{uuid.uuid4().hex[:12]}"
+        if parent_id in self._parents:
+            raise ValueError(f"duplicate parent_id: {parent_id}")
+
+        if parent.strategy == SliceStrategy.VWAP:
+            if parent.volume_profile is None or len(parent.volume_profile) != parent.n_slices:
+                raise ValueError("VWAP parents need one volume_profile weight per slice")
+            weights = np.asarray(parent.volume_profile, dtype=float)
+        else:
+            weights = np.ones(parent.n_slices)
+        schedule = np.cumsum(weights) / weights.sum() * parent.qty
+        interval = (parent.end - parent.start) / parent.n_slices
+
+        self._parents[parent_id] = _ParentState(parent, parent_id, schedule, interval)
+        self._by_symbol.setdefault(parent.symbol, []).append(parent_id)
+        heapq.heappush(self._heap, (parent.start, next(self._seq), parent_id))
+        return parent_id
+
+    def schedule_target(
+        self,
+        target_positions: pd.Series,
+        start: float,
+        end: float,
+        strategy: SliceStrategy = SliceStrategy.TWAP,
+        n_slices: int = 10,
+        volume_profiles: Mapping[str, Sequence[float]] | None = None,
+        participation_rate: float = 0.1,
+    ) -> list[str]:
+        """Create one parent per symbol for the delta between target and current positions."""
+        current = self.oms.positions.reindex(target_positions.index)
+        delta = target_positions.to_numpy(dtype=float) - current
+        parent_ids = []
+        for symbol, d in zip(target_positions.index, delta):
+            if abs(d) < 1e-12:
+                continue
+            parent_ids.append(
+                self.add_parent(
+                    ParentOrder(
+                        symbol=symbol,
+                        qty=abs(float(d)),
+                        side=OrderSide.BUY if d > 0 else OrderSide.SELL,
+                        start=start,
+                        end=end,
+                        strategy=strategy,
+                        n_slices=n_slices,
+                        volume_profile=None if volume_profiles is None else volume_profiles.get(symbol),
+                        participation_rate=participation_rate,
+                    )
+                )
+            )
+        return parent_ids
+
+    def record_volume(self, volumes: Mapping[str, float] | pd.Series) -> None:
+        """Accumulate market volume for POV parents since their previous slice."""
+        for symbol, volume in volumes.items():
+            ids = self._by_symbol.get(symbol)
+            if not ids or not np.isfinite(volume):
+                continue
+            for parent_id in ids:
+                state = self._parents[parent_id]
+                if state.parent.strategy == SliceStrategy.POV:
+                    state.observed_volume += float(volume)
+
+    def next_due(self) -> float | None:
+        return self._heap[0][0] if self._heap else None
+
+    def run_due(self, now: float) -> list[ExecutionReport]:
+        heap = self._heap
+        children: list[Order] = []
+        owners: list[_ParentState] = []
+        popped: list[_ParentState] = []
+        while heap and heap[0][0] <= now:
+            _, _, parent_id = heapq.heappop(heap)
+            state = self._parents[parent_id]
+            popped.append(state)
+            child = self._next_child(state)
+            if child is not None:
+                children.append(child)
+                owners.append(state)
+
+        reports = self.oms.submit_orders(children) if children else []
+        rejected: set[str] = set()
+        for child, state, report in zip(children, owners, reports):
+            if report.status == OrderStatus.REJECTED:
+                state.sent_qty -= child.qty
+                state.rejected_children += 1
+                if state.parent.strategy == SliceStrategy.POV:
+                    state.carry_qty += child.qty
+                rejected.add(state.parent_id)
+
+        # retirement is decided only once the reports show what was actually sent
+        for state in popped:
+            if state.sent_qty >= state.parent.qty - 1e-12:
+                self._retire(state)
+            elif state.next_slice < len(state.schedule):
+                due = state.parent.start + state.next_slice * state.interval
+                heapq.heappush(heap, (due, next(self._seq), state.parent_id))
+            elif state.parent_id not in rejected:
+                self._retire(state)  # POV parent limited by volume: done at end of schedule
+            elif state.retries < self.max_retries:
+                state.retries += 1
+                heapq.heappush(heap, (now + state.interval, next(self._seq), state.parent_id))
+            else:
+                state.failed = True
+                self._retire(state)
+        return reports
+
+    def _next_child(self, state: _ParentState) -> Order | None:
+        parent = state.parent
+        k = state.next_slice
+        state.next_slice += 1
+        remaining = parent.qty - state.sent_qty
+        if parent.strategy == SliceStrategy.POV:
+            qty = min(parent.participation_rate * state.observed_volume + state.carry_qty, remaining)
+            state.observed_volume = 0.0
+            state.carry_qty = 0.0
+        else:
+            target = float(state.schedule[k]) if k < len(state.schedule) else parent.qty  # retry slice
+            qty = min(target - state.sent_qty, remaining)
+        if qty <= 1e-12:
+            return None
+        state.sent_qty += qty
+        child_id = f"{state.parent_id}-{k:04d}-{uuid.uuid4().hex[:12]}"
+        state.children.append(child_id)
+        return Order(
+            symbol=parent.symbol,
+            qty=qty,
+            side=parent.side,
+            order_type=OrderType.MARKET if parent.limit_price is None else OrderType.LIMIT,
+            limit_price=parent.limit_price,
+            client_order_id=child_id,
+        )
+
+    def _retire(self, state: _ParentState) -> None:
+        state.active = False
+        ids = self._by_symbol.get(state.parent.symbol)
+        if ids is not None:
+            ids.remove(state.parent_id)
+            if not ids:
+                del self._by_symbol[state.parent.symbol]
+
+    def progress(self) -> pd.DataFrame:
+        """Per-parent quantity sent to the broker and filled so far."""
+        rows = []
+        for parent_id, state in self._parents.items():
+            parent = state.parent
+            filled = sum(self.oms.filled_qty(child_id) for child_id in state.children)
+            rows.append(
+                {
+                    "parent_id": parent_id,
+                    "symbol": parent.symbol,
+                    "side": parent.side.value,
+                    "strategy": parent.strategy.value,
+                    "qty": parent.qty,
+                    "sent_qty": state.sent_qty,
+                    "filled_qty": filled,
+                    "rejected_children": state.rejected_children,
+                    "children": len(state.children),
+                    "active": state.active,
+                    "failed": state.failed,
+                }
+            )
+        return pd.DataFrame(rows).set_index("parent_id") if rows else pd.DataFrame()
+
+
+def simulate_schedule(
+    scheduler: ParentOrderScheduler,
+    broker: PaperBrokerAdapter,
+    prices: pd.DataFrame,
+    volumes: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """Drive ``scheduler`` bar by bar against a paper broker in simulated time.
+
+    ``prices`` (and ``volumes``) are indexed by the scheduler's float clock with one column
+    per symbol. Each bar submits the slices due at its time, fills them against the bar,
+    syncs the OMS and then reports the bar's volume to POV parents.
+    """
+    for now, bar in prices.iterrows():
+        bar_volume = None if volumes is None else volumes.loc[now]
+        scheduler.run_due(float(now))
+        broker.process_bars(bar, bar_volume)
+        scheduler.oms.sync()
+        if bar_volume is not None:
+            scheduler.record_volume(bar_volume)
+    return scheduler.progress()
@@ -3,6 +3,8 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 
+from quantitative_codex.profiling import profiled
+
 
 def rsi(series: pd.Series, n: int = 14) -> pd.Series:
     delta = series.diff()
@@ -14,6 +16,7 @@ def rsi(series: pd.Series, n: int = 14) -> pd.Series:
     return 100 - (100 / (1 + rs))
 
 
+@profiled
 def compute_factor_library(df: pd.DataFrame) -> pd.DataFrame:
     """Compute a compact MVP factor set from daily OHLCV."""
     price = df["adj_close"] if "adj_close" in df.columns else df["close"]
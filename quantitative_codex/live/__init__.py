@@ -1,3 +1,32 @@
+from quantitative_codex.live.daemon import (
+    BarContext,
+    DaemonConfig,
+    LatencyHistogram,
+    LiveTradingDaemon,
+    SimulatedClock,
+    WallClock,
+    iter_frame_bars,
+)
+from quantitative_codex.live.multi_account import (
+    MultiAccountRebalance,
+    MultiAccountRunner,
+    compute_target_shares_matrix,
+    enforce_turnover_budget_matrix,
+)
 from quantitative_codex.live.small_capital import LiveTradingConfig, SmallCapitalLiveRunner
 
-__all__ = ["LiveTradingConfig", "SmallCapitalLiveRunner"]
+__all__ = [
+    "BarContext",
+    "DaemonConfig",
+    "LatencyHistogram",
+    "LiveTradingConfig",
+    "LiveTradingDaemon",
+    "MultiAccountRebalance",
+    "MultiAccountRunner",
+    "SimulatedClock",
+    "SmallCapitalLiveRunner",
+    "WallClock",
+    "compute_target_shares_matrix",
+    "enforce_turnover_budget_matrix",
+    "iter_frame_bars",
+]
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from quantitative_codex.execution.brokers.paper import PaperBrokerAdapter
+from quantitative_codex.execution.models import OrderSide
+from quantitative_codex.live.small_capital import SmallCapitalLiveRunner
+from quantitative_codex.monitoring.alerts import Alert, AlertRuleSet, evaluate_alerts
+from quantitative_codex.portfolio.optimization import optimize_weights
+from quantitative_codex.profiling import LatencyHistogram
+from quantitative_codex.reconciliation.engine import reconcile_positions
+from quantitative_codex.risk.controls import apply_risk_controls
+from quantitative_codex.risk.covariance import EWMACovariance
+from quantitative_codex.risk.guards import DrawdownGuard
+
+
+class SimulatedClock:
+    """Clock that jumps straight to each bar time, for fast historical replays."""
+
+    def __init__(self, start: pd.Timestamp | None = None) -> None:
+        self._now = start
+
+    def now(self) -> pd.Timestamp | None:
+        return self._now
+
+    async def sleep_until(self, ts: pd.Timestamp) -> None:
+        self._now = ts
+        await asyncio.sleep(0)
+
+
+class WallClock:
+    """Clock that waits in real time until each bar is due (naive UTC timestamps)."""
+
+    def now(self) -> pd.Timestamp:
+        return pd.Timestamp.now(tz="UTC").tz_localize(None)
+
+    async def sleep_until(self, ts: pd.Timestamp) -> None:
+        delay = (ts - self.now()).total_seconds()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+@dataclass
+class DaemonConfig:
+    momentum_lookback: int = 60
+    vol_halflife: float = 20.0
+    adv_window: int = 20
+    min_history: int = 20
+    rebalance_every: int = 1
+    max_weight: float = 0.2
+    risk_max_weight: float = 0.1
+    alert_rules: AlertRuleSet = field(default_factory=AlertRuleSet)
+
+
+@dataclass
+class BarContext:
+    timestamp: pd.Timestamp
+    close: pd.Series
+    volume: pd.Series | None = None
+    expected_returns: pd.Series | None = None
+    risk: pd.Series | None = None
+    adv_usd: pd.Series | None = None
+    base_weights: pd.Series | None = None
+    target_weights: pd.Series | None = None
+    n_orders: int = 0
+    equity: float = float("nan")
+    breaks: pd.DataFrame | None = None
+    alerts: list[Alert] = field(default_factory=list)
+
+
+Stage = Callable[[BarContext], "Awaitable[None] | None"]
+
+
+async def iter_frame_bars(close: pd.DataFrame, volume: pd.DataFrame | None = None) -> AsyncIterator[tuple]:
+    """Yield ``(timestamp, close_row, volume_row)`` from wide close/volume frames."""
+    for ts, row in close.iterrows():
+        yield ts, row, None if volume is None else volume.loc[ts]
+
+
+class LiveTradingDaemon:
+    """Asyncio daemon running the daily pipeline once per arriving bar.
+
+    Default stages: ingest (feed the bar to a paper broker), factors (trailing momentum,
+    EWMA volatility, dollar ADV), optimize, risk, submit (``SmallCapitalLiveRunner``),
+    sync (OMS sync and mark-to-market), reconcile (OMS vs broker fills) and alert. Each
+    stage records a latency histogram and the clock time it last started. ``stages``
+    (or appending to it later) swaps in any ``(name, callable)`` pairs; callables may be async.
+
+    Bars come from any async iterable, so the same daemon runs on a schedule (bars carry
+    their due time and the clock waits for it) or on data arrival (e.g. a queue consumer).
+    With ``SimulatedClock`` the waits are skipped and a month replays in seconds.
+    """
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        runner: SmallCapitalLiveRunner,
+        config: DaemonConfig | None = None,
+        clock: SimulatedClock | WallClock | None = None,
+        stages: Sequence[tuple[str, Stage]] | None = None,
+    ) -> None:
+        self.symbols = pd.Index(symbols)
+        self.runner = runner
+        self.oms = runner.oms
+        self.config = config or DaemonConfig()
+        self.clock = clock or SimulatedClock()
+        self.stages: list[tuple[str, Stage]] = list(stages) if stages is not None else self.default_stages()
+        self.latency = {name: LatencyHistogram() for name, _ in self.stages}
+        self.stage_started: dict[str, pd.Timestamp | None] = {}
+        self.n_bars = 0
+
+        n = len(self.symbols)
+        cfg = self.config
+        self._closes = np.full((cfg.momentum_lookback, n), np.nan)
+        self._dollar_volume = np.full((cfg.adv_window, n), np.nan)
+        self._cov = EWMACovariance(self.symbols, halflife=cfg.vol_halflife)
+        self._guard = DrawdownGuard(max_drawdown=cfg.alert_rules.max_drawdown)
+        self._last_equity: float | None = None
+        self._fill_cursor = 0
+        self._broker_positions: dict[str, float] = {}
+        self._history: list[dict[str, object]] = []
+
+    def default_stages(self) -> list[tuple[str, Stage]]:
+        return [
+            ("ingest", self._ingest),
+            ("factors", self._factors),
+            ("optimize", self._optimize),
+            ("risk", self._risk),
+            ("submit", self._submit),
+            ("sync", self._sync),
+            ("reconcile", self._reconcile),
+            ("alert", self._alert),
+        ]
+
+    async def run(self, bars: AsyncIterable[tuple]) -> pd.DataFrame:
+        async for ts, close, volume in bars:
+            await self.clock.sleep_until(ts)
+            await self.run_bar(ts, close, volume)
+        return self.history()
+
+    async def run_bar(self, ts: pd.Timestamp, close: pd.Series, volume: pd.Series | None = None) -> BarContext:
+        ctx = BarContext(
+            timestamp=ts,
+            close=close.reindex(self.symbols).astype(float),
+            volume=None if volume is None else volume.reindex(self.symbols).astype(float),
+        )
+        for name, stage in self.stages:
+            self.stage_started[name] = self.clock.now()
+            start = time.perf_counter()
+            result = stage(ctx)
+            if inspect.isawaitable(result):
+                await result
+            hist = self.latency.get(name)
+            if hist is None:
+                hist = self.latency[name] = LatencyHistogram()
+            hist.record(time.perf_counter() - start)
+        self.n_bars += 1
+        self._history.append(
+            {
+                "timestamp": ts,
+                "equity": ctx.equity,
+                "n_orders": ctx.n_orders,
+                "n_breaks": 0 if ctx.breaks is None else int(ctx.breaks["is_break"].sum()),
+                "alerts": ",".join(a.code for a in ctx.alerts),
+            }
+        )
+        return ctx
+
+    def history(self) -> pd.DataFrame:
+        return pd.DataFrame(self._history).set_index("timestamp") if self._history else pd.DataFrame()
+
+    def latency_summary(self) -> pd.DataFrame:
+        return pd.DataFrame({name: hist.summary() for name, hist in self.latency.items()}).T
+
+    def _ingest(self, ctx: BarContext) -> None:
+        broker = self.oms.broker
+        if isinstance(broker, PaperBrokerAdapter):
+            broker.process_bars(ctx.close, ctx.volume, ctx.timestamp.to_pydatetime())
+
+    def _factors(self, ctx: BarContext) -> None:
+        px = ctx.close.to_numpy()
+        slot = self.n_bars % len(self._closes)
+        prev = self._closes[(self.n_bars - 1) % len(self._closes)].copy()
+        lagged = self._closes[slot].copy()  # close from ``momentum_lookback`` bars ago
+        self._closes[slot] = px
+
+        if self.n_bars > 0:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self._cov.update(px / prev - 1.0)
+        if self.n_bars >= self.config.momentum_lookback:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ctx.expected_returns = pd.Series(px / lagged - 1.0, index=self.symbols)
+        ctx.risk = self._cov.volatility().replace(0.0, np.nan)
+
+        if ctx.volume is not None:
+            self._dollar_volume[self.n_bars % len(self._dollar_volume)] = px * ctx.volume.to_numpy()
+            with np.errstate(invalid="ignore"):
+                ctx.adv_usd = pd.Series(np.nanmean(self._dollar_volume, axis=0), index=self.symbols)
+
+    def _optimize(self, ctx: BarContext) -> None:
+        cfg = self.config
+        if ctx.expected_returns is None or self.n_bars < cfg.min_history or self.n_bars % cfg.rebalance_every:
+            return
+        mu = ctx.expected_returns.dropna()
+        if mu.empty:
+            return
+        ctx.base_weights = optimize_weights(mu, risk=ctx.risk.reindex(mu.index), long_only=True, max_weight=cfg.max_weight)
+
+    def _risk(self, ctx: BarContext) -> None:
+        if ctx.base_weights is None:
+            return
+        adv = None if ctx.adv_usd is None else ctx.adv_usd.reindex(ctx.base_weights.index)
+        ctx.target_weights = apply_risk_controls(ctx.base_weights, adv_usd=adv, max_weight=self.config.risk_max_weight)
+
+    def _submit(self, ctx: BarContext) -> None:
+        if ctx.target_weights is None:
+            return
+        before = self.oms.order_log.event_counts.get("submit", 0)
+        self.runner.rebalance(ctx.target_weights.reindex(self.symbols, fill_value=0.0), ctx.close, equity=self._equity())
+        ctx.n_orders = self.oms.order_log.event_counts.get("submit", 0) - before
+
+    def _equity(self) -> float:
+        return self.runner.config.starting_equity if self._last_equity is None else self._last_equity
+
+    def _sync(self, ctx: BarContext) -> None:
+        self.oms.sync()
+        pnl = self.oms.positions.mark_to_market(ctx.close.dropna(), timestamp=ctx.timestamp)
+        ctx.equity = self.runner.config.starting_equity + pnl
+
+    def _reconcile(self, ctx: BarContext) -> None:
+        broker = self.oms.broker
+        if not isinstance(broker, PaperBrokerAdapter):
+            return
+        fills, self._fill_cursor = broker.fills_since(self._fill_cursor)
+        for fill in fills:
+            signed = fill.qty if fill.side == OrderSide.BUY else -fill.qty
+            self._broker_positions[fill.symbol] = self._broker_positions.get(fill.symbol, 0.0) + signed
+        ctx.breaks = reconcile_positions(self.oms.positions.snapshot(), pd.Series(self._broker_positions, dtype=float))
+
+    def _alert(self, ctx: BarContext) -> None:
+        equity = ctx.equity
+        ret = pd.Series(dtype=float) if self._last_equity is None else pd.Series([equity / self._last_equity - 1.0])
+        positions = self.oms.positions.snapshot()
+        notional = positions * ctx.close.reindex(positions.index)
+        ctx.alerts = evaluate_alerts(
+            pd.Series([equity]),
+            ret,
+            self.oms.order_log,
+            notional.dropna(),
+            self.config.alert_rules,
+            drawdown_guard=self._guard,
+        )
+        self._last_equity = equity
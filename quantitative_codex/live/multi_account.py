@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from quantitative_codex.execution.brokers.base import BrokerAdapter
+from quantitative_codex.execution.brokers.paper import PaperBrokerAdapter
+from quantitative_codex.execution.models import Order, OrderSide, OrderType
+from quantitative_codex.execution.oms import OMS
+from quantitative_codex.live.small_capital import LiveTradingConfig
+
+
+def compute_target_shares_matrix(
+    target_weights: np.ndarray,
+    prices: np.ndarray,
+    equity: np.ndarray,
+    config: LiveTradingConfig,
+) -> np.ndarray:
+    """``SmallCapitalLiveRunner.compute_target_shares`` for an (accounts x symbols) matrix."""
+    w = np.nan_to_num(np.asarray(target_weights, dtype=float))
+    px = np.asarray(prices, dtype=float)
+    cap = config.max_notional_per_order
+    capped_notional = np.clip(w * np.asarray(equity, dtype=float)[:, None], -cap, cap)
+
+    valid = np.isfinite(px) & (px != 0)
+    shares = np.zeros_like(capped_notional)
+    np.divide(capped_notional, px, out=shares, where=valid[None, :])
+    notional = np.abs(shares) * np.where(valid, px, 0.0)
+    return np.where(notional >= config.min_order_notional, shares, 0.0)
+
+
+def enforce_turnover_budget_matrix(
+    current_shares: np.ndarray,
+    target_shares: np.ndarray,
+    prices: np.ndarray,
+    equity: np.ndarray,
+    max_daily_turnover_ratio: float,
+) -> np.ndarray:
+    """Per-account turnover budget: scale each row's trades down to ``equity * ratio``."""
+    px = np.nan_to_num(np.asarray(prices, dtype=float))
+    delta = target_shares - current_shares
+    gross = np.abs(delta) @ px
+    budget = np.asarray(equity, dtype=float) * max_daily_turnover_ratio
+    over = (gross > budget) & (gross > 0)
+    scale = np.ones_like(gross)
+    scale[over] = budget[over] / gross[over]
+    return current_shares + delta * scale[:, None]
+
+
+class _Shard:
+    """Accounts owned by one worker, each with its own broker and OMS."""
+
+    def __init__(self, account_ids: Sequence[str], broker_factory: Callable[[], BrokerAdapter]) -> None:
+        self.account_ids = list(account_ids)
+        self.oms = [OMS(broker_factory()) for _ in self.account_ids]
+
+    def positions(self, symbols: list[str]) -> np.ndarray:
+        if not self.oms:
+            return np.zeros((0, len(symbols)))
+        return np.vstack([oms.positions.reindex(symbols) for oms in self.oms])
+
+    def submit(self, targets: np.ndarray, symbols: list[str]) -> int:
+        n_orders = 0
+        for oms, target in zip(self.oms, targets):
+            delta = target - oms.positions.reindex(symbols)
+            idx = np.flatnonzero(np.abs(delta) >= 1e-12)
+            if not len(idx):
+                continue
+            orders = [
+                Order(
+                    symbol=symbols[i],
+                    qty=abs(float(delta[i])),
+                    side=OrderSide.BUY if delta[i] > 0 else OrderSide.SELL,
+                    order_type=OrderType.MARKET,
+                )
+                for i in idx
+            ]
+            oms.submit_orders(orders)
+            n_orders += len(orders)
+        return n_orders
+
+    def process_bars(self, prices: pd.Series, volumes: pd.Series | None) -> int:
+        n_updates = 0
+        for oms in self.oms:
+            broker = oms.broker
+            if isinstance(broker, PaperBrokerAdapter):
+                broker.process_bars(prices, volumes)
+            n_updates += len(oms.sync())
+        return n_updates
+
+
+def _shard_worker(conn, account_ids: list[str], broker_factory: Callable[[], BrokerAdapter]) -> None:
+    shard = _Shard(account_ids, broker_factory)
+    while True:
+        op, args = conn.recv()
+        if op == "stop":
+            conn.close()
+            return
+        try:
+            conn.send(("ok", getattr(shard, op)(*args)))
+        except Exception as exc:  # surfaced in the parent
+            conn.send(("error", f"{type(exc).__name__}: {exc}"))
+
+
+@dataclass
+class MultiAccountRebalance:
+    target_shares: pd.DataFrame
+    netting: pd.DataFrame
+    n_orders: int
+
+
+class MultiAccountRunner:
+    """Rebalances many small accounts at once with (accounts x symbols) matrices.
+
+    Target shares and turnover budgets follow ``SmallCapitalLiveRunner`` but are computed
+    for all accounts in a few array operations. Accounts are split into ``n_workers``
+    contiguous shards; each shard runs in its own process and owns its accounts' brokers
+    and OMS instances. ``n_workers=0`` keeps a single shard in-process.
+
+    Every rebalance also reports per-symbol order flow (buys, sells, net and the quantity
+    that could be crossed internally) for netting.
+    """
+
+    def __init__(
+        self,
+        account_ids: Sequence[str],
+        config: LiveTradingConfig | None = None,
+        n_workers: int = 0,
+        broker_factory: Callable[[], BrokerAdapter] = PaperBrokerAdapter,
+    ) -> None:
+        self.account_ids = list(account_ids)
+        if len(set(self.account_ids)) != len(self.account_ids):
+            raise ValueError("account_ids must be unique")
+        self.config = config or LiveTradingConfig()
+        self.n_workers = n_workers
+        shards = np.array_split(np.arange(len(self.account_ids)), max(n_workers, 1))
+        self._shard_accounts = [[self.account_ids[i] for i in idx] for idx in shards if len(idx)]
+        self._local: _Shard | None = None
+        self._workers: list[tuple[mp.process.BaseProcess, object]] = []
+        if n_workers <= 0:
+            self._local = _Shard(self.account_ids, broker_factory)
+        else:
+            ctx = mp.get_context()
+            for accounts in self._shard_accounts:
+                parent_conn, child_conn = ctx.Pipe()
+                proc = ctx.Process(target=_shard_worker, args=(child_conn, accounts, broker_factory), daemon=True)
+                proc.start()
+                child_conn.close()
+                self._workers.append((proc, parent_conn))
+
+    def _call(self, op: str, args_per_shard: list[tuple]) -> list[object]:
+        if self._local is not None:
+            return [getattr(self._local, op)(*args_per_shard[0])]
+        for (_, conn), args in zip(self._workers, args_per_shard):
+            conn.send((op, args))
+        # drain every reply before raising, or a later call would read this one's leftovers
+        replies = [conn.recv() for _, conn in self._workers]
+        errors = [f"shard {i}: {value}" for i, (status, value) in enumerate(replies) if status == "error"]
+        if errors:
+            raise RuntimeError(f"account shard failed in {op}: {'; '.join(errors)}")
+        return [value for _, value in replies]
+
+    def _broadcast(self, op: str, *args: object) -> list[object]:
+        n = 1 if self._local is not None else len(self._workers)
+        return self._call(op, [args] * n)
+
+    def positions(self, symbols: Sequence[str]) -> pd.DataFrame:
+        symbols = list(symbols)
+        blocks = self._broadcast("positions", symbols)
+        return pd.DataFrame(np.vstack(blocks), index=self.account_ids, columns=symbols)
+
+    def rebalance(
+        self,
+        target_weights: pd.DataFrame,
+        prices: pd.Series,
+        equity: pd.Series | None = None,
+    ) -> MultiAccountRebalance:
+        """Rebalance every account; ``target_weights`` is indexed by account, columns are symbols."""
+        symbols = list(prices.index)
+        weights = target_weights.reindex(index=self.account_ids, columns=symbols).to_numpy(dtype=float)
+        px = prices.to_numpy(dtype=float)
+        if equity is None:
+            eq = np.full(len(self.account_ids), self.config.starting_equity)
+        else:
+            eq = equity.reindex(self.account_ids).fillna(self.config.starting_equity).to_numpy(dtype=float)
+
+        current = self.positions(symbols).to_numpy()
+        target = compute_target_shares_matrix(weights, px, eq, self.config)
+        budgeted = enforce_turnover_budget_matrix(current, target, px, eq, self.config.max_daily_turnover_ratio)
+
+        delta = budgeted - current
+        buys = np.where(delta > 0, delta, 0.0).sum(axis=0)
+        sells = np.where(delta < 0, -delta, 0.0).sum(axis=0)
+        netting = pd.DataFrame(
+            {"buy_qty": buys, "sell_qty": sells, "net_qty": buys - sells, "crossable_qty": np.minimum(buys, sells)},
+            index=symbols,
+        )
+
+        offsets = np.cumsum([0] + [len(a) for a in self._shard_accounts])
+        if self._local is not None:
+            args = [(budgeted, symbols)]
+        else:
+            args = [(budgeted[lo:hi], symbols) for lo, hi in zip(offsets[:-1], offsets[1:])]
+        n_orders = int(sum(self._call("submit", args)))
+        return MultiAccountRebalance(
+            target_shares=pd.DataFrame(budgeted, index=self.account_ids, columns=symbols),
+            netting=netting,
+            n_orders=n_orders,
+        )
+
+    def process_bars(self, prices: pd.Series, volumes: pd.Series | None = None) -> int:
+        """Feed one bar to every paper broker and sync every OMS; returns report count."""
+        return int(sum(self._broadcast("process_bars", prices, volumes)))
+
+    def close(self) -> None:
+        for proc, conn in self._workers:
+            conn.send(("stop", ()))
+            proc.join()
+            conn.close()
+        self._workers = []
+
+    def __enter__(self) -> MultiAccountRunner:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
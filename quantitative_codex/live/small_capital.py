@@ -58,7 +58,7 @@ class SmallCapitalLiveRunner:
     def rebalance(self, target_weights: pd.Series, prices: pd.Series, equity: float | None = None) -> pd.Series:
         eq = self.config.starting_equity if equity is None else equity
         target_shares = self.compute_target_shares(target_weights, prices, equity=eq)
-        current = self.oms.positions.snapshot().reindex(target_shares.index).fillna(0.0)
+        current = pd.Series(self.oms.positions.reindex(target_shares.index), index=target_shares.index)
         budgeted = self.enforce_turnover_budget(current, target_shares, prices, eq)
 
         orders = self.oms.generate_orders_from_target(budgeted)
@@ -12,6 +12,7 @@ import pandas as pd
 from quantitative_codex.backtest.vectorized import BacktestResult, VectorizedBacktester
 from quantitative_codex.data.providers import load_eod_csv
 from quantitative_codex.factors.library import compute_factor_library, rsi
+from quantitative_codex.profiling import profiler
 
 
 @dataclass
@@ -113,11 +114,21 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument("--cost-bps", type=float, default=2.0, help="One-way cost in bps")
     parser.add_argument("--output", default="", help="Optional output csv path for detailed series")
+    parser.add_argument("--profile", action="store_true", help="Print a per-stage timing breakdown")
+    parser.add_argument("--profile-memory", action="store_true", help="Also trace peak memory per stage (implies --profile)")
+    parser.add_argument(
+        "--metrics-out",
+        default="",
+        help="Write stage metrics to this path (.json for JSON, otherwise Prometheus text format)",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
+    profile = args.profile or args.profile_memory or bool(args.metrics_out)
+    if profile:
+        profiler.enable(trace_memory=args.profile_memory)
     out = run_single_stock_backtest(
         csv_path=args.csv or None,
         symbol=(args.symbol or "UNKNOWN"),
@@ -132,6 +143,17 @@ def main() -> None:
         out.frame.to_csv(args.output, index=True)
         print(f"saved_detail={args.output}")
 
+    if profile:
+        profiler.disable()
+        if args.profile or args.profile_memory:
+            print(profiler.summary().to_string(float_format=lambda v: f"{v:.6f}"))
+        if args.metrics_out:
+            if args.metrics_out.endswith(".json"):
+                profiler.to_json(args.metrics_out)
+            else:
+                profiler.to_prometheus(args.metrics_out)
+            print(f"saved_metrics={args.metrics_out}")
+
 
 if __name__ == "__main__":
     main()
@@ -1,3 +1,33 @@
 from quantitative_codex.monitoring.alerts import Alert, AlertRuleSet, evaluate_alerts
+from quantitative_codex.monitoring.streaming import (
+    DailyLossRule,
+    DrawdownRule,
+    EquityTick,
+    FiredAlert,
+    OrderStatusUpdate,
+    PnLUpdate,
+    PositionLimitRule,
+    PositionUpdate,
+    RejectRatioRule,
+    StreamingAlertEngine,
+    StreamingRule,
+    default_streaming_rules,
+)
 
-__all__ = ["Alert", "AlertRuleSet", "evaluate_alerts"]
+__all__ = [
+    "Alert",
+    "AlertRuleSet",
+    "DailyLossRule",
+    "DrawdownRule",
+    "EquityTick",
+    "FiredAlert",
+    "OrderStatusUpdate",
+    "PnLUpdate",
+    "PositionLimitRule",
+    "PositionUpdate",
+    "RejectRatioRule",
+    "StreamingAlertEngine",
+    "StreamingRule",
+    "default_streaming_rules",
+    "evaluate_alerts",
+]
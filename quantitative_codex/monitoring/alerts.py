@@ -4,6 +4,9 @@ from dataclasses import dataclass
 
 import pandas as pd
 
+from quantitative_codex.execution.order_log import OrderEventLog
+from quantitative_codex.risk.guards import DrawdownGuard
+
 
 @dataclass
 class Alert:
@@ -23,15 +26,24 @@ class AlertRuleSet:
 def evaluate_alerts(
     equity_curve: pd.Series,
     pnl_series: pd.Series,
-    order_log: pd.DataFrame,
+    order_log: pd.DataFrame | OrderEventLog,
     positions_notional: pd.Series,
     rules: AlertRuleSet | None = None,
+    drawdown_guard: DrawdownGuard | None = None,
 ) -> list[Alert]:
+    """Evaluate alert rules.
+
+    With ``drawdown_guard``, ``equity_curve`` only needs the ticks since the previous call;
+    the guard carries the running peak and worst drawdown between calls. An
+    ``OrderEventLog`` is read through its running status counters, without building a frame.
+    """
     cfg = rules or AlertRuleSet()
     alerts: list[Alert] = []
 
-    if not equity_curve.empty:
-        dd = float((equity_curve / equity_curve.cummax() - 1.0).min())
+    guard = drawdown_guard or DrawdownGuard(max_drawdown=cfg.max_drawdown)
+    guard.update_many(equity_curve.to_numpy(dtype=float))
+    if guard.n_updates:
+        dd = guard.worst_drawdown
         if dd < -abs(cfg.max_drawdown):
             alerts.append(Alert("critical", "MAX_DRAWDOWN", f"drawdown breached: {dd:.2%}"))
 
@@ -40,11 +52,15 @@ def evaluate_alerts(
         if daily_loss < -abs(cfg.max_daily_loss):
             alerts.append(Alert("warning", "DAILY_LOSS", f"daily pnl breached: {daily_loss:.2%}"))
 
-    if not order_log.empty and "status" in order_log.columns:
+    ratio = None
+    if isinstance(order_log, OrderEventLog):
+        if order_log.total_events:
+            ratio = order_log.status_ratio("rejected")
+    elif not order_log.empty and "status" in order_log.columns:
         rejected = (order_log["status"] == "rejected").sum()
         ratio = float(rejected / len(order_log))
-        if ratio > cfg.max_reject_ratio:
-            alerts.append(Alert("warning", "REJECT_RATIO", f"reject ratio too high: {ratio:.2%}"))
+    if ratio is not None and ratio > cfg.max_reject_ratio:
+        alerts.append(Alert("warning", "REJECT_RATIO", f"reject ratio too high: {ratio:.2%}"))
 
     if not positions_notional.empty:
         max_abs = float(positions_notional.abs().max())
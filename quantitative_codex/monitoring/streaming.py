@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Hashable, Iterable, Sequence
+
+from quantitative_codex.monitoring.alerts import Alert, AlertRuleSet
+from quantitative_codex.risk.guards import DrawdownGuard
+
+
+@dataclass(frozen=True, slots=True)
+class EquityTick:
+    ts: float
+    equity: float
+
+
+@dataclass(frozen=True, slots=True)
+class PnLUpdate:
+    ts: float
+    pnl: float  # period return, as in the ``pnl_series`` passed to ``evaluate_alerts``
+
+
+@dataclass(frozen=True, slots=True)
+class OrderStatusUpdate:
+    ts: float
+    order_id: str
+    status: str
+
+
+@dataclass(frozen=True, slots=True)
+class PositionUpdate:
+    ts: float
+    symbol: str
+    notional: float
+
+
+@dataclass(frozen=True, slots=True)
+class FiredAlert:
+    ts: float
+    key: Hashable
+    alert: Alert
+
+
+AlertListener = Callable[[FiredAlert], None]
+
+
+class StreamingRule:
+    """Base class for streaming rules.
+
+    ``events`` lists the event types the rule subscribes to. ``check`` updates the rule's
+    rolling state with one event and returns an ``Alert`` while the condition is breached,
+    ``None`` otherwise; ``key`` names the condition instance (e.g. the symbol) so the engine
+    can deduplicate per key.
+    """
+
+    code: str = ""
+    events: tuple[type, ...] = ()
+
+    def check(self, event: object) -> Alert | None:
+        raise NotImplementedError
+
+    def key(self, event: object) -> Hashable:
+        return None
+
+
+class DrawdownRule(StreamingRule):
+    """Running drawdown from the equity peak, tracked by a ``DrawdownGuard``."""
+
+    code = "MAX_DRAWDOWN"
+    events = (EquityTick,)
+
+    def __init__(self, max_drawdown: float, guard: DrawdownGuard | None = None) -> None:
+        self.max_drawdown = abs(max_drawdown)
+        self.guard = guard or DrawdownGuard(max_drawdown=max_drawdown)
+
+    def check(self, event: EquityTick) -> Alert | None:
+        guard = self.guard
+        guard.update(event.equity)
+        if guard.drawdown < -self.max_drawdown:
+            return Alert("critical", self.code, f"drawdown breached: {guard.drawdown:.2%}")
+        return None
+
+
+class DailyLossRule(StreamingRule):
+    code = "DAILY_LOSS"
+    events = (PnLUpdate,)
+
+    def __init__(self, max_daily_loss: float) -> None:
+        self.max_daily_loss = abs(max_daily_loss)
+
+    def check(self, event: PnLUpdate) -> Alert | None:
+        if event.pnl < -self.max_daily_loss:
+            return Alert("warning", self.code, f"daily pnl breached: {event.pnl:.2%}")
+        return None
+
+
+class RejectRatioRule(StreamingRule):
+    """Share of rejections among the last ``window`` orders to reach a terminal status.
+
+    Outcomes sit in a fixed ring with a running reject count, so each update is O(1).
+    Non-terminal statuses leave the ring alone. The ratio is only judged once
+    ``min_orders`` outcomes have been seen.
+    """
+
+    code = "REJECT_RATIO"
+    events = (OrderStatusUpdate,)
+    terminal = frozenset({"filled", "canceled", "rejected"})
+
+    def __init__(self, max_reject_ratio: float, window: int = 100, min_orders: int = 1) -> None:
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.max_reject_ratio = max_reject_ratio
+        self.window = window
+        self.min_orders = min_orders
+        self._ring = [0] * window
+        self._pos = 0
+        self.n_orders = 0
+        self.n_rejected = 0
+
+    @property
+    def ratio(self) -> float:
+        n = min(self.n_orders, self.window)
+        return self.n_rejected / n if n else 0.0
+
+    def check(self, event: OrderStatusUpdate) -> Alert | None:
+        status = event.status
+        if status in self.terminal:
+            rejected = 1 if status == "rejected" else 0
+            pos = self._pos
+            self.n_rejected += rejected - self._ring[pos]
+            self._ring[pos] = rejected
+            self._pos = (pos + 1) % self.window
+            self.n_orders += 1
+        if self.n_orders >= self.min_orders:
+            ratio = self.ratio
+            if ratio > self.max_reject_ratio:
+                return Alert("warning", self.code, f"reject ratio too high: {ratio:.2%}")
+        return None
+
+
+class PositionLimitRule(StreamingRule):
+    """Per-symbol absolute notional limit; also tracks the largest notional seen."""
+
+    code = "POSITION_LIMIT"
+    events = (PositionUpdate,)
+
+    def __init__(self, max_position_abs: float) -> None:
+        self.max_position_abs = max_position_abs
+        self.max_seen = 0.0
+
+    def check(self, event: PositionUpdate) -> Alert | None:
+        notional = abs(event.notional)
+        if notional > self.max_seen:
+            self.max_seen = notional
+        if notional > self.max_position_abs:
+            return Alert("critical", self.code, f"position abs notional breached: {event.symbol} {notional:,.2f}")
+        return None
+
+    def key(self, event: PositionUpdate) -> Hashable:
+        return event.symbol
+
+
+def default_streaming_rules(rules: AlertRuleSet | None = None, reject_window: int = 100) -> list[StreamingRule]:
+    """Streaming counterparts of the ``evaluate_alerts`` checks for one ``AlertRuleSet``."""
+    cfg = rules or AlertRuleSet()
+    return [
+        DrawdownRule(cfg.max_drawdown),
+        DailyLossRule(cfg.max_daily_loss),
+        RejectRatioRule(cfg.max_reject_ratio, window=reject_window),
+        PositionLimitRule(cfg.max_position_abs),
+    ]
+
+
+class StreamingAlertEngine:
+    """Event-driven counterpart of ``evaluate_alerts``.
+
+    Events are routed by type to the rules subscribed to it, and each rule keeps its own
+    O(1) rolling state, so nothing is rescanned. An alert fires when its ``(code, key)``
+    condition becomes breached and stays quiet while the breach persists (deduplication);
+    once the condition clears it re-arms, but does not fire again until ``cooldown`` clock
+    units after the previous alert for that key. Timestamps are plain floats in the
+    caller's clock (seconds, bar numbers, ...).
+    """
+
+    def __init__(self, rules: Sequence[StreamingRule] | None = None, cooldown: float = 0.0) -> None:
+        self.cooldown = cooldown
+        self.rules: list[StreamingRule] = []
+        self._routes: dict[type, list[StreamingRule]] = {}
+        self._active: dict[tuple[str, Hashable], Alert] = {}
+        self._last_fired: dict[tuple[str, Hashable], float] = {}
+        self._listeners: list[AlertListener] = []
+        self.history: list[FiredAlert] = []
+        self.n_events = 0
+        self.n_suppressed = 0
+        for rule in default_streaming_rules() if rules is None else rules:
+            self.add_rule(rule)
+
+    def add_rule(self, rule: StreamingRule) -> None:
+        if not rule.events:
+            raise ValueError(f"rule {rule.code or type(rule).__name__} subscribes to no events")
+        self.rules.append(rule)
+        for event_type in rule.events:
+            self._routes.setdefault(event_type, []).append(rule)
+
+    def subscribe(self, listener: AlertListener) -> None:
+        self._listeners.append(listener)
+
+    def process(self, event: object) -> list[Alert]:
+        """Apply one event; returns the alerts it fired."""
+        self.n_events += 1
+        rules = self._routes.get(type(event))
+        if not rules:
+            return []
+        fired = []
+        active = self._active
+        for rule in rules:
+            alert = rule.check(event)
+            if alert is None:
+                if active:
+                    active.pop((rule.code, rule.key(event)), None)
+                continue
+            key = (rule.code, rule.key(event))
+            if key in active:
+                self.n_suppressed += 1
+                continue
+            ts = event.ts
+            last = self._last_fired.get(key)
+            if last is not None and ts - last < self.cooldown:
+                self.n_suppressed += 1
+                continue
+            active[key] = alert
+            self._last_fired[key] = ts
+            record = FiredAlert(ts, key[1], alert)
+            self.history.append(record)
+            for listener in self._listeners:
+                listener(record)
+            fired.append(alert)
+        return fired
+
+    def process_many(self, events: Iterable[object]) -> list[Alert]:
+        fired: list[Alert] = []
+        process = self.process
+        for event in events:
+            alerts = process(event)
+            if alerts:
+                fired.extend(alerts)
+        return fired
+
+    @property
+    def active_alerts(self) -> list[Alert]:
+        """Alerts whose condition is still breached."""
+        return list(self._active.values())
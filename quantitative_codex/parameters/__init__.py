@@ -1,3 +1,4 @@
-from quantitative_codex.parameters.registry import ParameterRegistry
+from quantitative_codex.parameters.indexed import IndexedParameterRegistry
+from quantitative_codex.parameters.registry import ParameterRegistry, ParameterVersion
 
-__all__ = ["ParameterRegistry"]
+__all__ = ["IndexedParameterRegistry", "ParameterRegistry", "ParameterVersion"]
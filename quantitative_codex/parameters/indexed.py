@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import bisect
+import json
+import os
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+from quantitative_codex.parameters.registry import ParameterVersion
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class _FileLock:
+    """Exclusive inter-process lock on a sidecar file (``flock``, or ``msvcrt`` on Windows)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fd: int | None = None
+
+    def __enter__(self) -> _FileLock:
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after ~10 s; keep waiting
+                    continue
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+
+class IndexedParameterRegistry:
+    """Append-only JSONL parameter registry with an in-memory per-strategy index.
+
+    Same interface as ``ParameterRegistry``. Each ``add`` appends one line under an
+    exclusive lock on ``<path>.lock``, so parallel jobs can write to one registry. Reads
+    stat the file and only parse lines appended since the last read (a rewritten or
+    truncated file is reloaded in full), which makes ``latest`` O(1) and ``history``
+    O(k) in the strategy's version count. A trailing partial line from a writer still in
+    progress is left for the next read.
+    """
+
+    def __init__(self, path: str | Path, fsync: bool = False) -> None:
+        self.path = Path(path)
+        self.fsync = fsync
+        self._lock_path = self.path.with_name(self.path.name + ".lock")
+        self._index: dict[str, list[ParameterVersion]] = {}
+        self._offset = 0
+        self._stamp: tuple[int, int, int] | None = None  # (inode, size, mtime_ns) at last read
+        self.path.touch(exist_ok=True)
+
+    @classmethod
+    def migrate_from_json(cls, json_path: str | Path, path: str | Path, fsync: bool = False) -> IndexedParameterRegistry:
+        """Copy a ``ParameterRegistry`` JSON file into a new, empty JSONL registry."""
+        rows = json.loads(Path(json_path).read_text())
+        registry = cls(path, fsync=fsync)
+        with _FileLock(registry._lock_path):
+            if registry.path.stat().st_size:
+                raise ValueError(f"migration target is not empty: {registry.path}")
+            # stable sort keeps insertion order among equal timestamps, as ``latest`` did
+            rows = sorted(rows, key=lambda r: r["created_at"])
+            registry._append([ParameterVersion(**r) for r in rows])
+        return registry
+
+    def add(self, strategy: str, version: str, params: dict, note: str = "") -> ParameterVersion:
+        item = ParameterVersion(
+            strategy=strategy,
+            version=version,
+            params=params,
+            note=note,
+            created_at=datetime.utcnow().isoformat(),
+        )
+        with _FileLock(self._lock_path):
+            self._append([item])
+        return item
+
+    def latest(self, strategy: str) -> ParameterVersion | None:
+        self._refresh()
+        rows = self._index.get(strategy)
+        return rows[-1] if rows else None
+
+    def history(self, strategy: str) -> list[ParameterVersion]:
+        self._refresh()
+        return list(self._index.get(strategy, ()))
+
+    def strategies(self) -> list[str]:
+        self._refresh()
+        return sorted(self._index)
+
+    def _append(self, items: list[ParameterVersion]) -> None:
+        """Append ``items``; the caller holds the lock."""
+        self._refresh()
+        payload = "".join(json.dumps(asdict(item), ensure_ascii=False, sort_keys=True) + "\n" for item in items)
+        data = payload.encode("utf-8")
+        with self.path.open("ab") as fh:
+            if fh.tell() != self._offset:  # drop a torn line left by a crashed writer
+                fh.truncate(self._offset)
+            fh.write(data)
+            fh.flush()
+            if self.fsync:
+                os.fsync(fh.fileno())
+        for item in items:
+            self._insert(item)
+        self._offset += len(data)
+        self._stamp = self._file_stamp()
+
+    def _file_stamp(self) -> tuple[int, int, int]:
+        st = self.path.stat()
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _refresh(self) -> None:
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return
+        if self._stamp is None or stamp[0] != self._stamp[0] or stamp[1] < self._offset:
+            self._index = {}
+            self._offset = 0
+        with self.path.open("rb") as fh:
+            fh.seek(self._offset)
+            tail = fh.read()
+        complete = tail.rfind(b"\n") + 1
+        for line in tail[:complete].splitlines():
+            if line.strip():
+                self._insert(ParameterVersion(**json.loads(line)))
+        self._offset += complete
+        self._stamp = stamp
+
+    def _insert(self, item: ParameterVersion) -> None:
+        rows = self._index.setdefault(item.strategy, [])
+        if not rows or rows[-1].created_at <= item.created_at:
+            rows.append(item)
+        else:  # out-of-order timestamp, e.g. clock skew between writers
+            keys = [r.created_at for r in rows]
+            rows.insert(bisect.bisect_right(keys, item.created_at), item)
@@ -1,3 +1,12 @@
-from .optimization import optimize_weights
+from .mean_variance import MeanVarianceOptimizer, ledoit_wolf_covariance, project_box_simplex
+from .optimization import capped_rescale, capped_rescale_batch, optimize_weights, optimize_weights_panel
 
-__all__ = ["optimize_weights"]
+__all__ = [
+    "optimize_weights",
+    "optimize_weights_panel",
+    "capped_rescale",
+    "capped_rescale_batch",
+    "MeanVarianceOptimizer",
+    "ledoit_wolf_covariance",
+    "project_box_simplex",
+]
@@ -3,29 +3,89 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 
+from quantitative_codex.profiling import profiled
+
+
+def capped_rescale_batch(weights: np.ndarray, cap: float, mask: np.ndarray | None = None) -> np.ndarray:
+    """Rescale each row of a (dates x assets) matrix into {w >= 0, sum(w) = 1, w <= cap}.
+
+    This is a proportional rescale, not a Euclidean projection (for that see
+    ``project_box_simplex``): rows are clipped at zero and the result is
+    ``min(s * w, cap)``, so uncapped names keep their relative sizes. It is the closed
+    form of repeatedly capping and renormalizing, with the per-row scale ``s`` found
+    exactly by a sort (O(n log n) per row). If the
+    positive names cannot absorb the budget, the residual is spread evenly over the zero
+    names; rows with ``n * cap < 1`` are infeasible and fall back to equal weight.
+    ``mask`` marks eligible assets per row; ineligible entries are always zero.
+    """
+    w = np.nan_to_num(np.asarray(weights, dtype=float), nan=0.0, posinf=0.0, neginf=0.0)
+    if w.ndim != 2:
+        raise ValueError("weights must be a 2D (dates x assets) array")
+    w = np.clip(w, 0.0, None)
+    if mask is None:
+        eligible = np.ones(w.shape, dtype=bool)
+    else:
+        eligible = np.asarray(mask, dtype=bool)
+        w = np.where(eligible, w, 0.0)
+
+    out = np.zeros_like(w)
+    n_rows, n_cols = w.shape
+    if n_rows == 0 or n_cols == 0:
+        return out
+
+    totals = w.sum(axis=1)
+    active = totals > 0
+    if not active.any():
+        return out
+
+    v = w[active] / totals[active, None]
+    u = -np.sort(-v, axis=1)
+    ks = np.arange(n_cols, dtype=float)
+    # rest[:, k] is the mass left uncapped when the k largest names sit at the cap; a
+    # suffix sum avoids the cancellation of ``1 - cumsum(u) + u`` on small tails.
+    rest = np.cumsum(u[:, ::-1], axis=1)[:, ::-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = (1.0 - ks * cap) / rest
+        valid = (rest > 1e-15) & (u > 0) & (scale > 0) & (scale * u <= cap * (1.0 + 1e-12))
+    has_solution = valid.any(axis=1)
+    k = valid.argmax(axis=1)
+    s = np.where(has_solution, scale[np.arange(len(k)), k], 0.0)
+
+    projected = np.minimum(s[:, None] * v, cap)
+
+    stuck = ~has_solution
+    if stuck.any():
+        stuck_eligible = eligible[active][stuck]
+        n_eligible = stuck_eligible.sum(axis=1)
+        positive = v[stuck] > 0
+        n_positive = positive.sum(axis=1)
+        n_zero = n_eligible - n_positive
+        residual = 1.0 - n_positive * cap
+        with np.errstate(divide="ignore", invalid="ignore"):
+            spread = np.where(n_zero > 0, residual / n_zero, np.inf)
+        fillable = spread <= cap * (1.0 + 1e-12)
+        zero_eligible = stuck_eligible & ~positive
+        filled = np.where(positive, cap, np.where(zero_eligible, spread[:, None], 0.0))
+        uniform = np.where(stuck_eligible, 1.0 / np.maximum(n_eligible, 1)[:, None], 0.0)
+        projected[stuck] = np.where(fillable[:, None], filled, uniform)
+
+    out[active] = projected
+    return out
+
+
+def capped_rescale(weights: np.ndarray, cap: float) -> np.ndarray:
+    """Rescale a single weight vector into {w >= 0, sum(w) = 1, w <= cap}.
+
+    See ``capped_rescale_batch``.
+    """
+    return capped_rescale_batch(np.asarray(weights, dtype=float)[None, :], cap)[0]
+
 
 def _cap_and_renormalize_long_only(weights: pd.Series, max_weight: float) -> pd.Series:
-    w = weights.copy().clip(lower=0)
-    if w.sum() == 0:
-        return w
-    w = w / w.sum()
-
-    for _ in range(10):
-        over = w > max_weight
-        if not over.any():
-            break
-        capped_sum = w[over].clip(upper=max_weight).sum()
-        residual = 1.0 - capped_sum
-        free = ~over
-        free_sum = w[free].sum()
-        w.loc[over] = max_weight
-        if free_sum <= 0 or residual <= 0:
-            break
-        w.loc[free] = w.loc[free] / free_sum * residual
-
-    return w / w.sum() if w.sum() > 0 else w
+    return pd.Series(capped_rescale(weights.to_numpy(dtype=float), max_weight), index=weights.index)
 
 
+@profiled
 def optimize_weights(
     expected_returns: pd.Series,
     risk: pd.Series | None = None,
@@ -62,3 +122,54 @@ def optimize_weights(
     w = w.clip(lower=-max_weight, upper=max_weight)
     gross = w.abs().sum()
     return (w / gross if gross > 0 else w).sort_index()
+
+
+def optimize_weights_panel(
+    expected_returns: pd.DataFrame,
+    risk: pd.DataFrame | None = None,
+    long_only: bool = True,
+    max_weight: float = 0.2,
+) -> pd.DataFrame:
+    """Vectorized ``optimize_weights`` over a (dates x assets) panel.
+
+    Each row follows the single-date rules, including the per-date median-risk fallback.
+    Assets without a finite expected return on a date get a zero weight.
+    """
+    if expected_returns.empty:
+        return pd.DataFrame(0.0, index=expected_returns.index, columns=expected_returns.columns)
+
+    mu = expected_returns.to_numpy(dtype=float)
+    valid = np.isfinite(mu)
+    mu = np.where(valid, mu, 0.0)
+
+    if risk is None:
+        sigma = np.ones_like(mu)
+    else:
+        raw_risk = risk.reindex(index=expected_returns.index).to_numpy(dtype=float)
+        has_risk = (~np.isnan(raw_risk)).any(axis=1)
+        fallback = np.ones(len(raw_risk))
+        if has_risk.any():
+            fallback[has_risk] = np.nanmedian(raw_risk[has_risk], axis=1)
+        aligned = risk.reindex(index=expected_returns.index, columns=expected_returns.columns).to_numpy(dtype=float)
+        aligned = np.where(aligned == 0, np.nan, aligned)
+        sigma = np.where(np.isnan(aligned), fallback[:, None], aligned)
+
+    score = np.where(valid, mu / sigma, 0.0)
+    index, columns = expected_returns.index, expected_returns.columns
+
+    if long_only:
+        score = np.clip(score, 0.0, None)
+        n_valid = valid.sum(axis=1)
+        flat = score.sum(axis=1) <= 0
+        equal = np.where(valid, 1.0 / np.maximum(n_valid, 1)[:, None], 0.0)
+        w = np.where(flat[:, None], equal, score)
+        return pd.DataFrame(capped_rescale_batch(w, max_weight, mask=valid), index=index, columns=columns)
+
+    gross = np.abs(score).sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w = np.where(gross > 0, score / gross, 0.0)
+    w = np.clip(w, -max_weight, max_weight)
+    gross = np.abs(w).sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w = np.where(gross > 0, w / gross, w)
+    return pd.DataFrame(w, index=index, columns=columns)
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import functools
+import json
+import time
+import tracemalloc
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable, TypeVar
+
+import numpy as np
+import pandas as pd
+
+F = TypeVar("F", bound=Callable)
+
+
+class LatencyHistogram:
+    """Latency histogram with power-of-two microsecond buckets.
+
+    Bucket ``b`` counts samples in ``[2**(b-1), 2**b)`` microseconds, so recording is a
+    ``bit_length`` and an increment regardless of how many samples have been seen.
+    """
+
+    def __init__(self, n_buckets: int = 40) -> None:
+        self.counts = np.zeros(n_buckets, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        bucket = min(int(seconds * 1e6).bit_length(), len(self.counts) - 1)
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Upper edge (seconds) of the bucket holding the ``q``-th percentile."""
+        if self.count == 0:
+            return 0.0
+        rank = int(np.ceil(q / 100.0 * self.count))
+        bucket = int(np.searchsorted(np.cumsum(self.counts), max(rank, 1)))
+        return min(2.0**bucket / 1e6, self.max)
+
+    def bucket_edges(self) -> np.ndarray:
+        """Upper edge in seconds of every bucket but the last, which is unbounded."""
+        return 2.0 ** np.arange(len(self.counts) - 1) / 1e6
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "count": float(self.count),
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class StageStats:
+    def __init__(self) -> None:
+        self.latency = LatencyHistogram()
+        self.peak_memory = 0  # bytes allocated above the stage's starting point, max over calls
+
+
+class _StageTimer:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: Profiler, name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> _StageTimer:
+        if self.profiler.trace_memory:
+            self.profiler._push_memory_frame()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        elapsed = time.perf_counter() - self.start
+        profiler = self.profiler
+        stats = profiler.stats(self.name)
+        stats.latency.record(elapsed)
+        if profiler.trace_memory:
+            stats.peak_memory = max(stats.peak_memory, profiler._pop_memory_frame())
+
+
+class Profiler:
+    """Per-stage call counts, latency histograms and optional tracemalloc peaks.
+
+    Disabled by default; ``stage`` then returns a shared no-op context and ``profiled``
+    wrappers cost one attribute check per call. With ``trace_memory`` each stage records
+    the peak traced allocation above its starting point. Nested stages are supported:
+    an inner stage's peak still counts towards the enclosing stage.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.trace_memory = False
+        self.stages: dict[str, StageStats] = {}
+        self._memory_frames: list[list[int]] = []
+        self._started_tracemalloc = False
+
+    def enable(self, trace_memory: bool = False) -> None:
+        self.enabled = True
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        self.trace_memory = False
+        self._memory_frames.clear()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def reset(self) -> None:
+        self.stages.clear()
+        self._memory_frames.clear()
+
+    def stats(self, name: str) -> StageStats:
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats()
+        return stats
+
+    def stage(self, name: str) -> _StageTimer | nullcontext:
+        return _StageTimer(self, name) if self.enabled else _NULL_STAGE
+
+    def profiled(self, fn: F | None = None, *, name: str | None = None) -> F | Callable[[F], F]:
+        """Decorator timing every call of ``fn`` as stage ``name`` (default: its qualname)."""
+
+        def decorate(func: F) -> F:
+            stage_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _StageTimer(self, stage_name):
+                    return func(*args, **kwargs)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorate if fn is None else decorate(fn)
+
+    def _push_memory_frame(self) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        frames = self._memory_frames
+        if frames:
+            frames[-1][1] = max(frames[-1][1], peak)
+        tracemalloc.reset_peak()
+        frames.append([current, current])
+
+    def _pop_memory_frame(self) -> int:
+        _, peak = tracemalloc.get_traced_memory()
+        frames = self._memory_frames
+        if not frames:  # tracing switched on mid-stage
+            return 0
+        start, seen = frames.pop()
+        peak = max(peak, seen)
+        if frames:
+            frames[-1][1] = max(frames[-1][1], peak)
+        return peak - start
+
+    def summary(self) -> pd.DataFrame:
+        """One row per stage: calls, total/mean/p50/p99/max seconds and peak memory (MiB)."""
+        rows = {}
+        for name, stats in self.stages.items():
+            hist = stats.latency
+            row = hist.summary()
+            rows[name] = {
+                "calls": int(hist.count),
+                "total": hist.total,
+                "mean": row["mean"],
+                "p50": row["p50"],
+                "p99": row["p99"],
+                "max": row["max"],
+                "peak_mib": stats.peak_memory / 2**20,
+            }
+        columns = ["calls", "total", "mean", "p50", "p99", "max", "peak_mib"]
+        out = pd.DataFrame.from_dict(rows, orient="index", columns=columns)
+        return out.sort_values("total", ascending=False)
+
+    def to_dict(self) -> dict[str, dict[str, object]]:
+        out = {}
+        for name, stats in self.stages.items():
+            hist = stats.latency
+            out[name] = {
+                **{k: float(v) for k, v in hist.summary().items()},
+                "total": hist.total,
+                "peak_memory_bytes": int(stats.peak_memory),
+                "bucket_upper_seconds": hist.bucket_edges().tolist(),
+                "bucket_counts": hist.counts.tolist(),
+            }
+        return out
+
+    def to_json(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+    def to_prometheus(self, path: str | Path | None = None, prefix: str = "quantitative_codex") -> str:
+        """Prometheus text exposition of every stage; written to ``path`` when given."""
+        lines = [
+            f"# HELP {prefix}_stage_latency_seconds Wall time per instrumented stage call.",
+            f"# TYPE {prefix}_stage_latency_seconds histogram",
+        ]
+        for name, stats in self.stages.items():
+            hist = stats.latency
+            label = _escape_label(name)
+            for edge, cumulative in zip(hist.bucket_edges(), np.cumsum(hist.counts[:-1])):
+                lines.append(f'{prefix}_stage_latency_seconds_bucket{{stage="{label}",le="{edge:.6g}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_latency_seconds_bucket{{stage="{label}",le="+Inf"}} {hist.count}')
+            lines.append(f'{prefix}_stage_latency_seconds_sum{{stage="{label}"}} {hist.total:.9g}')
+            lines.append(f'{prefix}_stage_latency_seconds_count{{stage="{label}"}} {hist.count}')
+        lines += [
+            f"# HELP {prefix}_stage_peak_memory_bytes Peak traced allocation above the stage start.",
+            f"# TYPE {prefix}_stage_peak_memory_bytes gauge",
+        ]
+        for name, stats in self.stages.items():
+            lines.append(f'{prefix}_stage_peak_memory_bytes{{stage="{_escape_label(name)}"}} {stats.peak_memory}')
+        text = "\n".join(lines) + "\n"
+        if path is not None:
+            Path(path).write_text(text, encoding="utf-8")
+        return text
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_NULL_STAGE = nullcontext()
+
+# process-wide profiler behind the instrumented hot paths and the CLI ``--profile`` flag
+profiler = Profiler()
+
+profiled = profiler.profiled
+stage = profiler.stage
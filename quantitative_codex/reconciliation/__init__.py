@@ -1,3 +1,5 @@
+from quantitative_codex.reconciliation.bulk import reconcile_fill_files
 from quantitative_codex.reconciliation.engine import reconcile_fills, reconcile_positions
+from quantitative_codex.reconciliation.streaming import BreakEvent, StreamingReconciler
 
-__all__ = ["reconcile_positions", "reconcile_fills"]
+__all__ = ["reconcile_positions", "reconcile_fills", "reconcile_fill_files", "BreakEvent", "StreamingReconciler"]
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+class _Interner:
+    def __init__(self) -> None:
+        self.codes: dict[object, int] = {}
+        self.values: list[object] = []
+
+    def encode(self, column: pd.Series) -> np.ndarray:
+        """Global integer codes for ``column``; only the chunk's uniques touch the dict."""
+        local, uniques = pd.factorize(column, use_na_sentinel=False)
+        mapping = np.fromiter((self._code(u) for u in uniques), dtype=np.int64, count=len(uniques))
+        return mapping[local]
+
+    def _code(self, value: object) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class _FillAggregator:
+    """Quantity, notional and fill count per (symbol code, side code) in flat arrays."""
+
+    def __init__(self) -> None:
+        self.n_symbols = 0
+        self.n_sides = 0
+        self.qty = np.zeros((0, 0))
+        self.notional = np.zeros((0, 0))
+        self.count = np.zeros((0, 0), dtype=np.int64)
+
+    def _reshape(self, n_symbols: int, n_sides: int) -> None:
+        if n_symbols <= self.qty.shape[0] and n_sides <= self.qty.shape[1]:
+            return
+        shape = (max(n_symbols, 2 * self.qty.shape[0]), max(n_sides, self.qty.shape[1]))
+        for name in ("qty", "notional", "count"):
+            old = getattr(self, name)
+            new = np.zeros(shape, dtype=old.dtype)
+            new[: old.shape[0], : old.shape[1]] = old
+            setattr(self, name, new)
+
+    def add(self, sym: np.ndarray, side: np.ndarray, qty: np.ndarray, notional: np.ndarray | None, n_symbols: int, n_sides: int) -> None:
+        self._reshape(n_symbols, n_sides)
+        rows, cols = self.qty.shape
+        flat = sym * cols + side
+        size = rows * cols
+        self.qty += np.bincount(flat, weights=qty, minlength=size).reshape(rows, cols)
+        self.count += np.bincount(flat, minlength=size).reshape(rows, cols)
+        if notional is not None:
+            self.notional += np.bincount(flat, weights=notional, minlength=size).reshape(rows, cols)
+
+    def aligned(self, n_symbols: int, n_sides: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        self._reshape(n_symbols, n_sides)
+        return (
+            self.qty[:n_symbols, :n_sides],
+            self.notional[:n_symbols, :n_sides],
+            self.count[:n_symbols, :n_sides],
+        )
+
+
+def _aggregate_file(
+    path: str | Path,
+    agg: _FillAggregator,
+    symbols: _Interner,
+    sides: _Interner,
+    chunksize: int,
+    name: str,
+) -> bool:
+    header = pd.read_csv(path, nrows=0).columns
+    missing = {"symbol", "side", "qty"} - set(header)
+    if missing:
+        raise ValueError(f"{name} missing required columns: {sorted(missing)}")
+    has_price = "price" in header
+    usecols = ["symbol", "side", "qty"] + (["price"] if has_price else [])
+    dtypes = {"symbol": str, "side": str, "qty": float, "price": float}
+
+    for chunk in pd.read_csv(path, usecols=usecols, dtype={c: dtypes[c] for c in usecols}, chunksize=chunksize):
+        sym = symbols.encode(chunk["symbol"])
+        side = sides.encode(chunk["side"])
+        qty = chunk["qty"].to_numpy(dtype=float)
+        notional = qty * chunk["price"].to_numpy(dtype=float) if has_price else None
+        agg.add(sym, side, qty, notional, len(symbols.values), len(sides.values))
+    return has_price
+
+
+def reconcile_fill_files(
+    internal_path: str | Path,
+    broker_path: str | Path,
+    qty_tolerance: float = 1e-8,
+    notional_tolerance: float | None = None,
+    chunksize: int = 1_000_000,
+    breaks_only: bool = False,
+) -> pd.DataFrame:
+    """File-based ``reconcile_fills`` for fill files too large to load at once.
+
+    Both CSV files (``symbol``, ``side``, ``qty`` and optionally ``price``) are read in
+    ``chunksize`` rows, interned to integer symbol/side codes and summed with
+    ``np.bincount`` into per-key arrays, so memory is bounded by one chunk plus the
+    number of distinct keys. When both files carry prices, notional totals are compared
+    too and a key breaks on either tolerance.
+    """
+    symbols, sides = _Interner(), _Interner()
+    internal, broker = _FillAggregator(), _FillAggregator()
+    internal_priced = _aggregate_file(internal_path, internal, symbols, sides, chunksize, "internal file")
+    broker_priced = _aggregate_file(broker_path, broker, symbols, sides, chunksize, "broker file")
+
+    n_symbols, n_sides = len(symbols.values), len(sides.values)
+    qty_i, notional_i, count_i = internal.aligned(n_symbols, n_sides)
+    qty_b, notional_b, count_b = broker.aligned(n_symbols, n_sides)
+    sym_idx, side_idx = np.nonzero((count_i + count_b) > 0)
+
+    out = pd.DataFrame(
+        {
+            "symbol": np.asarray(symbols.values, dtype=object)[sym_idx],
+            "side": np.asarray(sides.values, dtype=object)[side_idx],
+            "qty_internal": qty_i[sym_idx, side_idx],
+            "qty_broker": qty_b[sym_idx, side_idx],
+            "fills_internal": count_i[sym_idx, side_idx],
+            "fills_broker": count_b[sym_idx, side_idx],
+        }
+    )
+    out["diff_qty"] = out["qty_internal"] - out["qty_broker"]
+    out["qty_break"] = out["diff_qty"].abs() > qty_tolerance
+    out["is_break"] = out["qty_break"]
+    if internal_priced and broker_priced:
+        out["notional_internal"] = notional_i[sym_idx, side_idx]
+        out["notional_broker"] = notional_b[sym_idx, side_idx]
+        out["diff_notional"] = out["notional_internal"] - out["notional_broker"]
+        if notional_tolerance is not None:
+            out["notional_break"] = out["diff_notional"].abs() > notional_tolerance
+            out["is_break"] = out["qty_break"] | out["notional_break"]
+
+    if breaks_only:
+        out = out[out["is_break"]]
+    return out.sort_values(["symbol", "side"]).reset_index(drop=True)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable
+
+import pandas as pd
+
+_INTERNAL = 0
+_BROKER = 1
+
+
+@dataclass(frozen=True, slots=True)
+class BreakEvent:
+    kind: str  # "opened" or "closed"
+    symbol: str
+    side: str
+    internal_qty: float
+    broker_qty: float
+    diff_qty: float
+
+
+BreakListener = Callable[[BreakEvent], None]
+
+
+class StreamingReconciler:
+    """Incremental counterpart of ``reconcile_fills``.
+
+    Keeps running per-(symbol, side) fill totals for the internal and broker sides. Each
+    fill touches one key, so updating the break set and emitting ``opened``/``closed``
+    events costs O(changed keys). ``snapshot()`` returns the same frame as
+    ``reconcile_fills`` over everything seen so far.
+    """
+
+    def __init__(self, qty_tolerance: float = 1e-8) -> None:
+        self.qty_tolerance = qty_tolerance
+        self._totals: dict[tuple[str, str], list[float]] = {}
+        self._open: dict[tuple[str, str], float] = {}
+        self._listeners: list[BreakListener] = []
+
+    def subscribe(self, listener: BreakListener) -> None:
+        self._listeners.append(listener)
+
+    def add_internal_fill(self, symbol: str, side: str | Enum, qty: float) -> BreakEvent | None:
+        return self._add(_INTERNAL, symbol, side, qty)
+
+    def add_broker_fill(self, symbol: str, side: str | Enum, qty: float) -> BreakEvent | None:
+        return self._add(_BROKER, symbol, side, qty)
+
+    def add_internal_fills(self, fills: pd.DataFrame) -> list[BreakEvent]:
+        return self._add_frame(_INTERNAL, fills, "internal_fills")
+
+    def add_broker_fills(self, fills: pd.DataFrame) -> list[BreakEvent]:
+        return self._add_frame(_BROKER, fills, "broker_fills")
+
+    def _add_frame(self, source: int, fills: pd.DataFrame, name: str) -> list[BreakEvent]:
+        missing = {"symbol", "side", "qty"} - set(fills.columns)
+        if missing:
+            raise ValueError(f"{name} missing required columns: {sorted(missing)}")
+        if fills.empty:
+            return []
+        # collapse the batch first so each key is checked once
+        batch = fills.groupby(["symbol", "side"], sort=False)["qty"].sum()
+        events = []
+        for (symbol, side), qty in batch.items():
+            event = self._add(source, symbol, side, float(qty))
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _add(self, source: int, symbol: str, side: str | Enum, qty: float) -> BreakEvent | None:
+        key = (symbol, side.value if isinstance(side, Enum) else side)
+        totals = self._totals.get(key)
+        if totals is None:
+            totals = self._totals[key] = [0.0, 0.0]
+        totals[source] += qty
+
+        diff = totals[_INTERNAL] - totals[_BROKER]
+        is_break = abs(diff) > self.qty_tolerance
+        was_break = key in self._open
+        if is_break:
+            self._open[key] = diff
+        elif was_break:
+            del self._open[key]
+        if is_break == was_break:
+            return None
+
+        event = BreakEvent("opened" if is_break else "closed", key[0], key[1], totals[_INTERNAL], totals[_BROKER], diff)
+        for listener in self._listeners:
+            listener(event)
+        return event
+
+    @property
+    def open_breaks(self) -> dict[tuple[str, str], float]:
+        """Current breaks as ``(symbol, side) -> internal minus broker quantity``."""
+        return dict(self._open)
+
+    def breaks(self) -> pd.DataFrame:
+        return self._frame(list(self._open))
+
+    def snapshot(self) -> pd.DataFrame:
+        return self._frame(list(self._totals))
+
+    def _frame(self, keys: list[tuple[str, str]]) -> pd.DataFrame:
+        rows = [(s, side, *self._totals[(s, side)]) for s, side in sorted(keys)]
+        out = pd.DataFrame(rows, columns=["symbol", "side", "qty_internal", "qty_broker"])
+        out[["qty_internal", "qty_broker"]] = out[["qty_internal", "qty_broker"]].astype(float)
+        out["diff_qty"] = out["qty_internal"] - out["qty_broker"]
+        out["is_break"] = out["diff_qty"].abs() > self.qty_tolerance
+        return out
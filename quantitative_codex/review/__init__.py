@@ -1,3 +1,4 @@
 from quantitative_codex.review.postmortem import build_postmortem_report
+from quantitative_codex.review.trades import build_round_trips, fills_frame, postmortem_from_fills
 
-__all__ = ["build_postmortem_report"]
+__all__ = ["build_postmortem_report", "build_round_trips", "fills_frame", "postmortem_from_fills"]
@@ -27,16 +27,22 @@ def build_postmortem_report(
         else []
     )
 
+    summary: dict[str, object] = {
+        "total_trades": total_trades,
+        "wins": wins,
+        "losses": losses,
+        "win_rate": win_rate,
+        "gross_pnl": gross_pnl,
+        "avg_pnl": avg_pnl,
+    }
+    # round-trip frames from ``build_round_trips`` carry these too
+    for column in ("holding_period", "mae", "mfe"):
+        if column in trades.columns and total_trades:
+            summary[f"avg_{column}"] = trades[column].mean()
+
     return {
         "title": title,
-        "summary": {
-            "total_trades": total_trades,
-            "wins": wins,
-            "losses": losses,
-            "win_rate": win_rate,
-            "gross_pnl": gross_pnl,
-            "avg_pnl": avg_pnl,
-        },
+        "summary": summary,
         "top_symbols": by_symbol[:5],
         "alerts": alerts or [],
     }
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from quantitative_codex.execution.models import Fill
+from quantitative_codex.review.postmortem import build_postmortem_report
+
+ROUND_TRIP_COLUMNS = [
+    "symbol",
+    "direction",
+    "qty",
+    "entry_time",
+    "exit_time",
+    "entry_price",
+    "exit_price",
+    "pnl",
+    "holding_period",
+]
+
+
+def fills_frame(fills: Iterable[Fill]) -> pd.DataFrame:
+    """Fill objects (e.g. ``PaperBrokerAdapter.fills``) as a ``symbol/side/qty/price/timestamp`` frame."""
+    rows = [(f.symbol, f.side.value, f.qty, f.price, f.timestamp) for f in fills]
+    return pd.DataFrame(rows, columns=["symbol", "side", "qty", "price", "timestamp"])
+
+
+def _signed_qty(fills: pd.DataFrame) -> np.ndarray:
+    qty = fills["qty"].to_numpy(dtype=float)
+    if "side" not in fills.columns:
+        return qty
+    codes, uniques = pd.factorize(fills["side"])
+    names = [str(getattr(u, "value", u)).lower() for u in uniques]
+    bad = sorted(set(names) - {"buy", "sell"})
+    if bad or (codes < 0).any():
+        raise ValueError(f"unknown fill side(s): {bad or ['<missing>']}")
+    is_buy = np.array([name == "buy" for name in names], dtype=bool)[codes]
+    return np.where(is_buy, np.abs(qty), -np.abs(qty))
+
+
+def _split_fills(sym: np.ndarray, q: np.ndarray, tol: float) -> tuple[np.ndarray, ...]:
+    """Split each fill into the quantity that closes the open position and the rest that opens.
+
+    Fills must be sorted by symbol. Returns closing qty, opening qty, position after each
+    fill, a flag on the fills that open an episode (a flat-to-flat holding in one
+    direction) and the episode each fill's closing quantity belongs to.
+    """
+    n = len(q)
+    new_symbol = np.r_[True, sym[1:] != sym[:-1]] if n else np.zeros(0, dtype=bool)
+    cum = np.cumsum(q)
+    group_start = np.maximum.accumulate(np.where(new_symbol, np.arange(n), 0))
+    pos_after = cum - (cum - q)[group_start]
+    pos_after[np.abs(pos_after) <= tol] = 0.0
+    pos_before = np.where(new_symbol, 0.0, np.r_[0.0, pos_after[:-1]])
+    q = pos_after - pos_before
+
+    reducing = pos_before * q < 0
+    closing = np.where(reducing, np.minimum(np.abs(q), np.abs(pos_before)), 0.0)
+    opening = np.abs(q) - closing
+    opening[opening <= tol] = 0.0
+
+    starts = (opening > 0) & ((pos_before == 0) | reducing)
+    episode = np.cumsum(starts) - 1
+    close_episode = episode - starts  # a flip closes the previous episode first
+    return closing, opening, pos_after, starts, close_episode
+
+
+def _match_fifo(
+    closing: np.ndarray, opening: np.ndarray, starts: np.ndarray, close_episode: np.ndarray, tol: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """FIFO lot matching as an overlap of cumulative quantity intervals.
+
+    Opened quantity is laid end to end on one axis (``[open_start, open_end)`` per opening
+    fill). Each episode's closes are laid on the same axis from the episode's first open,
+    so under FIFO a close interval overlaps exactly the opens it consumes. Every piece
+    between consecutive interval boundaries is one (open, close) pair, found with
+    ``searchsorted``.
+    """
+    open_rows = np.flatnonzero(opening > 0)
+    open_end = np.cumsum(opening[open_rows])
+    open_start = open_end - opening[open_rows]
+    base = open_start[starts[open_rows]]  # axis offset of each episode's first open
+
+    close_rows = np.flatnonzero(closing > 0)
+    if not len(close_rows):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    cq = closing[close_rows]
+    ce = close_episode[close_rows]
+    cum = np.cumsum(cq)
+    first = np.r_[True, ce[1:] != ce[:-1]]
+    offset = (cum - cq)[first][np.cumsum(first) - 1]
+    close_end = base[ce] + cum - offset
+    close_start = close_end - cq
+
+    points = np.unique(np.concatenate([open_end, close_start, close_end]))
+    seg_qty = np.diff(points)
+    mid = points[:-1] + seg_qty / 2
+    eps = max(tol, 1e-12 * points[-1])  # cumulative sums drift with the axis length
+    j = np.searchsorted(close_end, mid, side="right")
+    inside = (j < len(close_end)) & (seg_qty > eps)
+    inside[inside] &= close_start[j[inside]] <= mid[inside]
+    i = np.searchsorted(open_end, mid[inside], side="right")
+    return open_rows[i], close_rows[j[inside]], seg_qty[inside]
+
+
+def _match_lifo(
+    sym: np.ndarray, closing: np.ndarray, opening: np.ndarray, tol: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    open_idx: list[int] = []
+    close_idx: list[int] = []
+    matched: list[float] = []
+    stack: list[list[float]] = []  # [row, remaining qty], newest last
+    current = None
+    for row in np.flatnonzero((closing > 0) | (opening > 0)).tolist():
+        if sym[row] != current:
+            current, stack = sym[row], []
+        remaining = closing[row]
+        while remaining > tol and stack:
+            lot = stack[-1]
+            take = min(lot[1], remaining)
+            open_idx.append(int(lot[0]))
+            close_idx.append(row)
+            matched.append(take)
+            lot[1] -= take
+            remaining -= take
+            if lot[1] <= tol:
+                stack.pop()
+        if opening[row] > 0:
+            stack.append([row, opening[row]])
+    return np.asarray(open_idx, dtype=np.int64), np.asarray(close_idx, dtype=np.int64), np.asarray(matched, dtype=float)
+
+
+def _excursions(out: pd.DataFrame, bars: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Per-trade price range over ``bars`` (wide, time x symbol) between entry and exit.
+
+    All trade windows are cut from one flat symbol-major array and reduced with
+    ``np.fmax.reduceat``/``np.fmin.reduceat``; fill prices are part of the range.
+    """
+    bars = bars.sort_index()
+    times = bars.index
+    n_times = len(times)
+    flat = np.r_[bars.to_numpy(dtype=float).T.ravel(), np.nan]
+    col = bars.columns.get_indexer(out["symbol"])
+    lo_t = times.searchsorted(out["entry_time"], side="left")
+    hi_t = times.searchsorted(out["exit_time"], side="right")
+    has_window = (col >= 0) & (hi_t > lo_t)
+
+    hi = np.full(len(out), np.nan)
+    lo = np.full(len(out), np.nan)
+    if has_window.any():
+        starts = (col * n_times + lo_t)[has_window]
+        ends = (col * n_times + hi_t)[has_window]
+        order = np.argsort(starts, kind="stable")  # keeps the reduceat gaps linear in total size
+        bounds = np.column_stack([starts[order], ends[order]]).ravel()
+        rows = np.flatnonzero(has_window)[order]
+        hi[rows] = np.fmax.reduceat(flat, bounds)[::2]
+        lo[rows] = np.fmin.reduceat(flat, bounds)[::2]
+
+    fills_hi = np.maximum(out["entry_price"].to_numpy(), out["exit_price"].to_numpy())
+    fills_lo = np.minimum(out["entry_price"].to_numpy(), out["exit_price"].to_numpy())
+    return np.fmax(hi, fills_hi), np.fmin(lo, fills_lo)
+
+
+def build_round_trips(
+    fills: pd.DataFrame | Iterable[Fill],
+    method: str = "fifo",
+    bars: pd.DataFrame | None = None,
+    qty_tolerance: float = 1e-9,
+) -> pd.DataFrame:
+    """Match fills into round-trip trades per symbol.
+
+    ``fills`` has ``symbol``, ``qty``, ``price`` and either a ``side`` column (buy/sell)
+    or signed quantities, plus an optional ``timestamp``; ``Fill`` objects are accepted
+    too. A fill that flips the position closes the old lots and opens the remainder in
+    the new direction. Each output row is one matched (entry fill, exit fill) lot with
+    its quantity, PnL and holding period; unmatched open quantity is not reported.
+
+    ``method="fifo"`` matches with sorted array operations only. ``"lifo"`` walks the
+    fills with a per-symbol stack. With ``bars`` (a wide time x symbol price frame),
+    ``mae``/``mfe`` hold the worst and best unrealized PnL of the lot over the bars
+    between its entry and exit, fill prices included.
+    """
+    if not isinstance(fills, pd.DataFrame):
+        fills = fills_frame(fills)
+    missing = {"symbol", "qty", "price"} - set(fills.columns)
+    if missing:
+        raise ValueError(f"fills missing required columns: {sorted(missing)}")
+    method = method.lower()
+    if method not in ("fifo", "lifo"):
+        raise ValueError(f"Unsupported matching method: {method}")
+    has_time = "timestamp" in fills.columns
+    if bars is not None and not has_time:
+        raise ValueError("MAE/MFE against bars needs a fills timestamp column")
+
+    codes, symbols = pd.factorize(fills["symbol"], sort=True)
+    n = len(fills)
+    keys = (np.arange(n), fills["timestamp"].to_numpy(), codes) if has_time else (np.arange(n), codes)
+    order = np.lexsort(keys)
+    sym = codes[order]
+    q = _signed_qty(fills)[order]
+    price = fills["price"].to_numpy(dtype=float)[order]
+
+    closing, opening, pos_after, starts, close_episode = _split_fills(sym, q, qty_tolerance)
+    if method == "fifo":
+        open_row, close_row, qty = _match_fifo(closing, opening, starts, close_episode, qty_tolerance)
+    else:
+        open_row, close_row, qty = _match_lifo(sym, closing, opening, qty_tolerance)
+
+    direction = np.sign(pos_after[open_row])
+    entry_price = price[open_row]
+    exit_price = price[close_row]
+    out = pd.DataFrame(
+        {
+            "symbol": np.asarray(symbols, dtype=object)[sym[open_row]],
+            "direction": np.where(direction > 0, "long", "short"),
+            "qty": qty,
+            "entry_price": entry_price,
+            "exit_price": exit_price,
+            "pnl": direction * qty * (exit_price - entry_price),
+        }
+    )
+    if has_time:
+        ts = fills["timestamp"].to_numpy()[order]
+        out["entry_time"] = ts[open_row]
+        out["exit_time"] = ts[close_row]
+        out["holding_period"] = out["exit_time"] - out["entry_time"]
+    else:
+        out["entry_time"] = open_row
+        out["exit_time"] = close_row
+        out["holding_period"] = close_row - open_row  # in fills
+    out = out[ROUND_TRIP_COLUMNS]
+
+    if bars is not None:
+        hi, lo = _excursions(out, bars)
+        best = np.where(direction > 0, hi, lo)
+        worst = np.where(direction > 0, lo, hi)
+        out["mae"] = direction * qty * (worst - entry_price) + 0.0  # + 0.0 drops negative zeros
+        out["mfe"] = direction * qty * (best - entry_price) + 0.0
+    return out
+
+
+def postmortem_from_fills(
+    fills: pd.DataFrame | Iterable[Fill],
+    method: str = "fifo",
+    bars: pd.DataFrame | None = None,
+    alerts: list[dict] | None = None,
+    title: str = "Strategy Postmortem",
+) -> dict[str, object]:
+    """``build_round_trips`` followed by ``build_postmortem_report`` on the resulting trades."""
+    return build_postmortem_report(build_round_trips(fills, method=method, bars=bars), alerts=alerts, title=title)
@@ -1,3 +1,30 @@
-from .controls import apply_risk_controls, drawdown_guard, liquidity_cap
+from .controls import (
+    apply_risk_controls,
+    apply_risk_controls_panel,
+    drawdown_guard,
+    liquidity_cap,
+    liquidity_cap_panel,
+    rolling_adv,
+)
+from .covariance import CovarianceModel, EWMACovariance, FactorCovariance, portfolio_volatility
+from .guards import DailyLossGuard, DrawdownGuard
+from .var import RollingHistoricalVaR, historical_var_es, parametric_var_es, screen_var_limits
 
-__all__ = ["apply_risk_controls", "drawdown_guard", "liquidity_cap"]
+__all__ = [
+    "apply_risk_controls",
+    "apply_risk_controls_panel",
+    "drawdown_guard",
+    "liquidity_cap",
+    "liquidity_cap_panel",
+    "rolling_adv",
+    "CovarianceModel",
+    "EWMACovariance",
+    "FactorCovariance",
+    "portfolio_volatility",
+    "DailyLossGuard",
+    "DrawdownGuard",
+    "RollingHistoricalVaR",
+    "historical_var_es",
+    "parametric_var_es",
+    "screen_var_limits",
+]
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
+from .guards import DrawdownGuard
+
 
 def liquidity_cap(weights: pd.Series, adv_usd: pd.Series, min_liquidity_score: float = 0.1) -> pd.Series:
     """Tilt down weights for less-liquid assets using normalized ADV score."""
@@ -19,11 +22,11 @@ def liquidity_cap(weights: pd.Series, adv_usd: pd.Series, min_liquidity_score: f
 
 
 def drawdown_guard(equity_curve: pd.Series, max_drawdown: float = 0.2) -> bool:
-    """Return whether trading should remain enabled."""
-    if equity_curve.empty:
-        return True
-    dd = (equity_curve / equity_curve.cummax() - 1.0).min()
-    return dd >= -abs(max_drawdown)
+    """Return whether trading should remain enabled.
+
+    Batch wrapper around ``DrawdownGuard``; live loops should keep a guard and feed it ticks.
+    """
+    return DrawdownGuard(max_drawdown=max_drawdown).update_many(equity_curve.to_numpy(dtype=float))
 
 
 def apply_risk_controls(
@@ -41,3 +44,43 @@ def apply_risk_controls(
         w = liquidity_cap(w, adv_usd=adv_usd, min_liquidity_score=min_liquidity_score)
 
     return w
+
+
+def rolling_adv(close: pd.DataFrame, volume: pd.DataFrame, window: int = 20, min_periods: int = 1) -> pd.DataFrame:
+    """Rolling average daily dollar volume (close * volume) per symbol."""
+    dollar_volume = close * volume.reindex(index=close.index, columns=close.columns)
+    return dollar_volume.rolling(window, min_periods=min_periods).mean()
+
+
+def liquidity_cap_panel(weights: pd.DataFrame, adv_usd: pd.DataFrame, min_liquidity_score: float = 0.1) -> pd.DataFrame:
+    """Vectorized ``liquidity_cap`` over a (dates x assets) weight panel."""
+    w = weights.to_numpy(dtype=float)
+    adv = adv_usd.reindex(index=weights.index, columns=weights.columns).fillna(0.0).to_numpy(dtype=float)
+    max_adv = adv.max(axis=1, initial=0.0, keepdims=True)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score = np.clip(adv / max_adv, min_liquidity_score, 1.0)
+    tilted = np.where(max_adv > 0, w * score, w)
+    total = tilted.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tilted = np.where((max_adv > 0) & (total > 0), tilted / total, tilted)
+    return pd.DataFrame(tilted, index=weights.index, columns=weights.columns)
+
+
+def apply_risk_controls_panel(
+    weights: pd.DataFrame,
+    adv_usd: pd.DataFrame | None = None,
+    max_weight: float = 0.1,
+    min_liquidity_score: float = 0.1,
+) -> pd.DataFrame:
+    """Vectorized ``apply_risk_controls`` over a (dates x assets) weight panel."""
+    w = weights.fillna(0.0).to_numpy(dtype=float).clip(0.0, max_weight)
+    total = w.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w = np.where(total > 0, w / total, w)
+    out = pd.DataFrame(w, index=weights.index, columns=weights.columns)
+
+    if adv_usd is not None and not adv_usd.empty:
+        out = liquidity_cap_panel(out, adv_usd=adv_usd, min_liquidity_score=min_liquidity_score)
+
+    return out
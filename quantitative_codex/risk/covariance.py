@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Protocol, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class CovarianceModel(Protocol):
+    """Anything that can multiply a weight vector by its covariance matrix."""
+
+    symbols: pd.Index
+
+    def matvec(self, weights: np.ndarray) -> np.ndarray: ...
+
+
+class EWMACovariance:
+    """Exponentially weighted covariance updated in place one return row at a time.
+
+    Each update is a rank-1 step ``S = lam * S + (1 - lam) * r r'`` (zero-mean, RiskMetrics
+    style), so a new row costs O(N^2) instead of re-estimating from the whole window.
+    Missing returns count as zero.
+    """
+
+    def __init__(self, symbols: Sequence[str], halflife: float = 60.0) -> None:
+        if halflife <= 0:
+            raise ValueError("halflife must be positive")
+        self.symbols = pd.Index(symbols)
+        self.decay = float(0.5 ** (1.0 / halflife))
+        self.n_obs = 0
+        self._cov = np.zeros((len(self.symbols), len(self.symbols)))
+        self._weight = 0.0
+
+    def update(self, returns_row: pd.Series | np.ndarray) -> None:
+        if isinstance(returns_row, pd.Series):
+            r = returns_row.reindex(self.symbols).to_numpy(dtype=float)
+        else:
+            r = np.asarray(returns_row, dtype=float)
+        r = np.nan_to_num(r)
+        self._cov *= self.decay
+        self._cov += np.multiply.outer((1.0 - self.decay) * r, r)
+        self._weight = self.decay * self._weight + (1.0 - self.decay)
+        self.n_obs += 1
+
+    def update_many(self, returns: pd.DataFrame) -> None:
+        for row in returns.reindex(columns=self.symbols).to_numpy(dtype=float):
+            self.update(row)
+
+    def _normalized(self) -> np.ndarray:
+        # divide out the missing weight of the not-yet-observed history
+        return self._cov / self._weight if self._weight > 0 else self._cov.copy()
+
+    def matvec(self, weights: np.ndarray) -> np.ndarray:
+        w = np.asarray(weights, dtype=float)
+        if self._weight <= 0:
+            return np.zeros_like(w)
+        return self._cov @ w / self._weight
+
+    def covariance(self) -> pd.DataFrame:
+        return pd.DataFrame(self._normalized(), index=self.symbols, columns=self.symbols)
+
+    def volatility(self) -> pd.Series:
+        return pd.Series(np.sqrt(np.clip(np.diag(self._normalized()), 0.0, None)), index=self.symbols)
+
+
+@dataclass
+class FactorCovariance:
+    """Low-rank plus diagonal covariance ``B diag(f) B' + diag(d)`` stored in O(N*k)."""
+
+    symbols: pd.Index
+    loadings: np.ndarray
+    factor_variance: np.ndarray
+    specific_variance: np.ndarray
+
+    @classmethod
+    def fit(
+        cls,
+        returns: pd.DataFrame,
+        n_factors: int = 5,
+        halflife: float | None = None,
+        min_specific_variance: float = 1e-10,
+    ) -> FactorCovariance:
+        """Fit top-k statistical (PCA) factors from a returns window.
+
+        With ``halflife`` set, rows are exponentially weighted towards the most recent date.
+        """
+        x = np.nan_to_num(returns.to_numpy(dtype=float))
+        t, n = x.shape
+        if t < 2:
+            raise ValueError("need at least two return rows to fit factors")
+
+        if halflife is None:
+            row_weights = np.full(t, 1.0 / t)
+        else:
+            row_weights = 0.5 ** (np.arange(t)[::-1] / halflife)
+            row_weights = row_weights / row_weights.sum()
+        x = x - row_weights @ x
+        scaled = x * np.sqrt(row_weights)[:, None]
+
+        k = max(0, min(n_factors, t, n))
+        _, singular, vt = np.linalg.svd(scaled, full_matrices=False)
+        loadings = vt[:k].T.copy()
+        factor_variance = singular[:k] ** 2
+
+        total_variance = (scaled**2).sum(axis=0)
+        explained = (loadings**2) @ factor_variance
+        specific = np.clip(total_variance - explained, min_specific_variance, None)
+        return cls(
+            symbols=pd.Index(returns.columns),
+            loadings=loadings,
+            factor_variance=factor_variance,
+            specific_variance=specific,
+        )
+
+    @property
+    def n_factors(self) -> int:
+        return len(self.factor_variance)
+
+    def matvec(self, weights: np.ndarray) -> np.ndarray:
+        """Multiply an (N,) vector or an (N, P) matrix of weights by the covariance."""
+        w = np.asarray(weights, dtype=float)
+        if w.ndim == 1:
+            return self.loadings @ (self.factor_variance * (self.loadings.T @ w)) + self.specific_variance * w
+        return self.loadings @ (self.factor_variance[:, None] * (self.loadings.T @ w)) + self.specific_variance[:, None] * w
+
+    def covariance(self) -> pd.DataFrame:
+        dense = (self.loadings * self.factor_variance) @ self.loadings.T
+        dense[np.diag_indices_from(dense)] += self.specific_variance
+        return pd.DataFrame(dense, index=self.symbols, columns=self.symbols)
+
+    def volatility(self) -> pd.Series:
+        var = (self.loadings**2) @ self.factor_variance + self.specific_variance
+        return pd.Series(np.sqrt(var), index=self.symbols)
+
+
+def portfolio_volatility(weights: pd.Series, cov: pd.DataFrame | CovarianceModel) -> float:
+    """Portfolio standard deviation for a dense covariance frame or a covariance model."""
+    if isinstance(cov, pd.DataFrame):
+        w = weights.reindex(cov.columns).fillna(0.0).to_numpy(dtype=float)
+        sw = cov.to_numpy(dtype=float) @ w
+    else:
+        w = weights.reindex(cov.symbols).fillna(0.0).to_numpy(dtype=float)
+        sw = cov.matvec(w)
+    return float(np.sqrt(max(float(w @ sw), 0.0)))
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import math
+from dataclasses import asdict, dataclass
+from typing import Hashable
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class DrawdownGuard:
+    """Running-peak drawdown tracker with O(1) work per equity tick.
+
+    Once the drawdown breaches ``max_drawdown`` the guard stays breached until ``reset``.
+    Non-finite ticks (missing marks) are skipped.
+    """
+
+    max_drawdown: float = 0.2
+    peak: float | None = None
+    last: float | None = None
+    drawdown: float = 0.0
+    worst_drawdown: float = 0.0
+    breached: bool = False
+    n_updates: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return not self.breached
+
+    def update(self, equity: float) -> bool:
+        equity = float(equity)
+        if not math.isfinite(equity):
+            return self.enabled
+        self.peak = equity if self.peak is None else max(self.peak, equity)
+        self.last = equity
+        self.drawdown = equity / self.peak - 1.0 if self.peak > 0 else 0.0
+        self.worst_drawdown = min(self.worst_drawdown, self.drawdown)
+        self.breached = self.breached or self.drawdown < -abs(self.max_drawdown)
+        self.n_updates += 1
+        return self.enabled
+
+    def update_many(self, equity: pd.Series | np.ndarray) -> bool:
+        """Apply a block of ticks at once; equivalent to calling ``update`` on each."""
+        values = np.asarray(equity, dtype=float)
+        values = values[np.isfinite(values)]  # accumulate would carry NaN forward
+        if values.size == 0:
+            return self.enabled
+
+        peaks = np.maximum.accumulate(values)
+        if self.peak is not None:
+            peaks = np.maximum(peaks, self.peak)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdowns = np.where(peaks > 0, values / peaks - 1.0, 0.0)
+
+        self.peak = float(peaks[-1])
+        self.last = float(values[-1])
+        self.drawdown = float(drawdowns[-1])
+        self.worst_drawdown = min(self.worst_drawdown, float(drawdowns.min()))
+        self.breached = self.breached or self.worst_drawdown < -abs(self.max_drawdown)
+        self.n_updates += int(values.size)
+        return self.enabled
+
+    def reset(self) -> None:
+        self.peak = self.last = None
+        self.drawdown = self.worst_drawdown = 0.0
+        self.breached = False
+        self.n_updates = 0
+
+    def to_state(self) -> dict[str, object]:
+        return asdict(self)
+
+    @classmethod
+    def from_state(cls, state: dict[str, object]) -> DrawdownGuard:
+        return cls(**state)
+
+
+@dataclass
+class DailyLossGuard:
+    """Intraday PnL tracker against the session's opening equity.
+
+    ``session`` is any key that changes once per trading day (e.g. a ``date``); the first
+    tick of a new session becomes its opening equity and clears the breach flag.
+    Non-finite ticks are skipped, so they can neither open a session nor clear a breach.
+    """
+
+    max_daily_loss: float = 0.03
+    session: Hashable | None = None
+    session_open: float | None = None
+    daily_pnl: float = 0.0
+    worst_daily_pnl: float = 0.0
+    breached: bool = False
+    breach_count: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return not self.breached
+
+    def update(self, equity: float, session: Hashable | None = None) -> bool:
+        equity = float(equity)
+        if not math.isfinite(equity):
+            return self.enabled
+        if self.session_open is None or (session is not None and session != self.session):
+            self.session = session
+            self.session_open = equity
+            self.breached = False
+
+        self.daily_pnl = equity / self.session_open - 1.0 if self.session_open > 0 else 0.0
+        self.worst_daily_pnl = min(self.worst_daily_pnl, self.daily_pnl)
+        if not self.breached and self.daily_pnl < -abs(self.max_daily_loss):
+            self.breached = True
+            self.breach_count += 1
+        return self.enabled
+
+    def to_state(self) -> dict[str, object]:
+        return asdict(self)
+
+    @classmethod
+    def from_state(cls, state: dict[str, object]) -> DailyLossGuard:
+        return cls(**state)
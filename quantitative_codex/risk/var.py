@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import math
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from .covariance import CovarianceModel
+
+
+def _as_weight_matrix(weights: pd.DataFrame | pd.Series | np.ndarray, columns: pd.Index | None) -> tuple[np.ndarray, pd.Index]:
+    if isinstance(weights, pd.Series):
+        weights = weights.to_frame().T
+    if isinstance(weights, pd.DataFrame):
+        aligned = weights if columns is None else weights.reindex(columns=columns)
+        return aligned.fillna(0.0).to_numpy(dtype=float), weights.index
+    w = np.atleast_2d(np.asarray(weights, dtype=float))
+    return w, pd.RangeIndex(len(w))
+
+
+def _tail_size(n_scenarios: int, alpha: float) -> int:
+    return min(max(1, math.ceil((1.0 - alpha) * n_scenarios - 1e-9)), n_scenarios)
+
+
+def _tail_var_es(losses: np.ndarray, alpha: float) -> tuple[np.ndarray, np.ndarray]:
+    """VaR/ES along axis 0 of a (scenarios x portfolios) loss matrix via a partial sort."""
+    n = losses.shape[0]
+    k = _tail_size(n, alpha)
+    tail = np.partition(losses, n - k, axis=0)[n - k :]
+    return tail.min(axis=0), tail.mean(axis=0)
+
+
+def historical_var_es(
+    weights: pd.DataFrame | pd.Series | np.ndarray,
+    scenarios: pd.DataFrame | np.ndarray,
+    alpha: float = 0.99,
+) -> pd.DataFrame:
+    """Historical VaR and expected shortfall for many portfolios at once.
+
+    weights: (portfolios x assets); scenarios: (scenarios x assets) returns. Losses are
+    ``-(scenarios @ weights.T)``; VaR is the k-th worst loss with ``k = ceil((1 - alpha) * T)``
+    and ES is the mean of the k worst losses. Values are positive fractions of capital.
+    """
+    columns = scenarios.columns if isinstance(scenarios, pd.DataFrame) else None
+    w, labels = _as_weight_matrix(weights, columns)
+    r = np.nan_to_num(np.asarray(scenarios, dtype=float))
+    if r.shape[0] == 0:
+        return pd.DataFrame({"var": np.nan, "es": np.nan}, index=labels)
+
+    var, es = _tail_var_es(-(r @ w.T), alpha)
+    return pd.DataFrame({"var": var, "es": es}, index=labels)
+
+
+def parametric_var_es(
+    weights: pd.DataFrame | pd.Series,
+    cov: pd.DataFrame | CovarianceModel,
+    expected_returns: pd.Series | None = None,
+    alpha: float = 0.99,
+) -> pd.DataFrame:
+    """Gaussian VaR and expected shortfall from a covariance frame or covariance model."""
+    assets = cov.columns if isinstance(cov, pd.DataFrame) else cov.symbols
+    w, labels = _as_weight_matrix(weights, assets)
+    if isinstance(cov, pd.DataFrame):
+        sw = cov.to_numpy(dtype=float) @ w.T
+    else:
+        sw = cov.matvec(w.T)
+    sigma = np.sqrt(np.clip((w.T * sw).sum(axis=0), 0.0, None))
+    mean = np.zeros(len(w)) if expected_returns is None else w @ expected_returns.reindex(assets).fillna(0.0).to_numpy(dtype=float)
+
+    dist = NormalDist()
+    z = dist.inv_cdf(alpha)
+    return pd.DataFrame(
+        {"var": z * sigma - mean, "es": sigma * dist.pdf(z) / (1.0 - alpha) - mean},
+        index=labels,
+    )
+
+
+class RollingHistoricalVaR:
+    """Rolling-window historical VaR/ES for a fixed set of candidate portfolios.
+
+    Each new return row costs one (portfolios x assets) product; the per-portfolio PnL is
+    kept in a ring buffer so the window is never re-multiplied.
+    """
+
+    def __init__(self, weights: pd.DataFrame, window: int = 250, alpha: float = 0.99) -> None:
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.assets = weights.columns
+        self.labels = weights.index
+        self.window = window
+        self.alpha = alpha
+        self._weights = weights.fillna(0.0).to_numpy(dtype=float)
+        self._pnl = np.zeros((window, len(weights)))
+        self._pos = 0
+        self.n_obs = 0
+
+    def update(self, returns_row: pd.Series | np.ndarray) -> None:
+        if isinstance(returns_row, pd.Series):
+            r = returns_row.reindex(self.assets).to_numpy(dtype=float)
+        else:
+            r = np.asarray(returns_row, dtype=float)
+        self._pnl[self._pos] = self._weights @ np.nan_to_num(r)
+        self._pos = (self._pos + 1) % self.window
+        self.n_obs += 1
+
+    def update_many(self, returns: pd.DataFrame) -> pd.DataFrame:
+        """Feed rows in order and return the VaR per portfolio after each row."""
+        r = np.nan_to_num(returns.reindex(columns=self.assets).to_numpy(dtype=float))
+        pnl = r @ self._weights.T
+        out = np.empty_like(pnl)
+        for i, row in enumerate(pnl):
+            self._pnl[self._pos] = row
+            self._pos = (self._pos + 1) % self.window
+            self.n_obs += 1
+            out[i] = _tail_var_es(-self._pnl[: min(self.n_obs, self.window)], self.alpha)[0]
+        return pd.DataFrame(out, index=returns.index, columns=self.labels)
+
+    def value(self) -> pd.DataFrame:
+        filled = min(self.n_obs, self.window)
+        if filled == 0:
+            return pd.DataFrame({"var": np.nan, "es": np.nan}, index=self.labels)
+        var, es = _tail_var_es(-self._pnl[:filled], self.alpha)
+        return pd.DataFrame({"var": var, "es": es}, index=self.labels)
+
+
+def screen_var_limits(
+    candidate_weights: pd.DataFrame,
+    returns: pd.DataFrame,
+    var_limit: float,
+    window: int = 250,
+    alpha: float = 0.99,
+) -> pd.DataFrame:
+    """Check each rebalance's candidate weights against a historical VaR limit.
+
+    candidate_weights: (rebalance dates x assets), e.g. from ``optimize_weights_panel``.
+    Each date is scored on the ``window`` return rows strictly before it.
+    """
+    r = np.nan_to_num(returns.reindex(columns=candidate_weights.columns).to_numpy(dtype=float))
+    w = candidate_weights.fillna(0.0).to_numpy(dtype=float)
+    ends = returns.index.searchsorted(candidate_weights.index, side="left")
+
+    var = np.full(len(w), np.nan)
+    es = np.full(len(w), np.nan)
+    for i, end in enumerate(ends):
+        start = max(0, end - window)
+        if end - start == 0:
+            continue
+        v, e = _tail_var_es(-(r[start:end] @ w[i])[:, None], alpha)
+        var[i], es[i] = v[0], e[0]
+
+    out = pd.DataFrame({"var": var, "es": es}, index=candidate_weights.index)
+    out["breach"] = out["var"] > var_limit
+    return out
@@ -1,7 +1,30 @@
+import asyncio
+import dataclasses
+import json
+
 import pandas as pd
+import pytest
 
-from quantitative_codex.execution.brokers.paper import PaperBrokerAdapter
-from quantitative_codex.execution.oms import OMS
+from quantitative_codex.execution import (
+    AsyncOMS,
+    ExecutionReport,
+    OMSJournal,
+    Order,
+    OrderEventLog,
+    OrderSide,
+    OrderStatus,
+    OrderType,
+    PreTradeLimits,
+    ParentOrder,
+    ParentOrderScheduler,
+    PreTradeRiskGate,
+    SliceStrategy,
+    simulate_schedule,
+)
+from quantitative_codex.execution.brokers import AsyncBrokerAdapter, BrokerAdapter, MockBrokerClient, MockBrokerServer
+from quantitative_codex.execution.brokers.paper import LiquidityModel, PaperBrokerAdapter
+from quantitative_codex.execution.oms import OMS, PositionBook
+from quantitative_codex.monitoring import evaluate_alerts
 
 
 def test_oms_submits_and_updates_positions_from_paper_fills():
@@ -20,3 +43,522 @@ def test_oms_submits_and_updates_positions_from_paper_fills():
     pos = oms.positions.snapshot()
     assert pos["AAPL"] == 10.0
     assert pos["MSFT"] == 5.0
+
+
+def test_pretrade_gate_rejects_orders_inside_submit():
+    broker = PaperBrokerAdapter()
+    gate = PreTradeRiskGate(
+        PreTradeLimits(
+            max_order_notional=5_000,
+            max_position_qty=40,
+            max_gross_exposure=7_000,
+            restricted_symbols={"GME"},
+            max_orders_per_window=2,
+            throttle_window_seconds=60,
+        ),
+        reference_prices={"AAPL": 100.0, "MSFT": 200.0, "GME": 20.0, "TSLA": 250.0},
+    )
+    oms = OMS(broker, risk_gate=gate)
+
+    reports = oms.submit_orders(
+        [
+            Order("GME", 1, OrderSide.BUY),
+            Order("AAPL", 60, OrderSide.BUY),
+            Order("AAPL", 30, OrderSide.BUY),
+            Order("AAPL", 20, OrderSide.BUY),
+            Order("MSFT", 24, OrderSide.BUY),
+            Order("TSLA", 1, OrderSide.BUY),
+            Order("MSFT", 1, OrderSide.SELL),
+        ]
+    )
+    messages = [r.message for r in reports]
+    assert messages == [
+        "restricted_symbol",
+        "order_notional_exceeded",
+        "",
+        "position_limit_exceeded",
+        "gross_exposure_exceeded",
+        "",
+        "order_rate_exceeded",
+    ]
+    assert [r.status for r in reports].count(OrderStatus.REJECTED) == 5
+    assert oms.order_log.event_counts["reject"] == 5
+
+
+def test_pretrade_gate_does_not_count_unpriced_positions_as_flat():
+    gate = PreTradeRiskGate(PreTradeLimits(max_gross_exposure=10_000), reference_prices={"AAPL": 100.0})
+    orders = [Order("AAPL", 10, OrderSide.BUY), Order("OLD", 5, OrderSide.SELL), Order("AAPL", 1, OrderSide.SELL)]
+    assert gate.check_orders(orders, {"AAPL": 0.0}, {}) == [None, "no_reference_price", None]
+    # a held symbol without a price makes gross exposure unknown: only reductions pass
+    assert gate.check_orders(orders, {"AAPL": 50.0, "OLD": 5.0}, {}) == ["unpriced_position", "no_reference_price", None]
+    gate.update_prices({"OLD": 1_000.0})
+    assert gate.check_orders(orders[:1], {"AAPL": 50.0, "OLD": 5.0}, {}) == ["gross_exposure_exceeded"]
+
+
+def test_order_event_log_keeps_bounded_window_and_spills_batches(tmp_path):
+    spill = tmp_path / "orders.bin"
+    log = OrderEventLog(capacity=4, spill_path=spill, spill_batch=2)
+    oms = OMS(PaperBrokerAdapter(), order_log=log)
+    oms.submit_orders([Order(symbol="AAPL", qty=1.0, side=OrderSide.BUY) for _ in range(3)])
+    oms.submit_orders([Order(symbol="MSFT", qty=2.0, side=OrderSide.SELL, order_type=OrderType.LIMIT)])
+    oms.broker.process_market_data("AAPL", 100.0)
+    oms.sync()
+
+    assert log.total_events == 7
+    assert len(log) == 4
+    assert log.event_counts == {"submit": 4, "status": 3}
+    assert log.status_counts == {"submitted": 4, "filled": 3}
+
+    frame = log.to_frame()
+    assert list(frame["event"]) == ["submit", "status", "status", "status"]
+    assert frame["ts"].is_monotonic_increasing
+
+    log.flush()
+    spilled = OrderEventLog.read_spill(spill)
+    assert len(spilled) == 7
+    assert list(spilled["symbol"]) == ["AAPL", "AAPL", "AAPL", "MSFT", "AAPL", "AAPL", "AAPL"]
+    assert spilled["qty"].tolist() == [1.0, 1.0, 1.0, 2.0, 1.0, 1.0, 1.0]
+
+    log.append("reject", "r-1", "GME", 5.0, "buy", "rejected")
+    alerts = evaluate_alerts(pd.Series(dtype=float), pd.Series(dtype=float), log, pd.Series(dtype=float))
+    assert [a.code for a in alerts] == ["REJECT_RATIO"]
+
+
+def test_order_event_log_prunes_order_ids_outside_the_window(tmp_path):
+    spill = tmp_path / "orders.bin"
+    log = OrderEventLog(capacity=4, spill_path=spill, spill_batch=4)
+    for i in range(40):
+        log.append("submit", f"o{i % 20}", "AAPL", 1.0, "buy", "submitted")
+    log.flush()
+
+    assert len(log._interners["order_id"]) <= 2 * log.capacity
+    frame = log.to_frame()
+    assert list(frame["order_id"]) == ["o16", "o17", "o18", "o19"]
+    assert list(frame["order_id"].cat.categories) == ["o16", "o17", "o18", "o19"]
+    # ids that were pruned and came back are decoded to the same category
+    spilled = OrderEventLog.read_spill(spill)
+    assert list(spilled["order_id"]) == [f"o{i % 20}" for i in range(40)]
+    assert len(spilled["order_id"].cat.categories) == 20
+
+
+def test_position_book_slots_vectorized_fills_and_cached_sort():
+    book = PositionBook({"MSFT": 5.0})
+    book.apply_fills(["AAPL", "MSFT", "AAPL"], [10.0, 2.0, 3.0], [OrderSide.BUY, OrderSide.SELL, OrderSide.SELL])
+    book.apply_fill("ZM", 1.0, OrderSide.BUY)
+    assert book.slot("MSFT") == 0
+    assert book.snapshot().to_dict() == {"AAPL": 7.0, "MSFT": 3.0, "ZM": 1.0}
+    assert dict(book.quantities) == {"MSFT": 3.0, "AAPL": 7.0, "ZM": 1.0}
+
+    sorted_index = book.snapshot().index
+    book.apply_fills(["ZM", "AAPL"], [-1.0, 1.0])
+    assert book.snapshot().index is sorted_index
+    assert book.reindex(["ZM", "TSLA", "AAPL"]).tolist() == [0.0, 0.0, 8.0]
+
+    order = Order(symbol="AAPL", qty=1.0, side=OrderSide.BUY)
+    assert not hasattr(order, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        order.qty = 2.0
+
+
+def test_position_book_cost_basis_and_mark_to_market():
+    book = PositionBook()
+    book.apply_fill("AAPL", 10.0, OrderSide.BUY, 100.0)
+    book.apply_fill("AAPL", 10.0, OrderSide.BUY, 110.0)
+    book.apply_fill("AAPL", 5.0, OrderSide.SELL, 120.0)
+    book.apply_fills(["MSFT", "MSFT"], [4.0, -6.0], prices=[50.0, 40.0])
+
+    ledger = book.ledger()
+    assert ledger.loc["AAPL", "avg_cost"] == 105.0
+    assert ledger.loc["AAPL", "realized_pnl"] == 75.0
+    assert ledger.loc["MSFT", "qty"] == -2.0
+    assert ledger.loc["MSFT", "avg_cost"] == 40.0
+    assert ledger.loc["MSFT", "realized_pnl"] == -40.0
+
+    prices = pd.Series({"AAPL": 100.0, "MSFT": 45.0})
+    assert book.mark_to_market(prices, timestamp=pd.Timestamp("2024-01-02")) == 35.0 - 75.0 - 10.0
+    assert book.mark_to_market(prices * 1.1, timestamp=pd.Timestamp("2024-01-03")) == pytest.approx(35.0 + 75.0 - 19.0)
+    equity = book.equity_series(10_000.0)
+    assert equity.index.tolist() == [pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-03")]
+    assert equity.iloc[0] == 9_950.0
+
+    broker = PaperBrokerAdapter(liquidity_model=LiquidityModel(participation_rate=0.5, impact_coefficient_bps=0.0))
+    oms = OMS(broker)
+    oms.submit_orders([Order(symbol="AAPL", qty=10.0, side=OrderSide.BUY)])
+    broker.process_market_data("AAPL", 100.0, volume=10.0)
+    broker.process_market_data("AAPL", 110.0, volume=10.0)
+    oms.sync()
+    assert oms.positions.ledger().loc["AAPL", "avg_cost"] == pytest.approx(105.0)
+
+
+def test_parent_order_scheduler_slices_twap_vwap_and_pov_in_simulated_time():
+    broker = PaperBrokerAdapter()
+    oms = OMS(broker)
+    scheduler = ParentOrderScheduler(oms)
+    twap = scheduler.schedule_target(pd.Series({"AAPL": 100.0}), start=0, end=4, n_slices=4)[0]
+    vwap = scheduler.add_parent(
+        ParentOrder("MSFT", 60.0, OrderSide.SELL, start=1, end=4, strategy=SliceStrategy.VWAP, n_slices=3, volume_profile=[3, 2, 1])
+    )
+    pov = scheduler.add_parent(
+        ParentOrder("TSLA", 1_000.0, OrderSide.BUY, start=1, end=4, strategy=SliceStrategy.POV, n_slices=3, participation_rate=0.1)
+    )
+
+    times = pd.Index([0.0, 1.0, 2.0, 3.0, 4.0])
+    prices = pd.DataFrame({"AAPL": 100.0, "MSFT": 200.0, "TSLA": 250.0}, index=times)
+    volumes = pd.DataFrame({"AAPL": 1e6, "MSFT": 1e6, "TSLA": 500.0}, index=times)
+    progress = simulate_schedule(scheduler, broker, prices, volumes)
+
+    assert progress.loc[twap, "children"] == 4
+    assert progress.loc[twap, "filled_qty"] == 100.0
+    assert [s.order.qty for s in broker._orders.values() if s.order.symbol == "MSFT"] == [30.0, 20.0, 10.0]
+    # POV sees 500 shares per bar from t=0 and takes 10% at each of its three slices
+    assert progress.loc[pov, "filled_qty"] == 150.0
+    assert not progress["active"].any()
+    assert oms.positions.quantities == {"AAPL": 100.0, "MSFT": -60.0, "TSLA": 150.0}
+    assert scheduler.next_due() is None
+
+
+def test_scheduler_ids_stay_unique_and_rejected_children_are_rolled_back():
+    broker = PaperBrokerAdapter()
+    oms = OMS(broker)
+    for _ in range(2):  # e.g. a restarted scheduler on the same OMS, same parent id
+        scheduler = ParentOrderScheduler(oms)
+        scheduler.add_parent(ParentOrder("AAPL", 10.0, OrderSide.BUY, start=0, end=0, n_slices=1, parent_id="p1"))
+        simulate_schedule(scheduler, broker, pd.DataFrame({"AAPL": [100.0]}, index=[0.0]))
+    assert oms.positions.quantities == {"AAPL": 20.0}
+
+    dup = oms.submit_orders([Order("MSFT", 1.0, OrderSide.BUY, client_order_id="x"), Order("MSFT", 1.0, OrderSide.BUY, client_order_id="x")])
+    assert [r.status for r in dup] == [OrderStatus.SUBMITTED, OrderStatus.REJECTED]
+    assert dup[1].message == "duplicate_client_order_id"
+
+    gate = PreTradeRiskGate(PreTradeLimits(symbol_position_limits={"TSLA": 60.0}))
+    oms = OMS(PaperBrokerAdapter(), risk_gate=gate)
+    scheduler = ParentOrderScheduler(oms)
+    parent = scheduler.add_parent(ParentOrder("TSLA", 100.0, OrderSide.BUY, start=0, end=4, n_slices=4))
+    for now in range(4):
+        scheduler.run_due(float(now))
+    progress = scheduler.progress().loc[parent]
+    # slices 2 and 3 would breach the limit; their quantity is not counted as sent
+    assert progress["sent_qty"] == 50.0
+    assert progress["rejected_children"] == 2
+    assert progress["active"] and scheduler.next_due() == 4.0
+
+    # the final slice was rejected: the parent is retried, then explicitly failed
+    for now in range(4, 4 + scheduler.max_retries + 1):
+        scheduler.run_due(float(now))
+    progress = scheduler.progress().loc[parent]
+    assert progress["rejected_children"] == 2 + scheduler.max_retries
+    assert progress["failed"] and not progress["active"]
+    assert scheduler.next_due() is None
+
+
+def test_scheduler_retries_a_throttled_final_slice():
+    clock = [0.0]
+    gate = PreTradeRiskGate(PreTradeLimits(max_orders_per_window=1, throttle_window_seconds=10), clock=lambda: clock[0])
+    oms = OMS(PaperBrokerAdapter(), risk_gate=gate)
+    scheduler = ParentOrderScheduler(oms)
+    parent = scheduler.add_parent(ParentOrder("AAPL", 10.0, OrderSide.BUY, start=0, end=2, n_slices=2))
+    oms.submit_orders([Order("MSFT", 1.0, OrderSide.BUY)])  # uses up the window
+
+    scheduler.run_due(0.0)
+    scheduler.run_due(1.0)
+    progress = scheduler.progress().loc[parent]
+    assert progress["sent_qty"] == 0.0 and progress["rejected_children"] == 2
+    assert progress["active"] and scheduler.next_due() == 2.0
+
+    clock[0] = 10.0
+    (report,) = scheduler.run_due(2.0)
+    assert report.status == OrderStatus.SUBMITTED and report.message == ""
+    progress = scheduler.progress().loc[parent]
+    assert progress["sent_qty"] == 10.0
+    assert not progress["active"] and not progress["failed"]
+
+
+def test_oms_forgets_closed_fill_state_but_keeps_duplicate_ids_across_recovery(tmp_path):
+    broker = PaperBrokerAdapter()
+    oms = OMS(broker, journal=OMSJournal(tmp_path, snapshot_every=4))
+    oms.submit_orders([Order("AAPL", 1.0, OrderSide.BUY, client_order_id=f"c{i}") for i in (1, 2)])
+    broker.process_market_data("AAPL", 100.0)
+    oms.sync()  # 6 records: c1 and c2 end up in the snapshot
+    oms.submit_orders([Order("AAPL", 2.0, OrderSide.BUY, client_order_id="c3")])
+    broker.process_market_data("AAPL", 100.0)
+    oms.sync()  # c3 only in the journal tail
+    assert oms._applied_fills == {}
+    assert oms.filled_qty("c3") == 2.0
+    oms.journal.close()
+
+    recovered = OMS(PaperBrokerAdapter(), journal=OMSJournal(tmp_path, snapshot_every=4))
+    assert recovered.filled_qty("c1") == 1.0 and recovered.filled_qty("c3") == 2.0
+    reports = recovered.submit_orders([Order("AAPL", 1.0, OrderSide.BUY, client_order_id=f"c{i}") for i in (1, 3, 4)])
+    assert [r.message for r in reports] == ["duplicate_client_order_id", "duplicate_client_order_id", ""]
+
+
+def test_oms_recovers_from_snapshot_and_journal_tail(tmp_path):
+    broker = PaperBrokerAdapter(liquidity_model=LiquidityModel(participation_rate=0.5, impact_coefficient_bps=0.0))
+    oms = OMS(broker, journal=OMSJournal(tmp_path, snapshot_every=4))
+    oms.submit_orders([Order(symbol="AAPL", qty=10.0, side=OrderSide.BUY), Order(symbol="MSFT", qty=4.0, side=OrderSide.SELL)])
+    broker.process_market_data("AAPL", 100.0, volume=10.0)
+    broker.process_market_data("MSFT", 200.0, volume=100.0)
+    oms.sync()
+    # 2 submits + 2 fills + 1 close crossed snapshot_every: old segments are compacted away
+    assert (tmp_path / "snapshot.json").exists()
+    assert not list(tmp_path.glob("journal-*.log"))
+
+    oms.submit_orders([Order(symbol="TSLA", qty=3.0, side=OrderSide.BUY)])
+    broker.process_market_data("AAPL", 100.0, volume=4.0)
+    oms.sync()
+    oms.journal.close()
+    with open(next(tmp_path.glob("journal-*.log")), "a", encoding="utf-8") as fh:
+        fh.write('{"seq":99,"op":"fi')
+
+    recovered = OMS(broker, journal=OMSJournal(tmp_path, snapshot_every=4))
+    assert recovered.positions.quantities == oms.positions.quantities == {"AAPL": 7.0, "MSFT": -4.0}
+    assert set(recovered._open_orders) == set(oms._open_orders)
+    assert recovered._working_qty == oms._working_qty == {"AAPL": 3.0, "TSLA": 3.0}
+    pd.testing.assert_frame_equal(recovered.positions.ledger(), oms.positions.ledger())
+
+
+def test_journal_truncates_torn_segment_head_before_new_commits(tmp_path):
+    journal = OMSJournal(tmp_path, fsync=False)
+    journal.record_submit("a", Order(symbol="AAPL", qty=1.0, side=OrderSide.BUY))
+    journal.close()
+    # crash while writing the first record of the next segment
+    (tmp_path / "journal-000000000002.log").write_text('{"seq":2,"op":"sub', encoding="utf-8")
+
+    restarted = OMSJournal(tmp_path, fsync=False)
+    assert set(restarted.recovered.open_orders) == {"a"}
+    restarted.record_submit("b", Order(symbol="MSFT", qty=2.0, side=OrderSide.BUY))
+    restarted.record_submit("c", Order(symbol="TSLA", qty=3.0, side=OrderSide.SELL))
+    restarted.close()
+
+    recovered = OMSJournal(tmp_path, fsync=False).recovered
+    assert set(recovered.open_orders) == {"a", "b", "c"}
+    assert recovered.seq == 3
+
+
+def test_paper_broker_indexes_open_orders_and_replays_tick_batches():
+    broker = PaperBrokerAdapter()
+    buy = broker.submit_order(Order("AAPL", 5, OrderSide.BUY, order_type=OrderType.LIMIT, limit_price=99.0))
+    sell = broker.submit_order(Order("AAPL", 3, OrderSide.SELL, order_type=OrderType.LIMIT, limit_price=105.0))
+    mkt = broker.submit_order(Order("MSFT", 2, OrderSide.BUY))
+    broker.cancel_order(mkt.order_id)
+
+    updates = broker.process_market_data_many(
+        [("MSFT", 400.0, None), ("AAPL", 100.0, None), ("AAPL", 98.5, None), ("AAPL", 106.0, None), ("AAPL", 90.0, None)]
+    )
+    assert [u.order_id for u in updates] == [buy.order_id, sell.order_id]
+    assert broker.get_order(buy.order_id).avg_fill_price == 98.5
+    assert broker.get_order(mkt.order_id).status == OrderStatus.CANCELED
+    assert broker._open_by_symbol == {}
+    assert len(broker.fills) == 2
+
+
+def test_paper_broker_partial_fills_capped_by_bar_volume():
+    broker = PaperBrokerAdapter(LiquidityModel(participation_rate=0.1, impact_coefficient_bps=20.0))
+    oms = OMS(broker)
+    oms.submit_orders([Order("AAPL", 150, OrderSide.BUY), Order("AAPL", 50, OrderSide.BUY)])
+    first, second = list(oms._open_orders)
+
+    broker.process_bars(pd.Series({"AAPL": 100.0, "MSFT": 400.0}), pd.Series({"AAPL": 1_000.0, "MSFT": 5e6}))
+    oms.sync()
+    assert broker.get_order(first).status == OrderStatus.PARTIALLY_FILLED
+    assert broker.get_order(first).filled_qty == 100.0
+    assert broker.get_order(second).filled_qty == 0.0
+    assert broker.get_order(first).avg_fill_price > 100.0
+
+    broker.process_bars(pd.Series({"AAPL": 100.0}), pd.Series({"AAPL": 1_000.0}))
+    broker.process_bars(pd.Series({"AAPL": 100.0}), pd.Series({"AAPL": 1_000.0}))
+    oms.sync()
+    assert broker.get_order(first).status == OrderStatus.FILLED
+    assert broker.get_order(second).status == OrderStatus.FILLED
+    assert oms.positions.snapshot()["AAPL"] == 200.0
+
+
+class _PollingBroker(PaperBrokerAdapter):
+    supports_streaming = False
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batch_calls = 0
+
+    def get_orders(self, order_ids):
+        self.batch_calls += 1
+        return super().get_orders(order_ids)
+
+
+def test_oms_applies_pushed_reports_and_falls_back_to_batch_polling():
+    broker = PaperBrokerAdapter()
+    oms = OMS(broker)
+    oms.submit_orders(oms.generate_orders_from_target(pd.Series({"AAPL": 10.0, "MSFT": 5.0, "NVDA": 1.0})))
+    broker.process_market_data("AAPL", 100.0)
+
+    applied = oms.sync()
+    assert [r.status for r in applied] == [OrderStatus.FILLED]
+    assert oms.sync() == []
+    assert len(oms._open_orders) == 2
+
+    polling = _PollingBroker()
+    polled = OMS(polling)
+    polled.submit_orders(polled.generate_orders_from_target(pd.Series({"AAPL": 10.0})))
+    polling.process_market_data("AAPL", 100.0)
+    polled.sync()
+    assert polling.batch_calls == 1
+    assert polled.positions.snapshot()["AAPL"] == 10.0
+
+
+class _SlottedStreamingBroker(BrokerAdapter):
+    __slots__ = ("_report_listeners", "reports")
+    supports_streaming = True
+
+    def __init__(self) -> None:
+        self.reports = {}
+
+    def submit_order(self, order):
+        report = ExecutionReport(order.client_order_id, OrderStatus.SUBMITTED, 0.0, None)
+        self.reports[report.order_id] = report
+        return report
+
+    def cancel_order(self, order_id):
+        return self.get_order(order_id)
+
+    def get_order(self, order_id):
+        return self.reports[order_id]
+
+    def fill(self, order_id, qty, price):
+        self._publish(ExecutionReport(order_id, OrderStatus.FILLED, qty, price))
+
+
+def test_streaming_subscription_works_on_slotted_adapters():
+    broker = _SlottedStreamingBroker()
+    oms = OMS(broker)
+    assert broker._report_listeners == [oms.on_execution_report]
+    oms.submit_orders([Order("AAPL", 3.0, OrderSide.BUY, client_order_id="s1")])
+    broker.fill("s1", 3.0, 10.0)
+    oms.sync()
+    assert oms.positions.snapshot()["AAPL"] == 3.0
+    broker.unsubscribe(oms.on_execution_report)
+    assert broker._report_listeners == []
+
+
+def test_async_oms_round_trip_through_mock_broker_server():
+    async def scenario():
+        async with MockBrokerServer(latency=0.001) as server:
+            client = MockBrokerClient(server.host, server.port, pool_size=4)
+            oms = AsyncOMS(client, max_concurrency=4)
+            orders = [Order(f"S{i}", 1.0 + i, OrderSide.BUY) for i in range(20)]
+            reports = await oms.submit_orders_async(orders)
+            for i in range(10):
+                await client.send_tick(f"S{i}", 10.0)
+            await oms.sync_async()
+            canceled = await oms.cancel_orders_async([r.order_id for r in reports[10:]])
+            await client.close()
+            return oms, reports, canceled
+
+    oms, reports, canceled = asyncio.run(scenario())
+    assert all(r.status == OrderStatus.SUBMITTED for r in reports)
+    assert len({r.order_id for r in reports}) == 20
+    assert oms.positions.snapshot().sum() == sum(1.0 + i for i in range(10))
+    assert all(r.status == OrderStatus.CANCELED for r in canceled)
+    assert oms._open_orders == {}
+
+
+class _FlakyAsyncBroker(AsyncBrokerAdapter):
+    def __init__(self) -> None:
+        self.paper = PaperBrokerAdapter()
+        self.attempts = 0
+
+    async def submit_order(self, order):
+        self.attempts += 1
+        if self.attempts == 1:
+            await asyncio.sleep(1.0)
+        return self.paper.submit_order(order)
+
+    async def cancel_order(self, order_id):
+        return self.paper.cancel_order(order_id)
+
+    async def get_order(self, order_id):
+        return self.paper.get_order(order_id)
+
+
+def test_async_oms_retries_timed_out_submits():
+    broker = _FlakyAsyncBroker()
+    oms = AsyncOMS(broker, timeout=0.05, retries=1, retry_backoff=0.0)
+    (report,) = asyncio.run(oms.submit_orders_async([Order("AAPL", 1.0, OrderSide.BUY)]))
+    assert broker.attempts == 2
+    assert report.status == OrderStatus.SUBMITTED
+    assert report.order_id.startswith("oms-")
+
+
+class _UnconfirmedAsyncBroker(_FlakyAsyncBroker):
+    """Accepts the first order but never answers the submit in time."""
+
+    async def submit_order(self, order):
+        self.attempts += 1
+        if self.attempts == 1:
+            self.paper.submit_order(order)
+        await asyncio.sleep(1.0)
+
+
+def test_async_oms_rejects_duplicate_client_order_ids():
+    broker = _FlakyAsyncBroker()
+    broker.attempts = 1  # no slow first attempt
+    oms = AsyncOMS(broker)
+
+    async def scenario():
+        first = await oms.submit_orders_async(
+            [Order("AAPL", 1.0, OrderSide.BUY, client_order_id="d1"), Order("AAPL", 2.0, OrderSide.BUY, client_order_id="d1")]
+        )
+        broker.paper.process_market_data("AAPL", 100.0)
+        await oms.sync_async()
+        second = await oms.submit_orders_async([Order("AAPL", 5.0, OrderSide.BUY, client_order_id="d1")])
+        return first, second
+
+    first, (again,) = asyncio.run(scenario())
+    assert [r.status for r in first] == [OrderStatus.SUBMITTED, OrderStatus.REJECTED]
+    assert first[1].message == again.message == "duplicate_client_order_id"
+    assert again.status == OrderStatus.REJECTED
+    assert oms.positions.quantities == {"AAPL": 1.0}
+    assert oms._working_qty == {}
+
+
+def test_async_oms_keeps_unconfirmed_submits_open_and_reconciles_them():
+    broker = _UnconfirmedAsyncBroker()
+    oms = AsyncOMS(broker, timeout=0.01, retries=1, retry_backoff=0.0)
+    orders = [Order("AAPL", 1.0, OrderSide.BUY), Order("MSFT", 2.0, OrderSide.BUY)]
+
+    async def scenario():
+        reports = await oms.submit_orders_async(orders)
+        assert set(oms._open_orders) == {r.order_id for r in reports}
+        broker.paper.process_market_data("AAPL", 100.0)
+        return reports, await oms.sync_async()
+
+    reports, updates = asyncio.run(scenario())
+    assert [r.status for r in reports] == [OrderStatus.UNKNOWN, OrderStatus.UNKNOWN]
+    assert reports[0].message.startswith("submit_unconfirmed")
+    assert reports[0].order_id != reports[1].order_id
+    # the first order did reach the broker and filled; the second was never seen
+    assert [u.status for u in updates] == [OrderStatus.FILLED, OrderStatus.REJECTED]
+    assert oms.positions.snapshot().to_dict() == {"AAPL": 1.0}
+    assert oms._open_orders == {}
+    with pytest.raises(TypeError):
+        oms.submit_orders(orders)
+    with pytest.raises(TypeError):
+        oms.sync()
+
+
+def test_mock_broker_server_survives_malformed_requests():
+    async def scenario():
+        async with MockBrokerServer() as server:
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            writer.write(b'{not json\n[1, 2]\n')
+            writer.write(b'{"id": 5, "op": "submit", "order": {"symbol": "A", "qty": null, "side": "buy"}}\n')
+            writer.write(b'{"id": 6, "op": "submit", "order": [1]}\n')
+            writer.write(b'{"id": 7, "op": "get", "order_id": "x"}\n')
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in range(5)]
+            writer.close()
+            return responses
+
+    *errors, answer = asyncio.run(scenario())
+    assert [e["id"] for e in errors] == [None, None, 5, 6]
+    assert all("error" in e for e in errors)
+    assert answer["id"] == 7 and answer["report"]["message"] == "order_not_found"
@@ -1,11 +1,34 @@
+import asyncio
+import multiprocessing as mp
+
+import numpy as np
 import pandas as pd
+import pytest
 
 from quantitative_codex.execution.brokers.paper import PaperBrokerAdapter
+from quantitative_codex.execution.models import Order, OrderSide, OrderType
 from quantitative_codex.execution.oms import OMS
-from quantitative_codex.live import LiveTradingConfig, SmallCapitalLiveRunner
-from quantitative_codex.monitoring import AlertRuleSet, evaluate_alerts
-from quantitative_codex.parameters import ParameterRegistry
-from quantitative_codex.review import build_postmortem_report
+from quantitative_codex.live import (
+    DaemonConfig,
+    LiveTradingConfig,
+    LiveTradingDaemon,
+    MultiAccountRunner,
+    SimulatedClock,
+    SmallCapitalLiveRunner,
+    iter_frame_bars,
+)
+from quantitative_codex.monitoring import (
+    AlertRuleSet,
+    EquityTick,
+    OrderStatusUpdate,
+    PnLUpdate,
+    PositionUpdate,
+    StreamingAlertEngine,
+    default_streaming_rules,
+    evaluate_alerts,
+)
+from quantitative_codex.parameters import IndexedParameterRegistry, ParameterRegistry
+from quantitative_codex.review import build_postmortem_report, build_round_trips, postmortem_from_fills
 
 
 def test_small_capital_runner_generates_budgeted_targets():
@@ -23,6 +46,146 @@ def test_small_capital_runner_generates_budgeted_targets():
     assert abs(float(budgeted["AAPL"])) <= 0.5
 
 
+@pytest.mark.parametrize("n_workers", [0, 2])
+def test_multi_account_runner_matches_per_account_runner(n_workers):
+    rng = np.random.default_rng(3)
+    symbols = ["AAPL", "MSFT", "TSLA", "GME"]
+    accounts = [f"acct{i}" for i in range(5)]
+    prices = pd.Series([190.0, 410.0, np.nan, 20.0], index=symbols)
+    weights = pd.DataFrame(rng.uniform(-0.3, 0.3, size=(5, 4)), index=accounts, columns=symbols)
+    equity = pd.Series([1000.0, 5000.0, 20000.0, 800.0, 3000.0], index=accounts)
+    cfg = LiveTradingConfig(max_notional_per_order=400, max_daily_turnover_ratio=0.1)
+
+    with MultiAccountRunner(accounts, cfg, n_workers=n_workers) as runner:
+        result = runner.rebalance(weights, prices, equity)
+        runner.process_bars(prices)
+        positions = runner.positions(symbols)
+
+    for account in accounts:
+        single = SmallCapitalLiveRunner(OMS(PaperBrokerAdapter()), cfg)
+        expected = single.rebalance(weights.loc[account], prices, equity=equity[account])
+        np.testing.assert_allclose(result.target_shares.loc[account], expected.reindex(symbols))
+    assert (result.target_shares["TSLA"] == 0.0).all()
+    np.testing.assert_allclose(positions.to_numpy(), result.target_shares.to_numpy())
+    assert result.n_orders == int((result.target_shares.abs() > 0).sum().sum())
+    netting = result.netting
+    np.testing.assert_allclose(netting["net_qty"], result.target_shares.sum())
+    assert netting.loc["AAPL", "crossable_qty"] > 0
+
+
+def test_multi_account_runner_stays_in_sync_after_a_shard_error():
+    symbols = ["AAPL", "MSFT"]
+    accounts = [f"acct{i}" for i in range(4)]
+    with MultiAccountRunner(accounts, n_workers=2) as runner:
+        good = np.array([[1.0, 0.0], [0.0, 2.0]])
+        with pytest.raises(RuntimeError, match="shard 0"):
+            runner._call("submit", [(np.zeros((2, 3)), symbols), (good, symbols)])
+        runner.process_bars(pd.Series({"AAPL": 100.0, "MSFT": 200.0}))
+        positions = runner.positions(symbols)
+    np.testing.assert_allclose(positions.to_numpy(), [[0.0, 0.0], [0.0, 0.0], [1.0, 0.0], [0.0, 2.0]])
+
+
+def test_live_daemon_replays_a_month_in_simulated_time():
+    rng = np.random.default_rng(11)
+    symbols = [f"S{i:02d}" for i in range(12)]
+    index = pd.date_range("2024-01-02", periods=42, freq="B") + pd.Timedelta(hours=16)
+    close = pd.DataFrame(50 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, (42, 12)), axis=0)), index=index, columns=symbols)
+    volume = pd.DataFrame(rng.uniform(1e5, 1e6, (42, 12)), index=index, columns=symbols)
+    runner = SmallCapitalLiveRunner(
+        OMS(PaperBrokerAdapter()),
+        LiveTradingConfig(starting_equity=50_000, max_notional_per_order=10_000, max_daily_turnover_ratio=0.5),
+    )
+    seen = []
+
+    async def audit(ctx):
+        seen.append(ctx.target_weights is not None)
+
+    daemon = LiveTradingDaemon(symbols, runner, DaemonConfig(momentum_lookback=20, min_history=21), clock=SimulatedClock())
+    daemon.stages.append(("audit", audit))
+    history = asyncio.run(daemon.run(iter_frame_bars(close, volume)))
+
+    assert len(history) == 42
+    assert daemon.clock.now() == index[-1]
+    assert seen.count(True) == 21 and not any(seen[:21])
+    assert history["n_orders"].iloc[:21].sum() == 0 and history["n_orders"].iloc[21:].sum() > 0
+    assert history["n_breaks"].sum() == 0
+    assert abs(history["equity"].iloc[-1] - 50_000) < 5_000
+    summary = daemon.latency_summary()
+    assert list(summary.index) == ["ingest", "factors", "optimize", "risk", "submit", "sync", "reconcile", "alert", "audit"]
+    assert (summary["count"] == 42).all()
+
+
+def test_streaming_alert_engine_deduplicates_and_cools_down():
+    rules = AlertRuleSet(max_drawdown=0.05, max_daily_loss=0.03, max_reject_ratio=0.25, max_position_abs=1_000.0)
+    engine = StreamingAlertEngine(default_streaming_rules(rules, reject_window=4), cooldown=10.0)
+    fired = []
+    engine.subscribe(fired.append)
+
+    codes = [a.code for a in engine.process_many([EquityTick(0, 100.0), EquityTick(1, 94.0), EquityTick(2, 93.0)])]
+    assert codes == ["MAX_DRAWDOWN"]  # still breached at t=2, deduplicated
+    assert engine.process(EquityTick(3, 99.0)) == []  # recovered, re-armed
+    assert engine.process(EquityTick(4, 90.0)) == []  # inside the cool-down
+    assert [a.code for a in engine.process(EquityTick(12, 90.0))] == ["MAX_DRAWDOWN"]
+
+    statuses = ["submitted", "filled", "rejected", "filled", "filled", "filled", "rejected", "rejected"]
+    orders = [OrderStatusUpdate(20 + 10 * i, f"o{i}", s) for i, s in enumerate(statuses)]
+    codes = [a.code for a in engine.process_many(orders)]
+    assert codes == ["REJECT_RATIO", "REJECT_RATIO"]  # 1 of 2, then cleared at 1 of 4, then 2 of the last 4
+    assert engine.rules[2].ratio == 0.5
+
+    codes = engine.process_many(
+        [PositionUpdate(100, "AAPL", 1_500.0), PositionUpdate(101, "MSFT", -2_000.0), PositionUpdate(102, "AAPL", 1_600.0), PnLUpdate(103, -0.05)]
+    )
+    assert [(a.code, f.key) for a, f in zip(codes, fired[-3:])] == [
+        ("POSITION_LIMIT", "AAPL"),
+        ("POSITION_LIMIT", "MSFT"),
+        ("DAILY_LOSS", None),
+    ]
+    assert engine.rules[3].max_seen == 2_000.0
+    assert {a.code for a in engine.active_alerts} == {"MAX_DRAWDOWN", "REJECT_RATIO", "POSITION_LIMIT", "DAILY_LOSS"}
+
+
+def _add_versions(path, worker, n):
+    reg = IndexedParameterRegistry(path)
+    for i in range(n):
+        reg.add("shared", f"w{worker}-{i}", {"i": i})
+
+
+def test_indexed_parameter_registry_migrates_and_handles_concurrent_writers(tmp_path):
+    legacy = ParameterRegistry(tmp_path / "params.json")
+    legacy.add("trend", "v1", {"fast": 50}, note="init")
+    legacy.add("trend", "v2", {"fast": 40}, note="retune")
+    legacy.add("carry", "v1", {"lookback": 20})
+
+    path = tmp_path / "params.jsonl"
+    reg = IndexedParameterRegistry.migrate_from_json(legacy.path, path)
+    assert reg.latest("trend") == legacy.latest("trend")
+    assert reg.history("trend") == legacy.history("trend")
+    assert reg.strategies() == ["carry", "trend"]
+    with pytest.raises(ValueError):
+        IndexedParameterRegistry.migrate_from_json(legacy.path, path)
+
+    other = IndexedParameterRegistry(path)  # e.g. another process: sees appends via the mtime check
+    other.add("trend", "v3", {"fast": 30})
+    assert reg.latest("trend").version == "v3"
+    with path.open("a") as fh:
+        fh.write('{"strategy": "trend", "vers')  # torn write from a crashed writer
+    assert reg.latest("trend").version == "v3"
+    reg.add("trend", "v4", {"fast": 25})
+    assert [v.version for v in other.history("trend")] == ["v1", "v2", "v3", "v4"]
+
+    ctx = mp.get_context()
+    procs = [ctx.Process(target=_add_versions, args=(path, w, 25)) for w in range(4)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    shared = reg.history("shared")
+    assert len(shared) == 100
+    assert len({v.version for v in shared}) == 100
+    assert len(path.read_text().splitlines()) == 105
+
+
 def test_monitoring_and_postmortem_and_parameter_registry(tmp_path):
     equity = pd.Series([1.0, 0.92, 0.90])
     pnl = pd.Series([0.0, -0.04, -0.01])
@@ -54,3 +217,35 @@ def test_monitoring_and_postmortem_and_parameter_registry(tmp_path):
     report = build_postmortem_report(trades, alerts=[{"code": a.code} for a in alerts])
     assert report["summary"]["total_trades"] == 2
     assert "top_symbols" in report
+
+
+def test_round_trips_fifo_lifo_with_excursions_feed_postmortem():
+    times = pd.date_range("2024-01-01", periods=5)
+    broker = PaperBrokerAdapter()
+    for ts, (side, qty, px) in zip(
+        times,
+        [(OrderSide.BUY, 10, 100.0), (OrderSide.BUY, 5, 102.0), (OrderSide.SELL, 20, 105.0), (OrderSide.BUY, 5, 99.0)],
+    ):
+        broker.submit_order(Order(symbol="AAPL", qty=qty, side=side, order_type=OrderType.MARKET))
+        broker.process_bars(pd.Series({"AAPL": px}), timestamp=ts.to_pydatetime())
+
+    fifo = build_round_trips(broker.fills)
+    assert fifo[["direction", "qty", "entry_price", "exit_price", "pnl"]].values.tolist() == [
+        ["long", 10.0, 100.0, 105.0, 50.0],
+        ["long", 5.0, 102.0, 105.0, 15.0],
+        ["short", 5.0, 105.0, 99.0, 30.0],  # the sell flipped the position short
+    ]
+    lifo = build_round_trips(broker.fills, method="lifo")
+    assert lifo["entry_price"].tolist() == [102.0, 100.0, 105.0]
+    assert lifo["pnl"].sum() == fifo["pnl"].sum()
+
+    bars = pd.DataFrame({"AAPL": [100.0, 97.0, 108.0, 99.0, 99.0]}, index=times)
+    trips = build_round_trips(broker.fills, bars=bars)
+    assert trips["mae"].tolist() == [-30.0, -25.0, -15.0]
+    assert trips["mfe"].tolist() == [80.0, 30.0, 30.0]
+    assert trips["holding_period"].iloc[0] == pd.Timedelta(days=2)
+
+    report = postmortem_from_fills(broker.fills, bars=bars)
+    assert report["summary"]["total_trades"] == 3
+    assert report["summary"]["gross_pnl"] == 95.0
+    assert report["summary"]["avg_mae"] == pytest.approx(-70.0 / 3)
@@ -1,8 +1,29 @@
 import numpy as np
 import pandas as pd
 
-from quantitative_codex.portfolio import optimize_weights
-from quantitative_codex.risk import apply_risk_controls, drawdown_guard
+from quantitative_codex.portfolio import (
+    MeanVarianceOptimizer,
+    capped_rescale,
+    capped_rescale_batch,
+    ledoit_wolf_covariance,
+    optimize_weights,
+    optimize_weights_panel,
+)
+from quantitative_codex.risk import (
+    DailyLossGuard,
+    DrawdownGuard,
+    EWMACovariance,
+    FactorCovariance,
+    RollingHistoricalVaR,
+    apply_risk_controls,
+    apply_risk_controls_panel,
+    drawdown_guard,
+    historical_var_es,
+    parametric_var_es,
+    portfolio_volatility,
+    rolling_adv,
+    screen_var_limits,
+)
 
 
 def test_optimize_weights_long_only_constraints():
@@ -27,3 +48,164 @@ def test_apply_risk_controls_and_drawdown_guard():
     equity_bad = pd.Series([1.0, 0.9, 0.75])
     assert drawdown_guard(equity_ok, max_drawdown=0.3)
     assert not drawdown_guard(equity_bad, max_drawdown=0.2)
+    assert not drawdown_guard(pd.Series([100.0, np.nan, 50.0]), max_drawdown=0.2)
+    ticked = DrawdownGuard(max_drawdown=0.2)
+    for tick in [np.nan, 100.0, np.nan, 50.0]:
+        ticked.update(tick)
+    assert ticked.breached and ticked.worst_drawdown == -0.5 and ticked.n_updates == 2
+
+
+def test_capped_rescale_is_exact_on_concentrated_inputs():
+    w = optimize_weights(pd.Series({"A": 10.0, "B": 0.1, "C": 0.1, "D": 0.1, "E": 0.1}), max_weight=0.25)
+    assert np.isclose(w.sum(), 1.0)
+    assert (w <= 0.25 + 1e-12).all()
+
+    rng = np.random.default_rng(7)
+    raw = rng.lognormal(size=(50, 20)) ** 4
+    batch = capped_rescale_batch(raw, cap=0.1)
+    assert np.allclose(batch.sum(axis=1), 1.0)
+    assert (batch <= 0.1 + 1e-12).all() and (batch >= 0).all()
+    assert np.allclose(batch[3], capped_rescale(raw[3], cap=0.1))
+    # a rescale, not a projection: uncapped names keep their proportions
+    free = batch[3] < 0.1 - 1e-12
+    assert np.allclose(batch[3][free] / raw[3][free], (batch[3][free] / raw[3][free])[0])
+
+
+def test_optimize_weights_panel_matches_per_date_optimizer():
+    rng = np.random.default_rng(3)
+    cols = ["A", "B", "C", "D", "E"]
+    mu = pd.DataFrame(rng.normal(size=(12, 5)), columns=cols)
+    mu.iloc[2, 1] = np.nan
+    risk = pd.DataFrame(rng.uniform(0.1, 0.4, size=(12, 5)), columns=cols)
+    risk.iloc[4, 0] = 0.0
+
+    for long_only in (True, False):
+        panel = optimize_weights_panel(mu, risk=risk, long_only=long_only, max_weight=0.4)
+        for t in range(len(mu)):
+            single = optimize_weights(mu.iloc[t], risk=risk.iloc[t], long_only=long_only, max_weight=0.4)
+            assert np.allclose(panel.iloc[t], single.reindex(cols).fillna(0.0))
+
+
+def test_mean_variance_optimizer_respects_constraints_and_warm_starts():
+    rng = np.random.default_rng(11)
+    market = rng.normal(0, 0.01, size=(300, 1))
+    returns = pd.DataFrame(
+        market * rng.uniform(0.5, 1.5, size=30) + rng.normal(0, 0.01, size=(300, 30)),
+        columns=[f"S{i:02d}" for i in range(30)],
+    )
+    cov, shrinkage = ledoit_wolf_covariance(returns.iloc[:250])
+    assert 0.0 <= shrinkage <= 1.0
+    assert np.allclose(cov, cov.T)
+
+    opt = MeanVarianceOptimizer(max_weight=0.1)
+    w = opt.optimize_from_returns(returns.iloc[:250])
+    assert np.isclose(w.sum(), 1.0)
+    assert (w >= -1e-12).all() and (w <= 0.1 + 1e-12).all()
+    equal = pd.Series(1.0 / 30, index=w.index)
+    cov_frame = pd.DataFrame(cov, index=returns.columns, columns=returns.columns)
+    assert w @ cov_frame @ w <= equal @ cov_frame @ equal
+
+    cold_iterations = opt.last_iterations
+    warm = opt.optimize_from_returns(returns.iloc[1:251])
+    assert opt.last_iterations <= max(cold_iterations // 5, 3)
+    # same optimum as a tight cold solve of the shifted window
+    reference = MeanVarianceOptimizer(max_weight=0.1, tol=1e-9, max_iter=20_000).optimize_from_returns(returns.iloc[1:251])
+    assert np.abs(warm - reference).max() < 1e-6
+
+
+def test_ewma_and_factor_covariance_feed_the_optimizer():
+    rng = np.random.default_rng(5)
+    cols = [f"S{i}" for i in range(12)]
+    returns = pd.DataFrame(
+        rng.normal(0, 0.01, size=(200, 1)) + rng.normal(0, 0.01, size=(200, 12)), columns=cols
+    )
+
+    ewma = EWMACovariance(cols, halflife=20)
+    ewma.update_many(returns.iloc[:-1])
+    before = ewma.covariance().to_numpy()
+    lam, r = ewma.decay, returns.iloc[-1].to_numpy()
+    weight_before = 1.0 - lam ** ewma.n_obs
+    ewma.update(returns.iloc[-1])
+    expected = (lam * weight_before * before + (1 - lam) * np.outer(r, r)) / (1.0 - lam ** ewma.n_obs)
+    assert np.allclose(ewma.covariance().to_numpy(), expected)
+
+    model = FactorCovariance.fit(returns, n_factors=2)
+    assert model.loadings.shape == (12, 2)
+    w = pd.Series(1.0 / 12, index=cols)
+    assert np.isclose(portfolio_volatility(w, model), portfolio_volatility(w, model.covariance()))
+
+    weights = MeanVarianceOptimizer(max_weight=0.2).optimize(model)
+    assert np.isclose(weights.sum(), 1.0)
+    assert (weights <= 0.2 + 1e-12).all()
+
+
+def test_apply_risk_controls_panel_matches_single_date_controls():
+    idx = pd.date_range("2024-01-01", periods=30, freq="B")
+    rng = np.random.default_rng(2)
+    close = pd.DataFrame(rng.uniform(10, 200, size=(30, 3)), index=idx, columns=["A", "B", "C"])
+    volume = pd.DataFrame(rng.uniform(1e4, 1e7, size=(30, 3)), index=idx, columns=["A", "B", "C"])
+    adv = rolling_adv(close, volume, window=20)
+    assert np.isclose(adv.iloc[-1]["A"], (close["A"] * volume["A"]).iloc[-20:].mean())
+
+    weights = pd.DataFrame(rng.uniform(0, 1, size=(30, 3)), index=idx, columns=["A", "B", "C"])
+    panel = apply_risk_controls_panel(weights, adv_usd=adv, max_weight=0.5)
+    for t in (0, 10, 29):
+        single = apply_risk_controls(weights.iloc[t], adv_usd=adv.iloc[t], max_weight=0.5)
+        assert np.allclose(panel.iloc[t], single)
+
+
+def test_stateful_guards_track_ticks_and_restore_from_checkpoint():
+    ticks = [1.0, 1.1, 1.05, 0.95, 1.2, 0.9]
+    streaming = DrawdownGuard(max_drawdown=0.2)
+    for eq in ticks[:3]:
+        assert streaming.update(eq)
+    restored = DrawdownGuard.from_state(streaming.to_state())
+    for eq in ticks[3:]:
+        restored.update(eq)
+
+    batch = DrawdownGuard(max_drawdown=0.2)
+    batch.update_many(np.array(ticks))
+    assert restored.peak == batch.peak == 1.2
+    assert np.isclose(restored.worst_drawdown, batch.worst_drawdown)
+    assert restored.breached and batch.breached
+
+    daily = DailyLossGuard(max_daily_loss=0.03)
+    daily.update(100.0, session="d1")
+    assert not daily.update(96.0, session="d1")
+    assert daily.update(96.0, session="d2")
+    assert daily.breach_count == 1
+
+    # a NaN first tick must not become the session open and disarm the limit
+    daily = DailyLossGuard(max_daily_loss=0.03)
+    assert daily.update(float("nan"), session="d1")
+    assert daily.session_open is None
+    daily.update(100.0, session="d1")
+    assert not daily.update(96.0, session="d1")
+    assert not daily.update(float("nan"), session="d2")  # nor clear a breach
+
+
+def test_var_engine_scores_many_portfolios_and_rolls_incrementally():
+    rng = np.random.default_rng(9)
+    cols = ["A", "B", "C", "D"]
+    idx = pd.date_range("2023-01-02", periods=400, freq="B")
+    returns = pd.DataFrame(rng.normal(0, 0.01, size=(400, 4)), index=idx, columns=cols)
+    candidates = pd.DataFrame(rng.dirichlet(np.ones(4), size=6), columns=cols)
+
+    out = historical_var_es(candidates, returns.iloc[-200:], alpha=0.95)
+    losses = -(returns.iloc[-200:] @ candidates.iloc[2])
+    worst = np.sort(losses.to_numpy())[::-1][:10]
+    assert np.isclose(out.iloc[2]["var"], worst[-1])
+    assert np.isclose(out.iloc[2]["es"], worst.mean())
+
+    model = FactorCovariance.fit(returns, n_factors=2)
+    dense = parametric_var_es(candidates, model.covariance(), alpha=0.99)
+    low_rank = parametric_var_es(candidates, model, alpha=0.99)
+    assert np.allclose(dense, low_rank)
+    assert (dense["es"] > dense["var"]).all()
+
+    rolling = RollingHistoricalVaR(candidates, window=200, alpha=0.95)
+    rolling.update_many(returns)
+    assert np.allclose(rolling.value(), out)
+
+    screened = screen_var_limits(candidates.set_axis(idx[-6:]), returns, var_limit=0.0, window=200, alpha=0.95)
+    assert screened["breach"].all()
@@ -1,6 +1,8 @@
+import numpy as np
 import pandas as pd
 
-from quantitative_codex.reconciliation import reconcile_fills, reconcile_positions
+from quantitative_codex.execution.models import OrderSide
+from quantitative_codex.reconciliation import StreamingReconciler, reconcile_fill_files, reconcile_fills, reconcile_positions
 
 
 def test_reconcile_positions_detects_breaks():
@@ -31,3 +33,62 @@ def test_reconcile_fills_aggregates_and_flags_breaks():
     out = reconcile_fills(internal_fills, broker_fills, qty_tolerance=1e-9)
     msft = out[(out["symbol"] == "MSFT") & (out["side"] == "sell")].iloc[0]
     assert msft["is_break"]
+
+
+def test_streaming_reconciler_tracks_break_lifecycle_and_matches_batch():
+    internal_fills = pd.DataFrame(
+        [
+            {"symbol": "AAPL", "side": "buy", "qty": 5.0},
+            {"symbol": "AAPL", "side": "buy", "qty": 5.0},
+            {"symbol": "MSFT", "side": "sell", "qty": 2.0},
+        ]
+    )
+    broker_fills = pd.DataFrame(
+        [
+            {"symbol": "AAPL", "side": "buy", "qty": 10.0},
+            {"symbol": "MSFT", "side": "sell", "qty": 1.0},
+            {"symbol": "GOOG", "side": "buy", "qty": 3.0},
+        ]
+    )
+    recon = StreamingReconciler(qty_tolerance=1e-9)
+    seen = []
+    recon.subscribe(seen.append)
+
+    opened = recon.add_internal_fills(internal_fills)
+    assert {(e.kind, e.symbol) for e in opened} == {("opened", "AAPL"), ("opened", "MSFT")}
+    events = recon.add_broker_fills(broker_fills)
+    assert {(e.kind, e.symbol) for e in events} == {("closed", "AAPL"), ("opened", "GOOG")}
+    assert recon.open_breaks == {("MSFT", "sell"): 1.0, ("GOOG", "buy"): -3.0}
+    assert len(seen) == 4
+
+    pd.testing.assert_frame_equal(recon.snapshot(), reconcile_fills(internal_fills, broker_fills, qty_tolerance=1e-9))
+    assert recon.add_internal_fill("GOOG", OrderSide.BUY, 3.0).kind == "closed"
+    assert recon.breaks()["symbol"].tolist() == ["MSFT"]
+
+
+def test_reconcile_fill_files_streams_chunks_and_checks_notional(tmp_path):
+    rng = np.random.default_rng(7)
+    n = 5_000
+    internal = pd.DataFrame(
+        {
+            "symbol": rng.choice(["AAPL", "MSFT", "GOOG", "TSLA"], size=n),
+            "side": rng.choice(["buy", "sell"], size=n),
+            "qty": rng.integers(1, 100, size=n).astype(float),
+            "price": rng.uniform(10, 20, size=n).round(2),
+        }
+    )
+    broker = internal.sample(frac=1.0, random_state=1).reset_index(drop=True)
+    broker.loc[broker["symbol"] == "TSLA", "price"] += 0.01
+    broker = pd.concat([broker, pd.DataFrame([{"symbol": "NFLX", "side": "buy", "qty": 1.0, "price": 5.0}])])
+    internal.to_csv(tmp_path / "internal.csv", index=False)
+    broker.to_csv(tmp_path / "broker.csv", index=False)
+
+    out = reconcile_fill_files(tmp_path / "internal.csv", tmp_path / "broker.csv", qty_tolerance=1e-6, notional_tolerance=0.5, chunksize=700)
+    batch = reconcile_fills(internal, broker, qty_tolerance=1e-6)
+    np.testing.assert_allclose(out["diff_qty"], batch["diff_qty"], atol=1e-9)
+    assert out["fills_internal"].sum() == n
+
+    breaks = out[out["is_break"]]
+    assert set(breaks["symbol"]) == {"TSLA", "NFLX"}
+    assert not breaks.loc[breaks["symbol"] == "TSLA", "qty_break"].any()
+    assert breaks.loc[breaks["symbol"] == "TSLA", "notional_break"].all()
@@ -1,6 +1,10 @@
+import json
+import sys
+
 import pandas as pd
 
-from quantitative_codex.main import build_signal, run_single_stock_backtest
+from quantitative_codex.main import build_signal, main, run_single_stock_backtest
+from quantitative_codex.profiling import profiler
 
 
 def test_build_signal_mom20_shape():
@@ -33,3 +37,31 @@ def test_run_single_stock_backtest_from_csv(tmp_path):
     out = run_single_stock_backtest(csv_path=csv, symbol="TEST", strategy="mom20", one_way_bps=1.0)
     assert out.symbol == "TEST"
     assert "equity" in out.frame.columns
+
+
+def test_main_profile_prints_stages_and_exports_metrics(tmp_path, monkeypatch, capsys):
+    csv = tmp_path / "bars.csv"
+    rows = [f"2024-01-{d:02d},{100 + d},{101 + d},{99 + d},{100 + d},1000" for d in range(2, 30)]
+    csv.write_text("Date,Open,High,Low,Close,Volume\n" + "\n".join(rows) + "\n")
+    metrics = tmp_path / "metrics.json"
+    profiler.reset()
+    monkeypatch.setattr(sys, "argv", ["main", "--csv", str(csv), "--profile-memory", "--metrics-out", str(metrics)])
+    main()
+
+    assert not profiler.enabled
+    printed = capsys.readouterr().out
+    stages = {"load_eod_csv", "compute_factor_library", "VectorizedBacktester.run"}
+    assert all(name in printed for name in stages)
+    exported = json.loads(metrics.read_text())
+    assert stages <= set(exported)
+    assert exported["load_eod_csv"]["count"] == 1.0
+    assert exported["load_eod_csv"]["peak_memory_bytes"] > 0
+    assert sum(exported["compute_factor_library"]["bucket_counts"]) == 1
+
+    text = profiler.to_prometheus(tmp_path / "metrics.prom")
+    assert 'quantitative_codex_stage_latency_seconds_count{stage="VectorizedBacktester.run"} 1' in text
+    assert 'quantitative_codex_stage_latency_seconds_bucket{stage="load_eod_csv",le="+Inf"} 1' in text
+
+    profiler.reset()
+    run_single_stock_backtest(csv_path=csv, symbol="TEST")
+    assert profiler.stages == {}  # disabled: nothing recorded
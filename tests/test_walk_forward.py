@@ -2,6 +2,8 @@ import numpy as np
 import pandas as pd
 
 from quantitative_codex.evaluation import WalkForwardConfig, walk_forward_evaluate
+from quantitative_codex.portfolio import optimize_weights
+from quantitative_codex.risk import apply_risk_controls, rolling_adv
 
 
 def test_walk_forward_returns_expected_artifacts():
@@ -23,3 +25,52 @@ def test_walk_forward_returns_expected_artifacts():
     assert {"returns", "equity", "segments", "summary"}.issubset(out.keys())
     assert not out["segments"].empty
     assert "sharpe" in out["summary"]
+
+
+def test_walk_forward_uses_volume_for_liquidity_control():
+    idx = pd.date_range("2020-01-01", periods=600, freq="B")
+    rng = np.random.default_rng(4)
+    prices = pd.DataFrame(
+        100 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, size=(len(idx), 4)), axis=0)),
+        index=idx,
+        columns=["A", "B", "C", "D"],
+    )
+    volume = pd.DataFrame({"A": 5e6, "B": 5e6, "C": 5e6, "D": 1e3}, index=idx)
+    cfg = WalkForwardConfig(train_window=252, test_window=63, rebalance_every=5, max_weight=0.5)
+
+    liquid = walk_forward_evaluate(prices, cfg, volume=volume)
+    plain = walk_forward_evaluate(prices, cfg)
+    assert len(liquid["returns"]) == len(plain["returns"])
+    assert not np.allclose(liquid["returns"], plain["returns"])
+
+
+def test_walk_forward_matches_per_date_optimizer_and_risk_controls():
+    idx = pd.date_range("2020-01-01", periods=500, freq="B")
+    rng = np.random.default_rng(11)
+    cols = ["A", "B", "C", "D", "E"]
+    prices = pd.DataFrame(
+        100 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, size=(len(idx), 5)), axis=0)),
+        index=idx,
+        columns=cols,
+    )
+    volume = pd.DataFrame(rng.uniform(1e3, 1e6, size=(len(idx), 5)), index=idx, columns=cols)
+    cfg = WalkForwardConfig(train_window=252, test_window=63, rebalance_every=5, max_weight=0.4)
+    out = walk_forward_evaluate(prices, cfg, volume=volume)
+
+    rets = prices.pct_change().fillna(0.0)
+    adv = rolling_adv(prices, volume, window=cfg.adv_window)
+    expected = []
+    for start in range(cfg.train_window, len(prices) - cfg.test_window + 1, cfg.test_window):
+        for i in range(cfg.test_window):
+            day = start + i
+            if i % cfg.rebalance_every == 0:
+                d = day - 1
+                mom = prices.iloc[d] / prices.iloc[d - 59] - 1
+                fallback = rets.iloc[d - cfg.train_window + 1 : d + 1].std(ddof=0).median()
+                risk = rets.iloc[d - 19 : d + 1].std(ddof=0).replace(0, np.nan).fillna(fallback)
+                base = optimize_weights(mom, risk=risk, long_only=True, max_weight=cfg.max_weight)
+                held = apply_risk_controls(base, adv_usd=adv.iloc[d], max_weight=cfg.max_weight).reindex(cols).fillna(0.0)
+            cost = held.abs().sum() * cfg.one_way_bps / 10000.0 if i == 0 else 0.0
+            expected.append(float((held * rets.iloc[day]).sum()) - cost)
+
+    assert np.allclose(out["returns"].to_numpy(), expected, rtol=0, atol=1e-12)